@@ -2,64 +2,11 @@
 # Author: Patrick Maul #
 ########################
 
-import argparse
-import json
-from os import path
-from typing import Union, Optional
-from src.keyword_extractor import KeywordExtractor, KeywordExtractorDirectory
+from src.keyword_extractor import run
 
-# import json
-
-# Init ArgumentParser
-parser = argparse.ArgumentParser(
-    prog="Keyword extractor", description="Extracts keywords from a text or directory with texts."
-)
-
-# Add arguments
-parser.add_argument("-t", "--text", type=str, dest="text", help="Text for extraction")
-parser.add_argument("-f", "--file-path", type=str, dest="file_path", help="Path to text for extraction")
-parser.add_argument("-d", "--dir-path", type=str, dest="dir_path", help="Path to directory for extraction")
-parser.add_argument(
-    "-m",
-    "--extraction-method",
-    type=str,
-    dest="extraction_method",
-    default="wf",
-    help="Extraction method (wf => Word Frequency, tfidf => Term Frequency Inverse Document "
-    "Frequency, pr => Page Rank",
-)
-parser.add_argument("-o", "--output", type=str, dest="output", help="Destination for output. (keywords.json)")
-parser.add_argument("-p", "--print", action="store_true", dest="print", help="Print result in console")
-
-# Get arguments & load config
-args = parser.parse_args()
-result: Optional[dict] = None
-keyword_extractor: Union[KeywordExtractor, KeywordExtractorDirectory]
-
-if args.text and args.extraction_method:
-    keyword_extractor = KeywordExtractor(txt=args.text, method=args.extraction_method)
-    result = keyword_extractor.extract()
-elif args.file_path and args.extraction_method:
-    with open(args.file_path, "r") as file:
-        text: str = file.read()
-
-    keyword_extractor = KeywordExtractor(txt=text, method=args.extraction_method)
-    result = keyword_extractor.extract()
-elif args.dir_path and args.extraction_method:
-    keyword_extractor = KeywordExtractorDirectory(directory=args.dir_path, method=args.extraction_method)
-    result = keyword_extractor.extract()
-else:
-    print("Somthing went wrong")
-
-if args.output and result:
-    with open(path.join(args.output, "keywords.json"), "w") as file:
-        file.write(json.dumps(result))
-if args.print and result:
-    if args.dir_path:
-        for key, value in result.items():
-            print(f"Keywords for '{key}': {', '.join(value.get('keywords'))}")
-    else:
-        print(result.get("keywords"))
+# The command line interface lives in `keyword_extractor.run`, this script only forwards to it
+if __name__ == "__main__":
+    run()
 
 # kw_e_wf = KeywordExtractor(txt=TEXT, method="wf")
 # kw_e_tfidf = KeywordExtractor(txt=TEXT, method="tfidf")
@@ -1,19 +1,103 @@
 import argparse
+import copy
+import gzip
+import hashlib
+import heapq
 import json
-import math
-import networkx
+import numpy as np
 import os
-from nltk.stem import PorterStemmer
+import queue
+import sys
+import threading
+import time
+from array import array
+from contextlib import contextmanager, nullcontext
+from collections import Counter, deque
+from itertools import islice
 from utils import (
+    CorpusTfIdf,
+    DeltaCounts,
     Tokenizer,
+    TokenizedText,
     POSTagger,
     Lemmatizer,
     File,
-    flatten_nested_lists,
-    remove_duplicates,
-    remove_stop_words,
+    LRUCache,
+    MetricStage,
+    MinHash,
+    MinHashLSH,
+    ResultCache,
+    SpaceSaving,
+    StageProfiler,
+    TEXT_ENCODING,
+    TimeBudget,
+    Vocabulary,
+    adjacency_from_edge_keys,
+    concatenate_offsets,
+    cap_graph,
+    cooccurrence_matrix,
+    edge_keys,
+    first_occurrences,
+    get_stemmer,
+    iter_text_chunks,
+    page_rank,
+    remove_stop_word_ids,
+    sample_paragraphs,
+    sample_sentences,
+    split_by_offsets,
 )
-from typing import Union, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    ContextManager,
+    Generator,
+    Hashable,
+    Iterable,
+    Iterator,
+    Union,
+    Optional,
+)
+
+if TYPE_CHECKING:
+    # Imported where they are used, asyncio, concurrent.futures and nltk slow down the start of every run
+    from concurrent.futures import Executor, ThreadPoolExecutor
+    from nltk.stem import PorterStemmer
+    from scipy.sparse import csr_matrix
+
+# Part of every result cache key, bump it whenever a change of the pipeline changes its results
+PIPELINE_VERSION: str = "1"
+
+# Extraction methods: wf => word frequency, tfidf => TF-IDF, pr => page rank, full => all of them in one pass
+METHODS: tuple[str, ...] = ("wf", "tfidf", "pr", "full")
+# What `KeywordExtractor.extract` puts into a result: keywords => keywords only, scores => keywords and
+# their scores, full => additionally the text and every metric of the file
+OUTPUT_DETAILS: tuple[str, ...] = ("keywords", "scores", "full")
+# Internal detail of the first `tfidf` pass of a directory, keywords plus the term counts of the file
+_WORD_COUNTS_DETAIL: str = "word_counts"
+# Put by the reader thread of `KeywordExtractorStream` after the last line
+_END_OF_LINES: object = object()
+# Bytes per chunk of `KeywordExtractor.extract_file`
+DEFAULT_CHUNK_SIZE: int = 64 * 1024 * 1024
+# Extractor and directory options the results depend on, all shards of a run must agree on them
+_SHARD_OPTIONS: tuple[str, ...] = (
+    "detail",
+    "max_keywords",
+    "window_size",
+    "tolerance",
+    "max_iterations",
+    "page_rank_backend",
+    "chunk_size",
+    "deduplicate",
+)
+# Cost model of `time_budget_ms`: priors of the seconds per character of tokenizing and the base stages, per
+# token of the base stages (POS tagging to stop word removal), per graph edge and page rank iteration and
+# per token of a `full` result, replaced by what budgeted extractions measure
+_BUDGET_COSTS: dict[str, float] = {"char": 10.0e-6, "token": 50.0e-6, "edge": 20.0e-9, "result": 2.0e-6}
+_BUDGET_BASE_SHARE: float = 0.5  # Share of the remaining budget for the base stages, the rest is for ranking
+_BUDGET_MIN_ITERATIONS: int = 10  # Page rank iterations a capped graph has to fit into the remaining budget
 
 
 def run() -> None:
@@ -28,357 +112,1931 @@ def run() -> None:
     parser.add_argument(
         "-d", "--dir-path", type=str, dest="dir_path", help="Path to directory for extraction"
     )
+    parser.add_argument("--stdin", action="store_true", dest="stdin", help="Read the text from stdin")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        dest="stream",
+        help="With --stdin: read lines as they arrive and print the approximate top keywords as JSON lines",
+    )
+    parser.add_argument(
+        "--interval", type=float, dest="interval", default=10.0, help="Seconds between two --stream results"
+    )
+    parser.add_argument(
+        "--sketch-size",
+        type=int,
+        dest="sketch_size",
+        default=10_000,
+        help="Words counted by --stream, the memory bound of the approximate counts",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        dest="serve",
+        help="Keep warm pipelines resident and serve extraction over a local HTTP/JSON API (-m is the "
+        "default method of requests)",
+    )
+    parser.add_argument("--host", type=str, dest="host", default="127.0.0.1", help="Address of --serve")
+    parser.add_argument("--port", type=int, dest="port", default=8000, help="Port of --serve")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        dest="concurrency",
+        default=1,
+        help="Pipelines of --serve, the number of requests extracted at the same time",
+    )
     parser.add_argument(
         "-m",
         "--extraction-method",
         type=str,
         dest="extraction_method",
         default="wf",
+        choices=list(METHODS),
         help="Extraction method (wf => Word Frequency, tfidf => Term Frequency Inverse Document "
-        "Frequency, pr => Page Rank",
+        "Frequency, pr => Page Rank, full => all methods in one pass",
     )
     parser.add_argument(
         "-o", "--output", type=str, dest="output", help="Destination for output. (keywords.json)"
     )
     parser.add_argument("-p", "--print", action="store_true", dest="print", help="Print result in console")
+    parser.add_argument(
+        "--detail",
+        type=str,
+        dest="detail",
+        default="full",
+        choices=list(OUTPUT_DETAILS),
+        help="Output detail (keywords => keywords only, scores => keywords with scores, full => keywords, "
+        "text and all intermediate metrics)",
+    )
+    parser.add_argument(
+        "--output-format",
+        type=str,
+        dest="output_format",
+        default="json",
+        choices=["json", "jsonl"],
+        help="Output file format (json => keywords.json, jsonl => keywords.jsonl with one line per result "
+        "written as soon as it is extracted)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        dest="workers",
+        default=1,
+        help="Number of worker processes for directory extraction (default: 1 => sequential)",
+    )
+    parser.add_argument(
+        "--unordered",
+        action="store_false",
+        dest="ordered",
+        help="Collect directory results as they finish instead of in path order",
+    )
+    parser.add_argument(
+        "--deduplicate",
+        type=float,
+        nargs="?",
+        const=0.9,
+        dest="deduplicate",
+        default=None,
+        help="With -d: extract exact and near duplicate files once and copy the result (optional MinHash "
+        "similarity threshold, default 0.9), reported on stderr and in deduplication.json with -o",
+    )
+    parser.add_argument(
+        "--shard",
+        type=_shard_argument,
+        dest="shard",
+        default=None,
+        help="With -d and -o: extract only shard i of N (given as i/N, i from 0) of the directory and write "
+        "its partial statistics to shard-i-of-N.json.gz for --merge",
+    )
+    parser.add_argument(
+        "--merge",
+        type=str,
+        nargs="+",
+        dest="merge",
+        default=None,
+        help="Merge the partial statistics files of all --shard runs into the results of the directory",
+    )
+    parser.add_argument(
+        "-k",
+        "--max-keywords",
+        type=int,
+        dest="max_keywords",
+        default=10,
+        help="Keywords per text and method, texts with fewer distinct words give fewer",
+    )
+    parser.add_argument(
+        "--window-size",
+        type=_window_size_argument,
+        dest="window_size",
+        default=None,
+        help="Co-occurrence window of the page rank graph in words (default: whole sentence)",
+    )
+    parser.add_argument(
+        "--tolerance", type=float, dest="tolerance", default=1.0e-6, help="Page rank convergence tolerance"
+    )
+    parser.add_argument(
+        "--max-iterations", type=int, dest="max_iterations", default=100, help="Page rank iteration cap"
+    )
+    parser.add_argument(
+        "--page-rank-backend",
+        type=str,
+        dest="page_rank_backend",
+        default="sparse",
+        choices=["sparse", "networkx"],
+        help="Page rank implementation (sparse => SciPy/NumPy, networkx => reference implementation)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        dest="deadline",
+        default=None,
+        help="Time budget per text in ms: sample sentences, cap the page rank graph, stop page rank early or "
+        "rank by word frequency to meet it (applied degradations and the page rank residual are reported "
+        "as the budget of the result)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        dest="cache_size",
+        default=100_000,
+        help="Entries of the lemma and stem caches (least recently used entries are evicted)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        dest="chunk_size",
+        default=None,
+        help="Large file mode: memory-map input files and extract them in chunks of this many MB "
+        "(results hold keywords, scores and merged metrics, no text)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        dest="profile",
+        help="Print the time, calls and items of every pipeline stage (and write profile.json with -o)",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        dest="profile_memory",
+        help="--profile with the tracemalloc peak of every stage, slows the run down",
+    )
+    parser.add_argument(
+        "--profile-dump",
+        type=str,
+        dest="profile_dump",
+        default=None,
+        help="Write a cProfile dump of the run to this file (read it with pstats or snakeviz)",
+    )
+    parser.add_argument(
+        "--result-cache",
+        type=str,
+        dest="result_cache",
+        default=None,
+        help="Directory of the persistent result cache, unchanged texts are not extracted again",
+    )
+    parser.add_argument(
+        "--result-cache-size",
+        type=int,
+        dest="result_cache_size",
+        default=1024,
+        help="Size cap of the result cache in MB (least recently used results are evicted)",
+    )
 
     # Get arguments & load config
     args = parser.parse_args()
+    extractor_options: dict = {
+        "window_size": args.window_size,
+        "tolerance": args.tolerance,
+        "max_iterations": args.max_iterations,
+        "page_rank_backend": args.page_rank_backend,
+        "cache_size": args.cache_size,
+        "detail": args.detail,
+        "max_keywords": args.max_keywords,
+        "time_budget_ms": args.deadline,
+        "chunk_size": args.chunk_size * 1024 * 1024 if args.chunk_size else None,
+        "result_cache": (
+            ResultCache(directory=args.result_cache, max_bytes=args.result_cache_size * 1024 * 1024)
+            if args.result_cache
+            else None
+        ),
+        "profile": args.profile or args.profile_memory,
+        "trace_memory": args.profile_memory,
+    }
+
+    with _cprofile(path=args.profile_dump):
+        keyword_extractor = _run(args=args, extractor_options=extractor_options)
+
+    if keyword_extractor is not None and keyword_extractor.profiler is not None:
+        _write_profile(profiler=keyword_extractor.profiler, output=args.output)
+    if isinstance(keyword_extractor, KeywordExtractorDirectory) and keyword_extractor.deduplication:
+        _write_deduplication(report=keyword_extractor.deduplication, output=args.output)
+
+
+def _run(
+    args: argparse.Namespace, extractor_options: dict
+) -> Optional[Union["KeywordExtractor", "KeywordExtractorDirectory", "KeywordExtractorStream"]]:
+    # The extractor that ran, its profiler holds the stages of the run
     result: Optional[dict] = None
-    keyword_extractor: Union[KeywordExtractor, KeywordExtractorDirectory]
+    keyword_extractor: Optional[
+        Union[KeywordExtractor, KeywordExtractorDirectory, KeywordExtractorStream]
+    ] = None
 
-    if args.text and args.extraction_method:
-        keyword_extractor = KeywordExtractor(txt=args.text, method=args.extraction_method)
-        result = keyword_extractor.extract()
-    elif args.file_path and args.extraction_method:
-        with open(args.file_path, "r") as file:
-            text: str = file.read()
+    if args.serve:
+        from keyword_extractor.server import serve  # The server module imports this one
 
-        keyword_extractor = KeywordExtractor(txt=text, method=args.extraction_method)
-        result = keyword_extractor.extract()
+        serve(
+            host=args.host,
+            port=args.port,
+            method=args.extraction_method,
+            concurrency=args.concurrency,
+            **extractor_options,
+        )
+    elif args.stdin and args.stream:
+        keyword_extractor = KeywordExtractorStream(
+            lines=sys.stdin, interval=args.interval, sketch_size=args.sketch_size, **extractor_options
+        )
+        _write_stream(keyword_extractor_stream=keyword_extractor, output=args.output)
+    elif args.file_path and args.extraction_method and args.chunk_size:
+        keyword_extractor = KeywordExtractor(txt="", method=args.extraction_method, **extractor_options)
+        result = keyword_extractor.extract_file(path=args.file_path)
+    elif args.merge:
+        result = merge_shards(shards=(_read_shard(path=path) for path in args.merge))
+    elif args.dir_path and args.extraction_method and args.shard:
+        keyword_extractor = KeywordExtractorDirectory(
+            directory=args.dir_path,
+            method=args.extraction_method,
+            workers=args.workers,
+            deduplicate=args.deduplicate,
+            **extractor_options,
+        )
+        _write_shard(shard=keyword_extractor.extract_shard(*args.shard), output=args.output)
     elif args.dir_path and args.extraction_method:
-        keyword_extractor = KeywordExtractorDirectory(directory=args.dir_path, method=args.extraction_method)
+        keyword_extractor = KeywordExtractorDirectory(
+            directory=args.dir_path,
+            method=args.extraction_method,
+            workers=args.workers,
+            ordered=args.ordered,
+            deduplicate=args.deduplicate,
+            **extractor_options,
+        )
+        if args.output_format == "jsonl":
+            _write_json_lines(
+                results=keyword_extractor.iter_extract(), output=args.output, print_keywords=args.print
+            )
+        else:
+            result = keyword_extractor.extract()
+    elif args.extraction_method and (text := _read_text(args=args)) is not None:
+        keyword_extractor = KeywordExtractor(txt=text, method=args.extraction_method, **extractor_options)
         result = keyword_extractor.extract()
     else:
         print("Somthing went wrong")
 
-    if args.output and result:
-        with open(os.path.join(args.output, "keywords.json"), "w") as file:
-            file.write(json.dumps(result))
-    if args.print and result:
-        if args.dir_path:
+    if result:
+        _write_result(result=result, args=args)
+    return keyword_extractor
+
+
+@contextmanager
+def _cprofile(path: Optional[str]) -> Iterator[None]:
+    # Function level profile of everything in the block, written for `pstats` or snakeviz
+    if path is None:
+        yield
+        return
+
+    import cProfile
+
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        profile.dump_stats(path)
+
+
+def _write_profile(profiler: StageProfiler, output: Optional[str]) -> None:
+    print(profiler.report(), file=sys.stderr)
+    if output:
+        with open(os.path.join(output, "profile.json"), "w") as file:
+            json.dump(profiler.stats(), file, indent=2)
+
+
+def _write_deduplication(report: dict, output: Optional[str]) -> None:
+    print(
+        f"Deduplication: {report['duplicates']} of {report['documents']} files were duplicates "
+        f"({report['exact_duplicates']} exact) in {report['groups']} groups, "
+        f"{report['extracted']} were extracted. "
+        f"Pre-pass {report['prepass_seconds']:.2f} s, extraction {report['extraction_seconds']:.2f} s, "
+        f"about {report['estimated_seconds_saved']:.2f} s saved.",
+        file=sys.stderr,
+    )
+    if output:
+        with open(os.path.join(output, "deduplication.json"), "w") as file:
+            json.dump(report, file, indent=2)
+
+
+def _write_result(result: dict, args: argparse.Namespace) -> None:
+    if args.output:
+        with open(os.path.join(args.output, f"keywords.{args.output_format}"), "w") as file:
+            file.write(json.dumps(result) + ("\n" if args.output_format == "jsonl" else ""))
+    if args.print:
+        if args.dir_path or args.merge:
             for key, value in result.items():
-                print(f"Keywords for '{key}': {', '.join(value.get('keywords'))}")
+                print(f"Keywords for '{key}': {_format_keywords(value.get('keywords'))}")
         else:
             print(result.get("keywords"))
 
 
+def _shard_argument(value: str) -> tuple[int, int]:
+    index, _, count = value.partition("/")
+    if not (index.isdigit() and count.isdigit() and int(index) < int(count)):
+        raise argparse.ArgumentTypeError(f"Expected a shard as i/N with 0 <= i < N, got '{value}'.")
+    return int(index), int(count)
+
+
+def _window_size_argument(value: str) -> int:
+    if not value.isdigit() or int(value) < 2:
+        raise argparse.ArgumentTypeError(f"Expected a window of at least 2 words, got '{value}'.")
+    return int(value)
+
+
+def _write_shard(shard: dict, output: Optional[str]) -> None:
+    if not output:
+        raise ValueError("--shard needs an output directory (-o).")
+    path: str = os.path.join(output, f"shard-{shard['shard']}-of-{shard['shard_count']}.json.gz")
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        json.dump(shard, file)
+
+
+def _read_shard(path: str) -> dict:
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _write_json_lines(
+    results: Iterator[tuple[str, dict]], output: Optional[str], print_keywords: bool
+) -> None:
+    # Every result is written and dropped as soon as it is extracted, memory does not grow with the corpus
+    with open(os.path.join(output, "keywords.jsonl"), "w") if output else nullcontext() as file:
+        for path, result in results:
+            if file is not None:
+                file.write(json.dumps({"path": path, **result}) + "\n")
+            if print_keywords:
+                print(f"Keywords for '{path}': {_format_keywords(result.get('keywords', []))}")
+
+
+def _read_text(args: argparse.Namespace) -> Optional[str]:
+    if args.stdin:
+        return sys.stdin.read()
+    elif args.text:
+        return args.text
+    elif args.file_path:
+        with open(args.file_path, "r", encoding=TEXT_ENCODING) as file:
+            return file.read()
+    return None
+
+
+def _write_stream(keyword_extractor_stream: "KeywordExtractorStream", output: Optional[str]) -> None:
+    with open(os.path.join(output, "keywords.jsonl"), "w") if output else nullcontext() as file:
+        for result in keyword_extractor_stream.iter_extract():
+            line: str = json.dumps(result)
+            print(line, flush=True)
+            if file is not None:
+                file.write(line + "\n")
+                file.flush()
+
+
+def _format_keywords(keywords: Union[list[str], dict[str, list[str]]]) -> str:
+    if isinstance(keywords, dict):  # `full` => keywords by method
+        return " | ".join(f"{method}: {', '.join(values)}" for method, values in keywords.items())
+    return ", ".join(keywords)
+
+
 class KeywordExtractor:
-    def __init__(self, txt: str, method: str = "wf") -> None:
+    def __init__(
+        self,
+        txt: str,
+        method: str = "wf",
+        window_size: Optional[int] = None,
+        tolerance: float = 1.0e-6,
+        max_iterations: int = 100,
+        page_rank_backend: str = "sparse",
+        cache_size: Optional[int] = 100_000,
+        result_cache: Optional[ResultCache] = None,
+        detail: str = "full",
+        chunk_size: Optional[int] = None,
+        max_keywords: int = 10,
+        incremental: bool = False,
+        time_budget_ms: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        profile: bool = False,
+        trace_memory: bool = False,
+    ) -> None:
+        _check_method(method=method)
+        if detail not in OUTPUT_DETAILS and detail != _WORD_COUNTS_DETAIL:
+            raise ValueError(
+                f"Unknown output detail '{detail}', expected one of {', '.join(OUTPUT_DETAILS)}."
+            )
+        if max_keywords < 1:
+            raise ValueError(f"Expected at least one keyword, got max_keywords={max_keywords}.")
+        if time_budget_ms is not None and time_budget_ms <= 0:
+            raise ValueError(f"Expected a positive time budget, got time_budget_ms={time_budget_ms}.")
+        if window_size is not None and window_size < 2:
+            # A window of one word connects no words, every word would get the same page rank
+            raise ValueError(f"Expected a window of at least 2 words, got window_size={window_size}.")
+
         self.txt: str = txt
         self.method: str = method
+        self.detail: str = detail
+        self.max_keywords: int = max_keywords  # Keywords per method, fewer if a text has fewer words
+        self.chunk_size: Optional[int] = (
+            chunk_size  # Bytes, directory files are read with `extract_file` if set
+        )
+        self.window_size: Optional[int] = window_size  # Co-occurrence window for `pr`, None => sentence
+        self.tolerance: float = tolerance
+        self.max_iterations: int = max_iterations
+        self.page_rank_backend: str = page_rank_backend  # sparse | networkx (reference implementation)
+        self.result_cache: Optional[ResultCache] = result_cache  # Results of earlier runs, by content hash
+        self.cache_size: Optional[int] = cache_size
+        # Paragraphs of the last text are kept, `extract` only runs the pipeline on new or changed ones
+        self.incremental: bool = incremental
+        # Deadline of every extraction, stages degrade to meet it (see `_extract_within_budget`)
+        self.time_budget_ms: Optional[float] = time_budget_ms
+        self.clock: Callable[[], float] = clock
+        self._budget: Optional[TimeBudget] = None  # Deadline of the running extraction
+        self._costs: dict[str, float] = dict(_BUDGET_COSTS)
+        self.trace_memory: bool = trace_memory  # tracemalloc peak per stage, slows the pipeline down
+        # Stages of all extractions of this pipeline, every result gets those of its own extraction
+        self.profiler: Optional[StageProfiler] = StageProfiler(trace_memory=trace_memory) if profile else None
+        self._file_profiler: Optional[StageProfiler] = None  # Stages of the running extraction
+        self._own_executor: Optional["ThreadPoolExecutor"] = None  # Runs `aextract` without a pool
         self._tokenizer: Tokenizer = Tokenizer()
         self._pos_tagger: POSTagger = POSTagger()
-        self._lemmatizer: Lemmatizer = Lemmatizer()
-        self._stemmer: PorterStemmer = PorterStemmer()
+        self._lemmatizer: Lemmatizer = Lemmatizer(cache_size=cache_size)
+        # Word and tag ids, lemmas and stems are shared by all texts of this pipeline
+        self._vocabulary: Vocabulary = Vocabulary()
+        self._pos_tags: Vocabulary = Vocabulary()
+        self._stem_cache: LRUCache = LRUCache(max_size=cache_size)  # word id => stem id
+        # Incremental mode: files of the paragraphs of the last text by paragraph, and the word counts and
+        # co-occurrence edges of its paragraphs, updated by the paragraphs that changed
+        self._paragraphs: dict[str, File] = {}
+        self._word_counts: DeltaCounts = DeltaCounts()
+        self._edges: DeltaCounts = DeltaCounts()
+        # Metrics of a `File` are computed lazily, each stage only runs when a method reads it
+        self._stages: dict[str, MetricStage] = {
+            "tokens": MetricStage(dependencies=[], compute=self._compute_tokens),
+            "pos": MetricStage(dependencies=["tokens"], compute=self._compute_pos),
+            "lemma": MetricStage(dependencies=["tokens", "pos"], compute=self._compute_lemma),
+            "stop_word_free": MetricStage(dependencies=["lemma"], compute=self._compute_stop_word_free),
+            "word_frequency": MetricStage(
+                dependencies=["tokens", "stop_word_free"], compute=self._compute_word_frequency
+            ),
+            "tf_idf": MetricStage(dependencies=["word_frequency"], compute=self._compute_tf_idf),
+            "stemmed": MetricStage(dependencies=["stop_word_free"], compute=self._compute_stemmed),
+            "page_rank": MetricStage(dependencies=["stemmed"], compute=self._compute_page_rank),
+        }
+        self._extraction_methods: dict[str, Callable[..., list]] = {
+            "wf": self._extract_with_word_frequency,
+            "tfidf": self._extract_with_tf_idf,
+            "pr": self._extract_with_page_rank,
+        }
 
     def update_txt(self, new_txt: str) -> None:
         self.txt = new_txt
 
+    @property
+    def _stemmer(self) -> "PorterStemmer":
+        return get_stemmer()
+
+    def cache_info(self) -> dict[str, dict]:
+        return {"lemma": self._lemmatizer.cache.info(), "stem": self._stem_cache.info()}
+
+    def reset(self) -> None:
+        # Ids of earlier files are invalid afterwards, the caches are keyed by them
+        self._vocabulary = Vocabulary()
+        self._pos_tags = Vocabulary()
+        self._lemmatizer.cache.clear()
+        self._stem_cache.clear()
+        self._paragraphs = {}
+        self._word_counts.clear()
+        self._edges.clear()
+
+    def count_words(self, txt: str) -> dict[str, int]:
+        """Counts of the stop word free words of `txt` in order of their first occurrence."""
+        self.update_txt(new_txt=txt)
+        if self.profiler is None:
+            return self._new_file().get_metric(metric_type="word_frequency", key="word_counts")
+
+        # Stages of these counts are added to those of the pipeline, like those of an extraction
+        self._file_profiler = StageProfiler(trace_memory=self.trace_memory)
+        try:
+            counts: dict[str, int] = self._new_file().get_metric(
+                metric_type="word_frequency", key="word_counts"
+            )
+            stats: dict[str, dict] = self._file_profiler.stats()
+        finally:
+            self._file_profiler = None
+        self.profiler.merge(stats=stats)
+        return counts
+
     def extract(self) -> dict:
-        result: dict = {"text": self.txt, "extraction_method": self.method, "keywords": [], "file": File()}
-
-        if self.method == "wf":
-            keywords, file = self._extract_with_word_frequency()
-            result["keywords"] = keywords
-            result["file"] = file.as_dict()
-        elif self.method == "tfidf":
-            keywords, file = self._extract_with_tf_idf(doc_counter=1)
-            result["keywords"] = keywords
-            result["file"] = file.as_dict()
-        elif self.method == "pr":
-            keywords, file = self._extract_with_page_rank()
-            result["keywords"] = keywords
-            result["file"] = file.as_dict()
-        elif self.method == "full":
-            # ToDo: Define full extraction with all methods
-            pass
-        else:
-            # ToDo: Exception handling
-            pass
+        return self._extract_cached(
+            content_hash=None,
+            text=self.txt,
+            new_file=self._new_incremental_file if self.incremental else self._new_file,
+        )
 
-        return result
+    def extract_many(self, texts: Iterable[str], method: Optional[str] = None) -> list[dict]:
+        """Results of `texts` in order, all extracted by this pipeline so they share its models and caches."""
+        return [self._extract_text(txt=txt, method=method) for txt in texts]
 
-    def _extract_with_word_frequency(self, max_keywords: int = 10) -> list:
-        file: File = self._base_extraction()
+    async def aextract(
+        self, txt: Optional[str] = None, method: Optional[str] = None, executor: Optional["Executor"] = None
+    ) -> dict:
+        """`extract` of `txt` (default: the text of this extractor) without blocking the event loop."""
+        results: list[dict] = await self.aextract_many(
+            texts=[self.txt if txt is None else txt], method=method, executor=executor
+        )
+        return results[0]
 
-        clean_words: list = file.get_metric(metric_type="stop_word_free", key="words")
+    async def aextract_many(
+        self,
+        texts: Union[Iterable[str], AsyncIterable[str]],
+        method: Optional[str] = None,
+        executor: Optional["Executor"] = None,
+        max_pending: int = 16,
+    ) -> list[dict]:
+        """Results of `texts` in order, extracted off the event loop.
 
-        word_counts: dict = {}
-        for word in clean_words:
-            if word not in word_counts.keys():
-                word_counts[word] = 1
-            else:
-                word_counts[word] += 1
+        Without `executor` the texts are extracted one after another by this pipeline in a background thread.
+        With a pool of `self.executor` they are extracted in parallel by its workers. At most `max_pending`
+        texts are submitted and not yet collected, `texts` is only read further when one is collected.
+        """
+        import asyncio
 
-        raw_file_length: int = len(file.get_metric(metric_type="tokens", key="words"))
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        pending: deque[asyncio.Future] = deque()
+        results: list[dict] = []
+        try:
+            async for txt in _aiter(texts):
+                if len(pending) >= max_pending:
+                    results.append(await pending.popleft())
+                if executor is None:
+                    pending.append(loop.run_in_executor(self._executor(), self._extract_text, txt, method))
+                else:
+                    pending.append(loop.run_in_executor(executor, _extract_text_in_worker, txt, method))
+            while pending:
+                results.append(await pending.popleft())
+        finally:
+            for future in pending:  # Only left on an error
+                future.cancel()
+        return results
 
-        term_frequencies: dict = {}
-        for word, count in word_counts.items():
-            term_frequencies[word] = count / raw_file_length
+    def executor(self, workers: int = 1, kind: str = "thread") -> "Executor":
+        """Pool for `aextract` and `aextract_many`, each worker holds a pipeline with the options of this one.
 
-        file.add_metric(metric_type="word_frequency", key="word_counts", value=word_counts)
-        file.add_metric(metric_type="word_frequency", key="raw_file_length", value=raw_file_length)
-        file.add_metric(metric_type="word_frequency", key="term_frequencies", value=term_frequencies)
+        kind: thread => workers share the process and the loaded models, process => workers run in
+        parallel without the GIL. The caller shuts the pool down, e.g. with a `with` block.
+        """
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-        return [
-            self._get_keywords(
-                data=file.get_metric(metric_type="word_frequency", key="term_frequencies"),
-                max_length=max_keywords,
-            ),
-            file,
-        ]
-
-    def _extract_with_tf_idf(self, doc_counter: int = 1, max_keywords: int = 10) -> list:
-        file: File = self._extract_with_word_frequency()[1]
-        tokens = file.get_metric(metric_type="word_frequency", key="word_counts").keys()
-        document_frequencies = {}
-        inverse_document_frequencies = {}
-        term_frequency_inverse_document_frequencies = {}
-
-        for token in tokens:
-            if token in file.get_metric(metric_type="stop_word_free", key="words"):
-                if token not in document_frequencies:
-                    document_frequencies[token] = 0
-                document_frequencies[token] += 1
-
-        for key, value in document_frequencies.items():
-            inverse_document_frequencies[key] = 1 + math.log(doc_counter / value)
-
-        keys: list[str] = list(inverse_document_frequencies.keys())
-        for index, key in enumerate(keys):
-            tf_idf: float = list(inverse_document_frequencies.values())[index]
-            term_frequency_inverse_document_frequencies[key] = (
-                len(file.get_metric(metric_type="word_frequency", key="term_frequencies").keys()) * tf_idf
-            )
+        pools: dict[str, Callable[..., Executor]] = {
+            "thread": ThreadPoolExecutor,
+            "process": ProcessPoolExecutor,
+        }
+        if kind not in pools:
+            raise ValueError(f"Unknown executor kind '{kind}', expected one of {', '.join(pools)}.")
+        return pools[kind](
+            max_workers=workers, initializer=_init_worker, initargs=(self.method, self.options())
+        )
 
-        file.add_metric(metric_type="tf_idf", key="document_frequencies", value=document_frequencies)
-        file.add_metric(
-            metric_type="tf_idf", key="inverse_document_frequencies", value=inverse_document_frequencies
+    def options(self) -> dict[str, Any]:
+        """Keyword arguments of a pipeline configured like this one."""
+        return {
+            "window_size": self.window_size,
+            "tolerance": self.tolerance,
+            "max_iterations": self.max_iterations,
+            "page_rank_backend": self.page_rank_backend,
+            "cache_size": self.cache_size,
+            "result_cache": self.result_cache,
+            "detail": self.detail,
+            "chunk_size": self.chunk_size,
+            "max_keywords": self.max_keywords,
+            "incremental": self.incremental,
+            "time_budget_ms": self.time_budget_ms,
+            "profile": self.profiler is not None,
+            "trace_memory": self.trace_memory,
+        }
+
+    def extract_file(self, path: str, chunk_size: Optional[int] = None) -> dict:
+        """Extracts a file of any size without reading it at once.
+
+        The file is memory-mapped and goes through the pipeline in chunks of about `chunk_size` bytes which
+        end after a line break. Word counts and co-occurrences of the chunks are merged, the rankings are
+        computed from the merged statistics and equal those of `extract` on the whole text. Peak memory
+        depends on the chunk size and the vocabulary, not on the file size.
+
+        The `file` of a `full` result holds the merged metrics. Its stop word free words are the distinct
+        words of the file, `text` and token lists are not kept.
+        """
+        chunk_size = chunk_size or self.chunk_size or DEFAULT_CHUNK_SIZE
+        return self._extract_cached(
+            content_hash=f"chunked-{_file_hash(path=path)}",
+            text=None,
+            new_file=lambda: self._merge_chunks(path=path, chunk_size=chunk_size),
         )
-        file.add_metric(
-            metric_type="tf_idf",
-            key="term_frequency_inverse_document_frequencies",
-            value=term_frequency_inverse_document_frequencies,
+
+    def _extract_cached(
+        self, content_hash: Optional[str], text: Optional[str], new_file: Callable[[], File]
+    ) -> dict:
+        if self.time_budget_ms is None:
+            return self._extract_profiled(content_hash=content_hash, text=text, new_file=new_file)
+        return self._extract_within_budget(content_hash=content_hash, text=text, new_file=new_file)
+
+    def _extract_within_budget(
+        self, content_hash: Optional[str], text: Optional[str], new_file: Callable[[], File]
+    ) -> dict:
+        """Extraction that degrades to finish within `time_budget_ms`, reported as the `budget` of the result.
+
+        The cheapest degradation that fits is applied where the size of the work is still open:
+          - sampled_paragraphs: before tokenizing, evenly spaced paragraphs are kept if tokenizing the text
+            and the base stages would take more than half of the remaining budget
+          - sampled_sentences: before POS tagging, evenly spaced sentences are kept if tagging, lemmatizing
+            and filtering all tokens would take more than half of the remaining budget
+          - word_frequency: `pr` ranks by word frequency if no time is left after the base stages
+          - capped_graph: the page rank graph keeps its best connected words if its edges don't fit
+            `_BUDGET_MIN_ITERATIONS` iterations into the remaining budget
+          - stopped_early: power iteration stops at the deadline, `residual` tells how far from convergence
+          - scores_detail: a `full` result is built with the `scores` detail if decoding the word lists of
+            the file doesn't fit the remaining budget
+        `exceeded` of the report tells if the deadline passed anyway. Costs per character, token, edge and
+        result token are measured by every budgeted extraction. Degraded results are not put
+        into the result cache, budgeted extractions always use the sparse page rank backend.
+        """
+        self._budget = TimeBudget(milliseconds=self.time_budget_ms or 0.0, clock=self.clock)
+        try:
+            result: dict = self._extract_profiled(content_hash=content_hash, text=text, new_file=new_file)
+            report: dict = self._budget.report()
+        finally:
+            self._budget = None
+        return {**result, "budget": report}
+
+    def _extract_profiled(
+        self, content_hash: Optional[str], text: Optional[str], new_file: Callable[[], File]
+    ) -> dict:
+        if self.profiler is None:
+            return self._extract_or_load(content_hash=content_hash, text=text, new_file=new_file)
+
+        # Stages of this extraction only, they are added to those of the pipeline afterwards
+        self._file_profiler = StageProfiler(trace_memory=self.trace_memory)
+        try:
+            result: dict = self._extract_or_load(content_hash=content_hash, text=text, new_file=new_file)
+            stats: dict[str, dict] = self._file_profiler.stats()
+        finally:
+            self._file_profiler = None
+        self.profiler.merge(stats=stats)
+        return {**result, "profile": stats}
+
+    def _extract_or_load(
+        self, content_hash: Optional[str], text: Optional[str], new_file: Callable[[], File]
+    ) -> dict:
+        cache_key: Optional[str] = None
+        if self.result_cache is not None:
+            with self._measure(stage="result_cache"):
+                cache_key = self._result_cache_key(content_hash=content_hash)
+                cached_result: Optional[dict] = self.result_cache.get(key=cache_key)
+            if cached_result is not None:
+                return cached_result
+
+        keywords: Union[list[str], dict[str, list[str]]] = []
+        scores: dict = {}
+        file: Optional[File] = None
+
+        if self.method == "full":
+            # Every ranking reads the metrics of one shared file, the base pipeline runs once
+            file = new_file()
+            keywords_by_method: dict[str, list[str]] = {}
+            for method, extract_with in self._extraction_methods.items():
+                with self._measure(stage=f"rank_{method}", items=lambda: len(keywords_by_method[method])):
+                    keywords_by_method[method], _, method_scores = extract_with(file=file)
+                scores[method] = dict(zip(keywords_by_method[method], method_scores))
+            keywords = keywords_by_method
+        else:
+            with self._measure(stage=f"rank_{self.method}", items=lambda: len(keywords)):
+                keywords, file, method_scores = self._extraction_methods[self.method](file=new_file())
+            scores = dict(zip(keywords, method_scores))
+
+        with self._measure(stage="result"):
+            result: dict = self._build_result(keywords=keywords, scores=scores, file=file, text=text)
+
+        degraded: bool = self._budget is not None and bool(self._budget.degradations)
+        if cache_key is not None and self.result_cache is not None and not degraded:
+            self.result_cache.put(key=cache_key, value=result)
+
+        return result
+
+    def _measure(self, stage: str, items: Optional[Callable[[], int]] = None) -> ContextManager[None]:
+        # Stages outside of the metric stages of `File`, measured if the running extraction is profiled
+        if self._file_profiler is None:
+            return nullcontext()
+        return self._file_profiler.measure(stage=stage, items=items)
+
+    def _extract_text(self, txt: str, method: Optional[str] = None) -> dict:
+        if method is not None:
+            _check_method(method=method)
+        default_method: str = self.method
+        self.method = method or self.method
+        try:
+            self.update_txt(new_txt=txt)
+            return self.extract()
+        finally:
+            self.method = default_method
+
+    def _executor(self) -> "ThreadPoolExecutor":
+        # One thread, so this pipeline is never used by two texts at the same time
+        if self._own_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._own_executor = ThreadPoolExecutor(max_workers=1)
+        return self._own_executor
+
+    def _result_cache_key(self, content_hash: Optional[str] = None) -> str:
+        # Content hash first, then everything else the result depends on
+        content_hash = content_hash or hashlib.sha256(self.txt.encode("utf-8")).hexdigest()
+        # Budgeted extractions always use the sparse backend, whatever backend is configured
+        page_rank_backend: str = "sparse" if self.time_budget_ms is not None else self.page_rank_backend
+        options: str = json.dumps(
+            [
+                self.detail,
+                self.max_keywords,
+                self.window_size,
+                self.tolerance,
+                self.max_iterations,
+                page_rank_backend,
+            ]
         )
+        options_hash: str = hashlib.sha256(options.encode("utf-8")).hexdigest()[:16]
+        return f"{content_hash}:{self.method}:{PIPELINE_VERSION}:{options_hash}"
 
-        return [
-            self._get_keywords(
-                data=file.get_metric(metric_type="tf_idf", key="term_frequency_inverse_document_frequencies"),
-                max_length=max_keywords,
-            ),
-            file,
-        ]
+    def _build_result(
+        self,
+        keywords: Union[list[str], dict[str, list[str]]],
+        scores: dict,
+        file: Optional[File],
+        text: Optional[str],
+    ) -> dict:
+        detail: str = self._detail_within_budget(file=file) if self._budget is not None else self.detail
+        result: dict = {"extraction_method": self.method, "keywords": keywords}
 
-    def _extract_with_page_rank(self, doc_counter: int = 1, max_keywords: int = 10) -> list:
-        file: File = self._extract_with_tf_idf(doc_counter=doc_counter)[1]
+        if detail == "scores":
+            result["scores"] = scores
+        elif detail == _WORD_COUNTS_DETAIL and file is not None:
+            result["scores"] = scores
+            result["file"] = {
+                "word_frequency": {
+                    "word_counts": file.get_metric(metric_type="word_frequency", key="word_counts"),
+                    "raw_file_length": file.get_metric(metric_type="word_frequency", key="raw_file_length"),
+                }
+            }
+        elif detail == "full":
+            result = {"text": text, **result, "file": file.as_dict() if file is not None else File()}
+            if self._budget is not None and file is not None:
+                self._learn_cost(
+                    name="result", seconds=self._budget.since(name="result"), items=file.item_count("tokens")
+                )
 
-        stemmed_words = []
-        for sentence in file.get_metric(metric_type="stop_word_free", key="words_per_sentence"):
-            stemmed_words.append([self._stemmer.stem(word) for word in sentence])
+        return result
 
-        file.add_metric(metric_type="stemmed", key="words_per_sentence", value=stemmed_words)
-        file.add_metric(
-            metric_type="stemmed",
-            key="words",
-            value=flatten_nested_lists(
-                collection=file.get_metric(metric_type="stemmed", key="words_per_sentence")
-            ),
+    def _detail_within_budget(self, file: Optional[File]) -> str:
+        # Decoding every word list of a `full` result takes longer than the rankings, it has to fit the rest
+        # of the budget
+        assert self._budget is not None
+        if self.detail != "full" or file is None:
+            return self.detail
+        tokens: int = file.item_count(metric_type="tokens")
+        if tokens * self._costs["result"] > self._budget.remaining():
+            self._budget.degrade(name="scores_detail", tokens=tokens)
+            return "scores"
+        self._budget.mark(name="result")
+        return self.detail
+
+    def _extract_with_word_frequency(
+        self, max_keywords: Optional[int] = None, file: Optional[File] = None
+    ) -> list:
+        file = file or self._new_file()
+        term_frequencies: dict = file.get_metric(
+            metric_type="word_frequency", key="term_frequencies", decode=False
         )
-        file.add_metric(
-            metric_type="stemmed",
-            key="duplicate_free_words",
-            value=remove_duplicates(collection=file.get_metric(metric_type="stemmed", key="words")),
+        keyword_ids: list[int] = self._get_keywords(
+            data=term_frequencies, max_length=self.max_keywords if max_keywords is None else max_keywords
         )
+        return [file.vocabulary.words(keyword_ids), file, [term_frequencies[key] for key in keyword_ids]]
 
-        graph = networkx.Graph()
-        for sentence in file.get_metric(metric_type="stemmed", key="words_per_sentence"):
-            graph.add_nodes_from(sentence)
-            for word1 in sentence:
-                for word2 in sentence:
-                    if word1 != word2:
-                        graph.add_edge(word1, word2)
+    def _extract_with_tf_idf(self, max_keywords: Optional[int] = None, file: Optional[File] = None) -> list:
+        file = file or self._new_file()
+        tf_idf: dict = file.get_metric(
+            metric_type="tf_idf", key="term_frequency_inverse_document_frequencies", decode=False
+        )
+        keyword_ids: list[int] = self._get_keywords(
+            data=tf_idf, max_length=self.max_keywords if max_keywords is None else max_keywords
+        )
+        return [file.vocabulary.words(keyword_ids), file, [tf_idf[key] for key in keyword_ids]]
 
-        scores = networkx.pagerank(graph)
-        file.add_metric(metric_type="page_rank", key="scores", value=scores)
-        top_keywords = self._get_keywords(
-            data=file.get_metric(metric_type="page_rank", key="scores"), max_length=max_keywords
+    def _extract_with_page_rank(
+        self, max_keywords: Optional[int] = None, file: Optional[File] = None
+    ) -> list:
+        file = file or self._new_file()
+        if self._budget is not None and self._out_of_budget(file=file):
+            return self._extract_with_word_frequency(max_keywords=max_keywords, file=file)
+        scores: dict = file.get_metric(metric_type="page_rank", key="scores", decode=False)
+        top_keywords: list[int] = self._get_keywords(
+            data=scores, max_length=self.max_keywords if max_keywords is None else max_keywords
         )
 
+        # Map stems back to the first stop word free word they belong to
+        word_ids: list[int] = first_occurrences(ids=file.get_ids(metric_type="stop_word_free")).tolist()
+        known_word_ids: set[int] = set(word_ids)
         mapped_top_keywords = []
-        for keyword in top_keywords:
-            if keyword in file.get_metric(metric_type="stop_word_free", key="duplicate_free_words"):
+        mapped_scores: list[float] = []  # Score of the stem of every mapped keyword
+        for keyword_id in top_keywords:
+            keyword: str = file.vocabulary.word(keyword_id)
+            if keyword_id in known_word_ids:
                 mapped_top_keywords.append(keyword)
+                mapped_scores.append(scores[keyword_id])
             else:
-                for c_word in file.get_metric(metric_type="stop_word_free", key="duplicate_free_words"):
+                for c_word in file.vocabulary.words(word_ids):
                     if c_word.startswith(keyword):
                         mapped_top_keywords.append(c_word)
+                        mapped_scores.append(scores[keyword_id])
                         break
 
-        return [mapped_top_keywords, file]
+        return [mapped_top_keywords, file, mapped_scores]
 
-    def _base_extraction(self) -> File:
-        file: File = File()
+    def _out_of_budget(self, file: File) -> bool:
+        # The base stages run first, page rank only starts if there is time left after them
+        file.compute(metric_type="stop_word_free")
+        if self._budget is None or not self._budget.expired():
+            return False
+        self._budget.degrade(name="word_frequency")
+        return True
 
-        # Add original text
+    def _new_file(self) -> File:
+        file: File = File(
+            vocabulary=self._vocabulary,
+            pos_tags=self._pos_tags,
+            stages=self._stages,
+            profiler=self._file_profiler,
+        )
+
+        # Add original text, every metric is computed on first access
         file.add_text(txt=self.txt.lower())
 
-        # Add tokens
-        file.add_metric(
-            metric_type="tokens",
-            key="paragraphs",
-            value=self._tokenizer.text_to_paragraphs(txt=file.get_text()),
+        return file
+
+    def _new_incremental_file(self) -> File:
+        """A file of the text built from the files of its paragraphs, only new paragraphs are extracted.
+
+        Sentences never span paragraphs, so every metric of the paragraphs concatenated in text order equals
+        the metric of the whole text. Word counts and co-occurrence edges are `DeltaCounts` of the
+        paragraphs: only those of added or removed paragraphs change them. Metrics stay lazy, a stage only
+        runs on the paragraphs when the ranking reads it.
+        """
+        txt: str = self.txt.lower()
+        if not txt:
+            return self._new_file()  # Without paragraphs, like a text of white space
+
+        paragraphs: list[str] = Tokenizer.text_to_paragraphs(txt=txt)
+        files: dict[str, File] = {}  # Paragraph files by their text, lookups hash the paragraph
+        for paragraph in paragraphs:
+            if paragraph in files:
+                continue
+            paragraph_file: Optional[File] = self._paragraphs.get(paragraph)
+            if paragraph_file is None:
+                paragraph_file = File(
+                    vocabulary=self._vocabulary, pos_tags=self._pos_tags, stages=self._stages
+                )
+                paragraph_file.add_text(txt=paragraph)
+            paragraph_file.profiler = self._file_profiler
+            files[paragraph] = paragraph_file
+        self._paragraphs = files  # Paragraphs of earlier texts are dropped
+
+        file: File = File(
+            vocabulary=self._vocabulary,
+            pos_tags=self._pos_tags,
+            stages=self._paragraph_stages(paragraphs=paragraphs, files=files),
         )
-        file.add_metric(
-            metric_type="tokens",
-            key="sentences_per_paragraph",
-            value=self._tokenizer.paragraphs_to_sentences_per_paragraph(
-                paragraphs=file.get_metric(metric_type="tokens", key="paragraphs")
+        file.add_text(txt=txt)
+        return file
+
+    def _paragraph_stages(self, paragraphs: list[str], files: dict[str, File]) -> dict[str, MetricStage]:
+        # Stages of a file of `_new_incremental_file`, with the dependencies of the stages of `_new_file`
+        ordered_files: list[File] = [files[paragraph] for paragraph in paragraphs]
+
+        def concatenate(metric_type: str) -> array:
+            ids: array = array("I" if metric_type != "pos" else "H")
+            for paragraph_file in ordered_files:
+                ids.extend(paragraph_file.get_ids(metric_type=metric_type))
+            return ids
+
+        compute: dict[str, Callable[[File], None]] = {
+            "tokens": lambda file: file.add_tokens(
+                token_ids=concatenate(metric_type="tokens"),
+                sentence_offsets=concatenate_offsets(
+                    offsets=(
+                        paragraph_file.get_offsets(metric_type="tokens") for paragraph_file in ordered_files
+                    )
+                ),
+                # A paragraph file is one paragraph with all of its sentences
+                paragraph_offsets=concatenate_offsets(
+                    offsets=(
+                        array("I", [0, len(paragraph_file.get_offsets(metric_type="tokens")) - 1])
+                        for paragraph_file in ordered_files
+                    )
+                ),
             ),
-        )
-        file.add_metric(
-            metric_type="tokens",
-            key="sentences",
-            value=self._tokenizer.sentences_per_paragraph_to_sentences(
-                sentences_per_paragraph=file.get_metric(metric_type="tokens", key="sentences_per_paragraph")
+            "pos": lambda file: file.add_pos(pos_ids=concatenate(metric_type="pos")),
+            "lemma": lambda file: file.add_lemma(lemma_ids=concatenate(metric_type="lemma")),
+            "stop_word_free": lambda file: file.add_stop_word_free(
+                stop_word_free_ids=concatenate(metric_type="stop_word_free"),
+                stop_word_free_offsets=concatenate_offsets(
+                    offsets=(
+                        paragraph_file.get_offsets(metric_type="stop_word_free")
+                        for paragraph_file in ordered_files
+                    )
+                ),
             ),
-        )
-        file.add_metric(
-            metric_type="tokens",
-            key="words_per_sentence",
-            value=self._tokenizer.sentences_to_words_per_sentence(
-                sentences=file.get_metric(metric_type="tokens", key="sentences")
+            "word_frequency": lambda file: self._compute_word_frequency_of_paragraphs(
+                file=file, paragraphs=paragraphs, files=files
             ),
-        )
-        file.add_metric(
-            metric_type="tokens",
-            key="words",
-            value=self._tokenizer.words_per_sentence_to_words(
-                words_per_sentence=file.get_metric(metric_type="tokens", key="words_per_sentence")
+            "tf_idf": self._compute_tf_idf,
+            "stemmed": lambda file: file.add_stemmed(stemmed_ids=concatenate(metric_type="stemmed")),
+            "page_rank": lambda file: self._compute_page_rank_of_paragraphs(
+                file=file, paragraphs=paragraphs, files=files
             ),
-        )
+        }
+        return {
+            metric_type: MetricStage(dependencies=stage.dependencies, compute=compute[metric_type])
+            for metric_type, stage in self._stages.items()
+        }
+
+    def _compute_word_frequency_of_paragraphs(
+        self, file: File, paragraphs: list[str], files: dict[str, File]
+    ) -> None:
+        with self._measure(stage="word_frequency"):
+            paragraph_counts: dict[str, dict] = {
+                paragraph: paragraph_file.get_metric(
+                    metric_type="word_frequency", key="word_counts", decode=False
+                )
+                for paragraph, paragraph_file in files.items()
+            }
+            self._word_counts.update(keys=paragraphs, counts_of=paragraph_counts.__getitem__)
+            # Words in order of their first occurrence in the text, like `_compute_word_frequency`
+            word_ids: dict[int, None] = {}
+            for paragraph in paragraphs:
+                word_ids.update(dict.fromkeys(paragraph_counts[paragraph]))
+            word_counts: dict[int, int] = {word_id: self._word_counts.counts[word_id] for word_id in word_ids}
+            raw_file_length: int = len(file.get_ids(metric_type="tokens"))
+
+        file.add_metric(metric_type="word_frequency", key="word_counts", value=word_counts)
+        file.add_metric(metric_type="word_frequency", key="raw_file_length", value=raw_file_length)
         file.add_metric(
-            metric_type="tokens",
-            key="duplicate_free_words",
-            value=remove_duplicates(collection=file.get_metric(metric_type="tokens", key="words")),
+            metric_type="word_frequency",
+            key="term_frequencies",
+            value={word_id: count / raw_file_length for word_id, count in word_counts.items()},
         )
 
-        # Add point of speech
-        file.add_metric(
-            metric_type="pos",
-            key="words_per_sentence",
-            value=self._pos_tagger.generate_tags(
-                collection=file.get_metric(metric_type="tokens", key="words_per_sentence")
-            ),
+    def _compute_page_rank_of_paragraphs(
+        self, file: File, paragraphs: list[str], files: dict[str, File]
+    ) -> None:
+        if self.page_rank_backend == "networkx":
+            self._compute_page_rank(file=file)  # The reference implementation builds its own graph
+            return
+
+        with self._measure(stage="page_rank"):
+            self._edges.update(
+                keys=paragraphs, counts_of=lambda paragraph: self._edge_counts(file=files[paragraph])
+            )
+            edges: np.ndarray = np.fromiter(self._edges.counts, dtype=np.uint64, count=len(self._edges))
+            scores: dict = self._page_rank_of_edges(
+                stem_ids=first_occurrences(ids=file.get_ids(metric_type="stemmed")).tolist(), edges=edges
+            )
+        file.add_metric(metric_type="page_rank", key="scores", value=scores)
+
+    def _edge_counts(self, file: File) -> dict[int, int]:
+        # Every co-occurrence edge of a paragraph once, as `edge_keys`
+        adjacency = cooccurrence_matrix(
+            ids=np.frombuffer(file.get_ids(metric_type="stemmed"), dtype=np.uint32).astype(np.int64),
+            offsets=np.array(file.get_offsets(metric_type="stemmed"), dtype=np.int64),
+            node_count=len(self._vocabulary),
+            window_size=self.window_size,
         )
-        file.add_metric(
-            metric_type="pos",
-            key="words",
-            value=flatten_nested_lists(
-                collection=file.get_metric(metric_type="pos", key="words_per_sentence")
-            ),
+        return dict.fromkeys(edge_keys(adjacency=adjacency).tolist(), 1)
+
+    def _merge_chunks(self, path: str, chunk_size: int) -> File:
+        word_counts: dict[int, int] = {}  # In order of first occurrence, which breaks ties between scores
+        raw_file_length: int = 0
+        stem_ids: dict[int, None] = {}  # Page rank nodes in order of first occurrence
+        edges: np.ndarray = np.zeros(0, dtype=np.uint64)
+        with_page_rank: bool = self.method in ("pr", "full")
+
+        for chunk in iter_text_chunks(path=path, chunk_size=chunk_size):
+            file: File = File(
+                vocabulary=self._vocabulary,
+                pos_tags=self._pos_tags,
+                stages=self._stages,
+                profiler=self._file_profiler,
+            )
+            file.add_text(txt=chunk.lower())
+            del chunk  # Only the lowercased copy is needed
+
+            unique_ids, first_indices, counts = np.unique(
+                np.frombuffer(file.get_ids(metric_type="stop_word_free"), dtype=np.uint32),
+                return_index=True,
+                return_counts=True,
+            )
+            order: np.ndarray = np.argsort(first_indices)
+            for word_id, count in zip(unique_ids[order].tolist(), counts[order].tolist()):
+                word_counts[word_id] = word_counts.get(word_id, 0) + count
+            raw_file_length += len(file.get_ids(metric_type="tokens"))
+
+            if with_page_rank:
+                stemmed_ids: np.ndarray = np.frombuffer(file.get_ids(metric_type="stemmed"), dtype=np.uint32)
+                stem_ids.update(
+                    dict.fromkeys(first_occurrences(ids=file.get_ids(metric_type="stemmed")).tolist())
+                )
+                with self._measure(stage="page_rank"):
+                    adjacency = cooccurrence_matrix(
+                        ids=stemmed_ids.astype(np.int64),
+                        offsets=np.array(file.get_offsets(metric_type="stemmed"), dtype=np.int64),
+                        node_count=len(self._vocabulary),
+                        window_size=self.window_size,
+                    )
+                    edges = np.union1d(edges, edge_keys(adjacency=adjacency))
+
+        # One file with the merged statistics, the rankings read them like those of a single text
+        merged_file: File = File(vocabulary=self._vocabulary, pos_tags=self._pos_tags)
+        word_ids: array = array("I", word_counts.keys())
+        merged_file.add_stop_word_free(
+            stop_word_free_ids=word_ids, stop_word_free_offsets=array("I", [0, len(word_ids)])
         )
-        file.add_metric(
-            metric_type="pos",
-            key="duplicate_free_words",
-            value=remove_duplicates(collection=file.get_metric(metric_type="pos", key="words")),
+        merged_file.add_metric(metric_type="word_frequency", key="word_counts", value=word_counts)
+        merged_file.add_metric(metric_type="word_frequency", key="raw_file_length", value=raw_file_length)
+        merged_file.add_metric(
+            metric_type="word_frequency",
+            key="term_frequencies",
+            value={word_id: count / raw_file_length for word_id, count in word_counts.items()},
         )
+        with self._measure(stage="tf_idf"):
+            self._compute_tf_idf(file=merged_file)
+        if with_page_rank:
+            with self._measure(stage="page_rank"):
+                merged_file.add_metric(
+                    metric_type="page_rank",
+                    key="scores",
+                    value=self._page_rank_of_edges(stem_ids=list(stem_ids), edges=edges),
+                )
 
-        # Add lemma
-        file.add_metric(
-            metric_type="lemma",
-            key="words_per_sentence",
-            value=self._lemmatizer.lemmatize(
-                collection=file.get_metric(metric_type="pos", key="words_per_sentence")
-            ),
+        return merged_file
+
+    def _page_rank_of_edges(self, stem_ids: list[int], edges: np.ndarray) -> dict:
+        node_of_id: np.ndarray = np.full(len(self._vocabulary), -1, dtype=np.int64)
+        node_of_id[stem_ids] = np.arange(len(stem_ids))
+        adjacency = adjacency_from_edge_keys(keys=edges, node_of_id=node_of_id, node_count=len(stem_ids))
+        if self._budget is not None:
+            return self._page_rank_within_budget(
+                adjacency=adjacency, node_ids=np.array(stem_ids, dtype=np.int64)
+            )
+        ranks, _ = page_rank(
+            adjacency=adjacency, tolerance=self.tolerance, max_iterations=self.max_iterations
         )
-        file.add_metric(
-            metric_type="lemma",
-            key="words",
-            value=flatten_nested_lists(
-                collection=file.get_metric(metric_type="lemma", key="words_per_sentence")
-            ),
+        return dict(zip(stem_ids, ranks.tolist()))
+
+    def _compute_tokens(self, file: File) -> None:
+        txt: Optional[str] = file.get_text()
+        # Paragraph files of incremental mode are kept for later texts, they are never sampled
+        within_budget: bool = self._budget is not None and not self.incremental
+        if within_budget and txt:
+            txt = self._sample_text_within_budget(txt=txt)
+        # An empty text has no paragraphs like a text of white space, it gives an empty result
+        tokenized_text: TokenizedText = (
+            self._tokenizer.tokenize(txt=txt, vocabulary=self._vocabulary)
+            if txt
+            else TokenizedText(text="", vocabulary=self._vocabulary)
         )
-        file.add_metric(
-            metric_type="lemma",
-            key="duplicate_free_words",
-            value=remove_duplicates(collection=file.get_metric(metric_type="lemma", key="words")),
+        token_ids: array = tokenized_text.token_ids
+        sentence_offsets: array = tokenized_text.sentence_offsets
+        paragraph_offsets: array = tokenized_text.paragraph_offsets
+        if within_budget:
+            token_ids, sentence_offsets, paragraph_offsets = self._sample_within_budget(
+                token_ids=token_ids, sentence_offsets=sentence_offsets, paragraph_offsets=paragraph_offsets
+            )
+        file.add_tokens(
+            token_ids=token_ids,
+            sentence_offsets=sentence_offsets,
+            paragraph_offsets=paragraph_offsets,
+            tokenized_text=tokenized_text,
         )
 
-        # Remove stop words
-        file.add_metric(
-            metric_type="stop_word_free",
-            key="words_per_sentence",
-            value=remove_stop_words(
-                collection=file.get_metric(metric_type="lemma", key="words_per_sentence")
-            ),
+    def _compute_pos(self, file: File) -> None:
+        file.add_pos(
+            pos_ids=self._pos_tagger.generate_tag_ids(
+                token_ids=file.get_ids(metric_type="tokens"),
+                sentence_offsets=file.get_offsets(metric_type="tokens"),
+                vocabulary=self._vocabulary,
+                pos_tags=self._pos_tags,
+            )
+        )
+
+    def _compute_lemma(self, file: File) -> None:
+        file.add_lemma(
+            lemma_ids=self._lemmatizer.lemmatize_ids(
+                token_ids=file.get_ids(metric_type="tokens"),
+                tag_ids=file.get_ids(metric_type="pos"),
+                vocabulary=self._vocabulary,
+                pos_tags=self._pos_tags,
+            )
+        )
+
+    def _compute_stop_word_free(self, file: File) -> None:
+        stop_word_free_ids, stop_word_free_offsets = remove_stop_word_ids(
+            ids=file.get_ids(metric_type="lemma"),
+            offsets=file.get_offsets(metric_type="lemma"),
+            vocabulary=self._vocabulary,
+        )
+        file.add_stop_word_free(
+            stop_word_free_ids=stop_word_free_ids, stop_word_free_offsets=stop_word_free_offsets
         )
+        if self._budget is not None:
+            self._learn_cost(
+                name="char",
+                seconds=self._budget.since(name="text"),
+                items=len(file.tokenized_text.text) if file.tokenized_text is not None else 0,
+            )
+            self._learn_cost(
+                name="token",
+                seconds=self._budget.since(name="tokens"),
+                items=len(file.get_ids(metric_type="tokens")),
+            )
+
+    def _sample_text_within_budget(self, txt: str) -> str:
+        # Paragraphs the tokenizer and the base stages can process in their share of the remaining budget,
+        # sampled before the text is tokenized
+        assert self._budget is not None
+        estimated_seconds: float = len(txt) * self._costs["char"]
+        allowed_seconds: float = max(self._budget.remaining(), 0.0) * _BUDGET_BASE_SHARE
+        if estimated_seconds > allowed_seconds:
+            txt, paragraph_count, kept = sample_paragraphs(
+                txt=txt, fraction=allowed_seconds / estimated_seconds
+            )
+            if kept < paragraph_count:
+                self._budget.degrade(name="sampled_paragraphs", paragraphs=paragraph_count, kept=kept)
+        self._budget.mark(name="text")
+        return txt
+
+    def _sample_within_budget(
+        self, token_ids: array, sentence_offsets: array, paragraph_offsets: array
+    ) -> tuple[array, array, array]:
+        # Sentences the base stages can process in their share of the remaining budget
+        assert self._budget is not None
+        sentence_count: int = len(sentence_offsets) - 1
+        estimated_seconds: float = len(token_ids) * self._costs["token"]
+        allowed_seconds: float = max(self._budget.remaining(), 0.0) * _BUDGET_BASE_SHARE
+        if estimated_seconds > allowed_seconds and sentence_count > 1:
+            token_ids, sentence_offsets, paragraph_offsets = sample_sentences(
+                token_ids=token_ids,
+                sentence_offsets=sentence_offsets,
+                paragraph_offsets=paragraph_offsets,
+                count=int(sentence_count * allowed_seconds / estimated_seconds),
+            )
+            self._budget.degrade(
+                name="sampled_sentences", sentences=sentence_count, kept=len(sentence_offsets) - 1
+            )
+        self._budget.mark(name="tokens")
+        return token_ids, sentence_offsets, paragraph_offsets
+
+    def _learn_cost(self, name: str, seconds: Optional[float], items: int) -> None:
+        # Moving average of the measured costs, a single slow or fast extraction doesn't replace them
+        if seconds is not None and seconds > 0 and items > 0:
+            self._costs[name] = (self._costs[name] + seconds / items) / 2
+
+    def _compute_word_frequency(self, file: File) -> None:
+        # Distinct words in order of their first occurrence, which breaks ties between equal frequencies
+        unique_ids, first_indices, counts = np.unique(
+            np.frombuffer(file.get_ids(metric_type="stop_word_free"), dtype=np.uint32),
+            return_index=True,
+            return_counts=True,
+        )
+        order: np.ndarray = np.argsort(first_indices)
+        word_ids: list[int] = unique_ids[order].tolist()
+        raw_file_length: int = len(file.get_ids(metric_type="tokens"))
+
         file.add_metric(
-            metric_type="stop_word_free",
-            key="words",
-            value=flatten_nested_lists(
-                collection=file.get_metric(metric_type="stop_word_free", key="words_per_sentence")
-            ),
+            metric_type="word_frequency", key="word_counts", value=dict(zip(word_ids, counts[order].tolist()))
         )
+        file.add_metric(metric_type="word_frequency", key="raw_file_length", value=raw_file_length)
         file.add_metric(
-            metric_type="stop_word_free",
-            key="duplicate_free_words",
-            value=remove_duplicates(collection=file.get_metric(metric_type="stop_word_free", key="words")),
+            metric_type="word_frequency",
+            key="term_frequencies",
+            value=dict(zip(word_ids, (counts[order] / raw_file_length).tolist())),
         )
 
-        return file
+    def _compute_tf_idf(self, file: File) -> None:
+        # A single text is a corpus of one document, `KeywordExtractorDirectory` scores against all files
+        corpus: CorpusTfIdf = CorpusTfIdf()
+        corpus.add_document(
+            key="text",
+            word_counts=file.get_metric(metric_type="word_frequency", key="word_counts", decode=False),
+            length=file.get_metric(metric_type="word_frequency", key="raw_file_length"),
+        )
+        for key, value in corpus.document_metrics(index=0).items():
+            file.add_metric(metric_type="tf_idf", key=key, value=value)
 
-    @staticmethod
-    def _get_keywords(data: dict, max_length: int = 10):
-        mapped_list = []
-        for key, value in data.items():
-            mapped_list.append({"word": key, "value": value})
+    def _compute_stemmed(self, file: File) -> None:
+        stemmed_ids: array = array("I")
+        stemmer: "PorterStemmer" = self._stemmer
+        for word_id in file.get_ids(metric_type="stop_word_free"):
+            stem_id: Optional[int] = self._stem_cache.get(word_id)
+            if stem_id is None:
+                stem_id = file.vocabulary.intern(stemmer.stem(file.vocabulary.word(word_id)))
+                self._stem_cache.put(word_id, stem_id)
+            stemmed_ids.append(stem_id)
+        file.add_stemmed(stemmed_ids=stemmed_ids)
 
-        keywords_sorted = sorted(mapped_list, key=lambda d: d["value"], reverse=True)
+    def _compute_page_rank(self, file: File) -> None:
+        stemmed_ids: array = file.get_ids(metric_type="stemmed")
+        offsets: array = file.get_offsets(metric_type="stemmed")
+        # The reference backend can't stop at a deadline, budgeted extractions use the power iteration
+        if self.page_rank_backend == "networkx" and self._budget is None:
+            scores: dict = self._page_rank_with_networkx(ids=stemmed_ids, offsets=offsets)
+        else:
+            scores = self._page_rank_with_sparse_matrix(ids=stemmed_ids, offsets=offsets)
+        file.add_metric(metric_type="page_rank", key="scores", value=scores)
 
-        top_keywords = []
-        for index in range(0, max_length, 1):
-            top_keywords.append(keywords_sorted[index].get("word"))
+    def _page_rank_with_sparse_matrix(self, ids: array, offsets: array) -> dict:
+        # Nodes in order of first occurrence, the same node order networkx uses
+        unique_ids, first_indices, inverse = np.unique(
+            np.frombuffer(ids, dtype=np.uint32), return_index=True, return_inverse=True
+        )
+        order: np.ndarray = np.argsort(first_indices)
+        node_ids: np.ndarray = np.empty(len(order), dtype=np.int64)
+        node_ids[order] = np.arange(len(order))
 
-        return top_keywords
+        adjacency = cooccurrence_matrix(
+            ids=node_ids[inverse],
+            offsets=np.array(offsets, dtype=np.int64),
+            node_count=len(order),
+            window_size=self.window_size,
+        )
+        if self._budget is not None:
+            return self._page_rank_within_budget(adjacency=adjacency, node_ids=unique_ids[order])
+        ranks, _ = page_rank(
+            adjacency=adjacency, tolerance=self.tolerance, max_iterations=self.max_iterations
+        )
+
+        return dict(zip(unique_ids[order].tolist(), ranks.tolist()))
+
+    def _page_rank_within_budget(self, adjacency: "csr_matrix", node_ids: np.ndarray) -> dict:
+        # Scores of the words of `node_ids`, words dropped by a capped graph have none
+        assert self._budget is not None
+        budget: TimeBudget = self._budget
+        edge_count: int = adjacency.nnz // 2
+        max_edges: int = int(max(budget.remaining(), 0.0) / (self._costs["edge"] * _BUDGET_MIN_ITERATIONS))
+        if edge_count > max_edges:
+            # The best connected words are kept, they are the candidates for the highest scores. At least
+            # `max_keywords` of them, their few edges are worth more than a short list of keywords
+            kept: np.ndarray = cap_graph(
+                adjacency=adjacency,
+                priorities=np.diff(adjacency.indptr),
+                max_edges=max_edges,
+                min_nodes=self.max_keywords,
+            )
+            if len(kept) < len(node_ids):
+                budget.degrade(name="capped_graph", nodes=len(node_ids), kept=len(kept), edges=edge_count)
+                adjacency = adjacency[kept][:, kept]
+                node_ids = node_ids[kept]
+
+        iterations: list[bool] = []  # Whether the deadline had passed, per iteration that didn't converge
+
+        def should_stop() -> bool:
+            iterations.append(budget.expired())
+            return iterations[-1]
+
+        budget.mark(name="page_rank")
+        ranks, residual = page_rank(
+            adjacency=adjacency,
+            tolerance=self.tolerance,
+            max_iterations=self.max_iterations,
+            should_stop=should_stop,
+        )
+        converged: bool = residual < adjacency.shape[0] * self.tolerance
+        if iterations and iterations[-1]:
+            budget.degrade(name="stopped_early", iterations=len(iterations))
+        budget.residual = residual
+        self._learn_cost(
+            name="edge",
+            seconds=budget.since(name="page_rank"),
+            items=adjacency.nnz // 2 * (len(iterations) + converged),
+        )
+        return dict(zip(node_ids.tolist(), ranks.tolist()))
+
+    def _page_rank_with_networkx(self, ids: array, offsets: array) -> dict:
+        import networkx  # Optional dependency, only needed for the reference backend
+
+        window_size: Optional[int] = self.window_size
+        graph = networkx.Graph()
+        for sentence in split_by_offsets(values=ids.tolist(), offsets=offsets):
+            graph.add_nodes_from(sentence)
+            for index, word1 in enumerate(sentence, start=1):
+                end: Optional[int] = index - 1 + window_size if window_size else None
+                for word2 in sentence[index:end]:
+                    if word1 != word2:
+                        graph.add_edge(word1, word2)
+
+        return networkx.pagerank(graph, tol=self.tolerance, max_iter=self.max_iterations)
+
+    @staticmethod
+    def _get_keywords(data: dict, max_length: int = 10) -> list:
+        # Partial selection instead of a full sort, `nlargest` is stable so equal scores keep the order of
+        # `data` (first occurrence). Short documents give fewer keywords.
+        return heapq.nlargest(max_length, data, key=data.__getitem__)
 
 
 class KeywordExtractorDirectory:
-    def __init__(self, directory: str, method: str) -> None:
+    def __init__(
+        self,
+        directory: str,
+        method: str,
+        workers: int = 1,
+        ordered: bool = True,
+        deduplicate: Optional[float] = None,
+        **extractor_options: Any,
+    ) -> None:
+        _check_method(method=method)
         self.directory: str = directory
         self.method: str = method
-        self._paths: list[str] = self._scan_directory()
+        self.workers: int = workers
+        self.ordered: bool = ordered
+        # Similarity threshold of the near duplicate pre-pass, None => every file is extracted
+        self.deduplicate: Optional[float] = deduplicate
+        self.deduplication: Optional[dict] = None  # Report of the last pre-pass
+        self.extractor_options: dict = extractor_options  # Passed on to every `KeywordExtractor`
+        # Stages of every file and of the corpus TF-IDF, the results of the files hold their own stages
+        self.profiler: Optional[StageProfiler] = (
+            StageProfiler(trace_memory=extractor_options.get("trace_memory", False))
+            if extractor_options.get("profile")
+            else None
+        )
 
     def _scan_directory(self, directory: Optional[str] = None) -> list[str]:
-        directory = directory or self.directory
+        return list(self._iter_paths(directory=directory))
+
+    def _iter_paths(self, directory: Optional[str] = None) -> Iterator[str]:
+        # `os.scandir` entries already know their type, no extra stat call per path. They come in the order
+        # of the file system, sorted by name every node scans a directory in the same order.
+        with os.scandir(directory or self.directory) as entries:
+            for entry in sorted(entries, key=lambda entry: entry.name):
+                if entry.is_file():
+                    yield entry.path
+                elif entry.is_dir():
+                    yield from self._iter_paths(directory=entry.path)
+
+    def extract(self) -> dict[str, dict]:
+        return dict(self.iter_extract())
+
+    def iter_extract(self) -> Iterator[tuple[str, dict]]:
+        """Yields `(path, result)` per file while the directory is scanned.
+
+        `tfidf` (also part of `full`) needs the term counts of every file before the first file can be
+        scored, so its results are only yielded once the whole directory is extracted.
+        """
+        if self.method in ("tfidf", "full"):
+            yield from self._extract_with_corpus_tf_idf().items()
+        else:
+            yield from self._iter_results(method=self.method)
+
+    def extract_shard(self, index: int, count: int) -> dict:
+        """Extracts shard `index` of `count` and returns its partial statistics, see `merge_shards`.
+
+        A file belongs to the shard of the hash of its path relative to the directory, so every node
+        which sees the same directory selects the same files without coordination. `tfidf` and `full`
+        shards hold the first pass results and the term counts of their files (`CorpusTfIdf.to_dict`),
+        the other methods only their results. The position of every file in the scan keeps the merged
+        results in the order of a single run. The returned dict is JSON serializable.
+        """
+        if not 0 <= index < count:
+            raise ValueError(f"Shard {index} is out of range for {count} shards.")
+
+        positions: dict[str, int] = {}
+
+        def shard_paths() -> Iterator[str]:
+            for position, path in enumerate(self._iter_paths()):
+                if _shard_of(path=os.path.relpath(path, self.directory), count=count) == index:
+                    positions[path] = position
+                    yield path
+
+        corpus: Optional[CorpusTfIdf] = None
+        documents: list[dict] = []
+        if self.method in ("tfidf", "full"):
+            corpus = CorpusTfIdf()
+            for path, file_result in self._iter_first_pass(corpus=corpus, paths=shard_paths()):
+                documents.append({"path": path, "position": positions[path], "result": file_result})
+        else:
+            for path, file_result in self._iter_results(method=self.method, paths=shard_paths()):
+                documents.append({"path": path, "position": positions[path], "result": file_result})
+
+        options: dict = {**self.extractor_options, "deduplicate": self.deduplicate}
+        return {
+            "pipeline_version": PIPELINE_VERSION,
+            "method": self.method,
+            "options": {name: options.get(name) for name in _SHARD_OPTIONS},
+            "shard": index,
+            "shard_count": count,
+            "documents": documents,
+            "corpus": corpus.to_dict() if corpus is not None else None,
+        }
+
+    def _extract_with_corpus_tf_idf(self) -> dict[str, dict]:
+        corpus: CorpusTfIdf = CorpusTfIdf()
+        result: dict[str, dict] = dict(self._iter_first_pass(corpus=corpus))
+        self._score_corpus(corpus=corpus, result=result)
+        return result
+
+    def _iter_first_pass(
+        self, corpus: CorpusTfIdf, paths: Optional[Iterable[str]] = None
+    ) -> Iterator[tuple[str, dict]]:
+        # First pass: term counts of every file build the vocabulary and document frequencies
+        detail: str = self.extractor_options.get("detail", "full")
+        first_pass_method: str = "full" if self.method == "full" else "wf"
+        first_pass_detail: str = "full" if detail == "full" else _WORD_COUNTS_DETAIL
+        for path, file_result in self._iter_results(
+            method=first_pass_method, detail=first_pass_detail, paths=paths
+        ):
+            word_frequency: dict = file_result["file"]["word_frequency"]
+            corpus.add_document(
+                key=path, word_counts=word_frequency["word_counts"], length=word_frequency["raw_file_length"]
+            )
+            if detail != "full":
+                del file_result["file"]  # The counts are in the corpus now
+            if detail == "keywords":
+                del file_result["scores"]
+            yield path, file_result
+
+    def _score_corpus(self, corpus: CorpusTfIdf, result: dict[str, dict]) -> None:
+        # Second pass: score every file against the whole corpus
+        max_keywords: int = self.extractor_options.get("max_keywords", 10)
+        detail: str = self.extractor_options.get("detail", "full")
+        measure: ContextManager[None] = (
+            self.profiler.measure(stage="corpus_tf_idf", items=lambda: corpus.document_count)
+            if self.profiler is not None
+            else nullcontext()
+        )
+        with measure:
+            for index, keywords in enumerate(corpus.top_keywords(max_keywords=max_keywords)):
+                self._set_corpus_tf_idf(
+                    file_result=result[corpus.keys[index]],
+                    corpus=corpus,
+                    index=index,
+                    keywords=keywords,
+                    detail=detail,
+                )
 
-        paths: list[str] = [os.path.join(directory, path) for path in os.listdir(directory)]
-        result_paths: list[str] = []
+    def _set_corpus_tf_idf(
+        self, file_result: dict, corpus: CorpusTfIdf, index: int, keywords: list[str], detail: str
+    ) -> None:
+        # `full` results keep the keywords and scores of every method by method name
+        if self.method == "full":
+            file_result["keywords"]["tfidf"] = keywords
+        else:
+            file_result["extraction_method"] = "tfidf"
+            file_result["keywords"] = keywords
+
+        if detail == "full":
+            file_result["file"]["tf_idf"] = corpus.document_metrics(index=index)
+        elif detail == "scores":
+            tf_idf: dict = corpus.document_metrics(index=index)["term_frequency_inverse_document_frequencies"]
+            scores: dict = {keyword: tf_idf[keyword] for keyword in keywords}
+            if self.method == "full":
+                file_result["scores"]["tfidf"] = scores
+            else:
+                file_result["scores"] = scores
+
+    def _iter_results(
+        self, method: str, detail: Optional[str] = None, paths: Optional[Iterable[str]] = None
+    ) -> Iterator[tuple[str, dict]]:
+        path_iterator: Iterator[str] = iter(paths) if paths is not None else self._iter_paths()
+        if self.deduplicate is None:
+            yield from self._iter_extracted(method=method, detail=detail, paths=path_iterator)
+        else:
+            yield from self._iter_deduplicated(method=method, detail=detail, paths=list(path_iterator))
+
+    def _iter_deduplicated(
+        self, method: str, detail: Optional[str], paths: list[str]
+    ) -> Iterator[tuple[str, dict]]:
+        """Results of `paths`, extracted once per group of near duplicates.
+
+        A pre-pass reads every file and looks up its MinHash signature in an LSH index of the files that
+        are extracted. A file with the same content as an earlier file, or an estimated similarity of at
+        least `deduplicate` to an extracted file, is not extracted: it gets a copy of the result of that
+        file with `duplicate_of` and `similarity`. Near duplicates get the keywords and scores of the most
+        similar extracted file with their own text, copies of a file share its result. `deduplication`
+        reports the pre-pass.
+        """
+        start: float = time.perf_counter()
+        duplicates: dict[str, tuple[str, float, bool]] = self._find_duplicates(paths=paths)
+        prepass_seconds: float = time.perf_counter() - start
+
+        extraction_seconds: float = yield from self._merge_duplicates(
+            results=self._iter_extracted(
+                method=method, detail=detail, paths=(path for path in paths if path not in duplicates)
+            ),
+            paths=paths,
+            duplicates=duplicates,
+        )
+
+        extracted: int = len(paths) - len(duplicates)
+        self.deduplication = {
+            "threshold": self.deduplicate,
+            "documents": len(paths),
+            "extracted": extracted,
+            "duplicates": len(duplicates),
+            "exact_duplicates": sum(exact for _, _, exact in duplicates.values()),
+            "groups": len({representative for representative, _, _ in duplicates.values()}),
+            "prepass_seconds": prepass_seconds,
+            "extraction_seconds": extraction_seconds,
+            # Every duplicate would have taken the mean extraction time of a file
+            "estimated_seconds_saved": len(duplicates) * extraction_seconds / max(extracted, 1),
+        }
+
+    def _merge_duplicates(
+        self,
+        results: Iterator[tuple[str, dict]],
+        paths: list[str],
+        duplicates: dict[str, tuple[str, float, bool]],
+    ) -> Generator[tuple[str, dict], None, float]:
+        # Yields the extracted `results` and copies for the duplicates, returns the seconds of extraction
+        # Extracted path => duplicates without a copy yet
+        pending: Counter = Counter(representative for representative, _, _ in duplicates.values())
+        kept: dict[str, dict] = {}  # Results of extracted files with pending duplicates
+
+        # Duplicates follow their extracted file, in order of the scan if results are ordered
+        waiting: deque[str] = deque(path for path in paths if path in duplicates)
+        position: dict[str, int] = {path: index for index, path in enumerate(paths)}
+        groups: dict[str, list[str]] = {}
+        while not self.ordered and waiting:
+            path: str = waiting.popleft()
+            groups.setdefault(duplicates[path][0], []).append(path)
+
+        def copy_result(path: str) -> tuple[str, dict]:
+            representative, similarity, exact = duplicates[path]
+            result: dict = copy.deepcopy(kept[representative])
+            pending[representative] -= 1
+            if not pending[representative]:
+                del kept[representative]
+            return path, _duplicate_result(
+                result=result, path=path, representative=representative, similarity=similarity, exact=exact
+            )
+
+        extraction_seconds: float = 0.0
+        while True:
+            start: float = time.perf_counter()
+            path_result: Optional[tuple[str, dict]] = next(results, None)
+            extraction_seconds += time.perf_counter() - start
+            if path_result is None:
+                break
+
+            path, result = path_result
+            while waiting and position[waiting[0]] < position[path]:
+                yield copy_result(path=waiting.popleft())
+            if pending[path]:
+                kept[path] = copy.deepcopy(result)
+            yield path, result
+            for duplicate in groups.pop(path, []):
+                yield copy_result(path=duplicate)
+        while waiting:
+            yield copy_result(path=waiting.popleft())
+        return extraction_seconds
+
+    def _find_duplicates(self, paths: list[str]) -> dict[str, tuple[str, float, bool]]:
+        # Duplicate path => (extracted path, similarity, exact copy of the extracted file)
+        minhash: MinHash = MinHash()
+        index: MinHashLSH = MinHashLSH(threshold=self.deduplicate or 1.0, permutations=minhash.permutations)
+        first_paths: dict[str, str] = {}  # Content hash => first path with this content
+        duplicates: dict[str, tuple[str, float, bool]] = {}
+        chunk_size: int = self.extractor_options.get("chunk_size") or DEFAULT_CHUNK_SIZE
 
         for path in paths:
-            if os.path.isfile(path):
-                result_paths.append(path)
-            elif os.path.isdir(path):
-                for item in self._scan_directory(path):
-                    result_paths.append(item)
+            content_hash: str = _file_hash(path=path)
+            if content_hash in first_paths:
+                # A copy of a near duplicate gets the result of the near duplicate, found by its content
+                first_path: str = first_paths[content_hash]
+                duplicates[path] = duplicates.get(first_path, (first_path, 1.0, True))
+                continue
+            first_paths[content_hash] = path
+
+            signature: Optional[np.ndarray] = None
+            for chunk in iter_text_chunks(path=path, chunk_size=chunk_size):
+                chunk_signature: Optional[np.ndarray] = minhash.signature(txt=chunk)
+                if chunk_signature is not None:
+                    signature = (
+                        chunk_signature if signature is None else np.minimum(signature, chunk_signature)
+                    )
+            if signature is None:
+                continue  # Files without words are extracted on their own
+
+            similar: list[tuple[Hashable, float]] = index.query(signature=signature)
+            if similar:
+                duplicates[path] = (str(similar[0][0]), similar[0][1], False)
+            else:
+                index.insert(key=path, signature=signature)
+        return duplicates
+
+    def _iter_extracted(
+        self, method: str, detail: Optional[str], paths: Iterator[str]
+    ) -> Iterator[tuple[str, dict]]:
+        extractor_options: dict = self.extractor_options
+        if detail is not None:
+            extractor_options = {**extractor_options, "detail": detail}
+        path_iterator: Iterator[str] = paths
+
+        if self.workers <= 1:
+            # One pipeline for the whole directory, models are loaded once and reused for every file
+            keyword_extractor: KeywordExtractor = KeywordExtractor(txt="", method=method, **extractor_options)
+            for path in path_iterator:
+                yield path, self._add_profile(
+                    result=_extract_path(path=path, keyword_extractor=keyword_extractor)
+                )
+            return
+
+        from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(method, extractor_options),
+        ) as executor:
+            # Only a few files per worker are in flight, finished results don't pile up in memory
+            futures: dict[Future, str] = {
+                executor.submit(_extract_in_worker, path): path
+                for path in islice(path_iterator, self.workers * 4)
+            }
+            while futures:
+                # Dicts keep the submission order, so the first future belongs to the next path in order
+                done: Iterable[Future] = (
+                    [next(iter(futures))] if self.ordered else wait(futures, return_when=FIRST_COMPLETED).done
+                )
+                for future in done:
+                    path = futures.pop(future)
+                    for next_path in islice(path_iterator, 1):
+                        futures[executor.submit(_extract_in_worker, next_path)] = next_path
+                    yield path, self._add_profile(result=future.result())
+
+    def _add_profile(self, result: dict) -> dict:
+        # Stages of worker processes reach the directory with their results
+        if self.profiler is not None and "profile" in result:
+            self.profiler.merge(stats=result["profile"])
+        return result
+
+
+def merge_shards(shards: Iterable[dict]) -> dict[str, dict]:
+    """Combines the partial statistics of all shards of a directory (`extract_shard`) into its results.
 
-        return result_paths
+    The term counts of the shards are added to one corpus in the order of a single run, so vocabulary,
+    document frequencies and scores equal those of `KeywordExtractorDirectory.extract` on one node. Shards
+    of different runs or settings, and missing or repeated shards, raise a ValueError.
+    """
+    shards = list(shards)
+    if not shards:
+        raise ValueError("No shards to merge.")
+    first: dict = shards[0]
+    header: tuple = (first["pipeline_version"], first["method"], first["options"], first["shard_count"])
+    for shard in shards:
+        if (shard["pipeline_version"], shard["method"], shard["options"], shard["shard_count"]) != header:
+            raise ValueError(f"Shard {shard['shard']} is from a different run or has different settings.")
+    if sorted(shard["shard"] for shard in shards) != list(range(first["shard_count"])):
+        raise ValueError(f"Expected each of the {first['shard_count']} shards exactly once.")
 
-    def extract(self):
-        result: dict[str, dict] = {}
-        for path in self._paths:
-            with open(path, "r") as file:
-                text: str = file.read()
-                result[path] = KeywordExtractor(txt=text, method=self.method).extract()
+    # (position in the scan, path, result, corpus of the shard, index in that corpus) of every file
+    documents: list[tuple[int, str, dict, CorpusTfIdf, int]] = []
+    for shard in shards:
+        shard_corpus: CorpusTfIdf = (
+            CorpusTfIdf.from_dict(data=shard["corpus"]) if shard["corpus"] is not None else CorpusTfIdf()
+        )
+        for index, document in enumerate(shard["documents"]):
+            documents.append(
+                (document["position"], document["path"], document["result"], shard_corpus, index)
+            )
+    documents.sort(key=lambda document: document[0])
+
+    result: dict[str, dict] = {path: file_result for _, path, file_result, _, _ in documents}
+    if first["method"] in ("tfidf", "full"):
+        corpus: CorpusTfIdf = CorpusTfIdf()
+        for _, path, _, shard_corpus, index in documents:
+            corpus.add_document(
+                key=path, word_counts=shard_corpus.word_counts(index=index), length=shard_corpus.length(index)
+            )
+        options: dict = {name: value for name, value in first["options"].items() if value is not None}
+        KeywordExtractorDirectory(directory="", method=first["method"], **options)._score_corpus(
+            corpus=corpus, result=result
+        )
+    return result
+
+
+class KeywordExtractorStream:
+    """Word frequency keywords of an unbounded stream of lines, in bounded memory.
+
+    Lines are extracted in batches and their word counts are added to a `SpaceSaving` sketch of
+    `sketch_size` words, so counts are approximate. Every `interval` seconds, also while no line arrives,
+    and once at the end of the stream, `iter_extract` yields the current top keywords if lines arrived since
+    the last result. The lines are read on a thread. The vocabulary of the pipeline is dropped when it grows
+    beyond `max_vocabulary_size` words. With the `profile` option, `profiler` holds the stages of every batch.
+    """
+
+    def __init__(
+        self,
+        lines: Iterable[str],
+        max_keywords: int = 10,
+        interval: float = 10.0,
+        batch_size: int = 1000,
+        sketch_size: int = 10_000,
+        max_vocabulary_size: int = 1_000_000,
+        clock: Callable[[], float] = time.monotonic,
+        **extractor_options: Any,
+    ) -> None:
+        self.lines: Iterable[str] = lines
+        self.max_keywords: int = max_keywords
+        self.interval: float = interval  # Seconds between two results
+        self.batch_size: int = batch_size  # Lines per pipeline run
+        self.max_vocabulary_size: int = max_vocabulary_size
+        self.clock: Callable[[], float] = clock
+        self.detail: str = extractor_options.get("detail", "full")
+        self.sketch: SpaceSaving = SpaceSaving(capacity=sketch_size)
+        self.line_count: int = 0
+        self._keyword_extractor: KeywordExtractor = KeywordExtractor(
+            txt="", method="wf", max_keywords=max_keywords, **extractor_options
+        )
+        self.profiler: Optional[StageProfiler] = self._keyword_extractor.profiler
+
+    def iter_extract(self) -> Iterator[dict]:
+        batch: list[str] = []
+        result_lines: Optional[int] = None  # Lines of the last result
 
+        for line in self._iter_lines_and_ticks():
+            if line is not None:
+                batch.append(line)
+            if len(batch) >= self.batch_size or (line is None and batch):
+                self._add_batch(batch=batch)
+                batch = []
+            # A tick only yields a result if lines arrived since the last one
+            if line is None and self.line_count != result_lines:
+                result_lines = self.line_count
+                yield self.result()
+
+        self._add_batch(batch=batch)
+        if self.line_count != result_lines:
+            yield self.result()
+
+    def _iter_lines_and_ticks(self) -> Iterator[Optional[str]]:
+        # Lines of the stream and None every `interval` seconds, also while no line arrives. The lines are
+        # read by a thread, a blocking read of the stream would hold back the ticks.
+        lines: queue.Queue = queue.Queue(maxsize=self.batch_size)
+        threading.Thread(target=self._read_lines, args=(lines,), daemon=True).start()
+        next_result: float = self.clock() + self.interval
+
+        while True:
+            try:
+                item: Any = lines.get(timeout=max(next_result - self.clock(), 0.0))
+            except queue.Empty:
+                item = None
+            if item is _END_OF_LINES:
+                return
+            if isinstance(item, Exception):
+                raise item  # Of the stream, raised where the results are consumed
+            if item is not None:
+                yield item
+            if self.clock() >= next_result:
+                yield None
+                next_result = self.clock() + self.interval
+
+    def _read_lines(self, lines: queue.Queue) -> None:
+        end: object = _END_OF_LINES
+        try:
+            for line in self.lines:
+                lines.put(line)
+        except Exception as error:
+            end = error
+        lines.put(end)
+
+    def result(self) -> dict:
+        top: list = self.sketch.top(k=self.max_keywords)
+        result: dict = {
+            "extraction_method": "stream",
+            "lines": self.line_count,
+            "keywords": [word for word, _, _ in top],
+        }
+        if self.detail != "keywords":
+            # Estimated term frequencies among the stop word free words, over-estimated by at most `errors`
+            total: int = max(self.sketch.total, 1)
+            result["scores"] = {word: count / total for word, count, _ in top}
+            result["errors"] = {word: error / total for word, _, error in top}
         return result
+
+    def _add_batch(self, batch: list[str]) -> None:
+        self.line_count += len(batch)
+        txt: str = "\n".join(batch)
+        if not txt.strip():
+            return
+
+        for word, count in self._keyword_extractor.count_words(txt=txt).items():
+            self.sketch.add(item=word, count=count)
+        if len(self._keyword_extractor._vocabulary) > self.max_vocabulary_size:
+            self._keyword_extractor.reset()
+
+
+# Pipeline of the current worker process or thread, created once by `_init_worker`
+_worker: threading.local = threading.local()
+
+
+def _init_worker(method: str, extractor_options: dict) -> None:
+    if extractor_options.get("result_cache") is not None:
+        # Own connection and counters per worker, thread workers would share them otherwise
+        extractor_options = {
+            **extractor_options,
+            "result_cache": copy.copy(extractor_options["result_cache"]),
+        }
+    _worker.extractor = KeywordExtractor(txt="", method=method, **extractor_options)
+
+
+def _worker_extractor() -> KeywordExtractor:
+    extractor: Optional[KeywordExtractor] = getattr(_worker, "extractor", None)
+    if extractor is None:
+        raise RuntimeError("Worker pipeline is not initialized.")
+    return extractor
+
+
+def _extract_in_worker(path: str) -> dict:
+    return _extract_path(path=path, keyword_extractor=_worker_extractor())
+
+
+def _extract_text_in_worker(txt: str, method: Optional[str]) -> dict:
+    return _worker_extractor()._extract_text(txt=txt, method=method)
+
+
+async def _aiter(items: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+def _check_method(method: str) -> None:
+    if method not in METHODS:
+        raise ValueError(f"Unknown extraction method '{method}', expected one of {', '.join(METHODS)}.")
+
+
+def _file_hash(path: str) -> str:
+    content_hash = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            content_hash.update(block)
+    return content_hash.hexdigest()
+
+
+def _shard_of(path: str, count: int) -> int:
+    # A stable hash, `hash()` of strings differs between processes
+    path_hash: bytes = hashlib.sha256(path.replace(os.sep, "/").encode("utf-8")).digest()
+    return int.from_bytes(path_hash[:8], "big") % count
+
+
+def _duplicate_result(result: dict, path: str, representative: str, similarity: float, exact: bool) -> dict:
+    # A near duplicate shares the keywords and scores of the extracted file, not its text: `text` is the
+    # content of `path`, the word lists of the other text are dropped and its ranking metrics are marked
+    result.pop("profile", None)  # Nothing ran for this file
+    if not exact:
+        _replace_text(result=result, path=path, representative=representative)
+    return {**result, "duplicate_of": representative, "similarity": similarity}
+
+
+def _replace_text(result: dict, path: str, representative: str) -> None:
+    if result.get("text") is not None:
+        with open(path, "r", encoding=TEXT_ENCODING) as file:
+            result["text"] = file.read()
+    file_result: Any = result.get("file")
+    if isinstance(file_result, dict) and "text" in file_result:
+        text: Optional[str] = result.get("text")
+        file_result["text"] = text.lower() if text is not None else None  # Like the text of every `File`
+        for metric_type in File.WORD_METRICS:
+            file_result[metric_type] = None
+        # word_frequency, tf_idf and page_rank are those of the extracted file
+        file_result["inherited_from"] = representative
+
+
+def _extract_path(path: str, keyword_extractor: KeywordExtractor) -> dict:
+    if keyword_extractor.chunk_size:
+        return keyword_extractor.extract_file(path=path)
+    with open(path, "r", encoding=TEXT_ENCODING) as file:
+        keyword_extractor.update_txt(new_txt=file.read())
+    return keyword_extractor.extract()
@@ -0,0 +1,288 @@
+import copy
+import json
+import queue
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+from keyword_extractor import METHODS, OUTPUT_DETAILS, KeywordExtractor
+from utils import ResultCache
+
+# Short text every pipeline extracts once on start, loads the NLTK corpora and models before the first request
+_WARM_UP_TEXT: str = "Servers keep their models loaded. Requests are answered without loading them again."
+
+
+class ExtractionServer(ThreadingHTTPServer):
+    """Local HTTP/JSON extraction server with warm pipelines.
+
+    `concurrency` pipelines are created and warmed up once, every request borrows one of them, so the
+    imports and the NLTK models are loaded once per server instead of once per text. Requests waiting
+    longer than `queue_timeout` seconds for a pipeline are answered with 503.
+
+    Endpoints:
+        POST /extract  {"text": ...} or {"texts": [...]} (batch, at most `max_batch_size` texts), optional
+                       "method", "detail", "max_keywords" and "time_budget_ms" => result or {"results": [...]}
+        GET  /health   {"status": "ok"}
+        GET  /metrics  request, text, error and latency counters
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int] = ("127.0.0.1", 8000),
+        method: str = "wf",
+        concurrency: int = 1,
+        queue_timeout: float = 30.0,
+        max_batch_size: int = 100,
+        max_request_bytes: int = 64 * 1024 * 1024,
+        max_vocabulary_size: int = 1_000_000,
+        **extractor_options: Any,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1.")
+
+        self.method: str = method  # Default of requests without a method
+        self.queue_timeout: float = queue_timeout
+        self.max_batch_size: int = max_batch_size
+        self.max_request_bytes: int = max_request_bytes
+        self.max_vocabulary_size: int = max_vocabulary_size  # Pipelines are reset beyond this many words
+        self._pipelines: queue.LifoQueue[KeywordExtractor] = queue.LifoQueue()
+        for _ in range(concurrency):
+            self._pipelines.put(_warm_pipeline(method=method, extractor_options=extractor_options))
+        self.concurrency: int = concurrency
+        self._lock: threading.Lock = threading.Lock()
+        self._started: float = time.monotonic()
+        self._latencies: deque[float] = deque(maxlen=1000)  # Seconds of the latest extract requests
+        self._counters: dict[str, int] = {
+            "requests": 0,
+            "texts": 0,
+            "errors": 0,
+            "rejected": 0,
+            "in_flight": 0,
+        }
+        super().__init__(address, _RequestHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host.decode() if isinstance(host, bytes) else host}:{port}"
+
+    def extract(self, request: dict) -> dict:
+        """Result of one /extract request body, raises ValueError for an invalid one."""
+        texts: list[str] = _request_texts(request=request, max_batch_size=self.max_batch_size)
+        options: dict[str, Any] = _request_options(request=request, default_method=self.method)
+
+        try:
+            pipeline: KeywordExtractor = self._pipelines.get(timeout=self.queue_timeout)
+        except queue.Empty:
+            self.count(rejected=1)
+            raise TimeoutError(f"No pipeline became free within {self.queue_timeout} seconds.")
+
+        self.count(in_flight=1)
+        try:
+            results: list[dict] = [
+                _extract_text(pipeline=pipeline, txt=txt, options=options) for txt in texts
+            ]
+            if len(pipeline._vocabulary) > self.max_vocabulary_size:
+                pipeline.reset()
+        finally:
+            self.count(in_flight=-1, texts=len(texts))
+            self._pipelines.put(pipeline)
+
+        return {"results": results} if "texts" in request else results[0]
+
+    def count(self, **increments: int) -> None:
+        with self._lock:
+            for name, increment in increments.items():
+                self._counters[name] += increment
+
+    def record_latency(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            latencies: list[float] = sorted(self._latencies)
+            counters: dict[str, int] = dict(self._counters)
+        return {
+            **counters,
+            "concurrency": self.concurrency,
+            "uptime_seconds": time.monotonic() - self._started,
+            "latency_ms": {
+                "p50": _percentile(latencies=latencies, fraction=0.5) * 1000,
+                "p99": _percentile(latencies=latencies, fraction=0.99) * 1000,
+            },
+        }
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server: ExtractionServer
+    protocol_version = "HTTP/1.1"  # Keep-alive, a client reuses its connection
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send(status=200, body={"status": "ok"})
+        elif self.path == "/metrics":
+            self._send(status=200, body=self.server.metrics())
+        else:
+            self._send(status=404, body={"error": f"Unknown path '{self.path}'."})
+
+    def do_POST(self) -> None:
+        start: float = time.perf_counter()
+        self.server.count(requests=1)
+        if self.path != "/extract":
+            self._send(status=404, body={"error": f"Unknown path '{self.path}'."})
+            return
+
+        length: int = int(self.headers.get("Content-Length", 0))
+        if length > self.server.max_request_bytes:
+            self.server.count(errors=1)
+            self.close_connection = True  # The body is not read
+            self._send(
+                status=413, body={"error": f"Requests are limited to {self.server.max_request_bytes} bytes."}
+            )
+            return
+
+        # The latency and counters are updated before the response is written, a client that has its
+        # response finds its request in /metrics
+        status: int = 200
+        try:
+            request: Any = json.loads(self.rfile.read(length) or b"null")
+            if not isinstance(request, dict):
+                raise ValueError("Expected a JSON object.")
+            body: dict = self.server.extract(request=request)
+        except TimeoutError as error:
+            status, body = 503, {"error": str(error)}
+        except ValueError as error:  # Includes invalid JSON
+            self.server.count(errors=1)
+            status, body = 400, {"error": str(error)}
+        except Exception as error:
+            self.server.count(errors=1)
+            status, body = 500, {"error": f"{type(error).__name__}: {error}"}
+        else:
+            self.server.record_latency(seconds=time.perf_counter() - start)
+        self._send(status=status, body=body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # No line per request on stderr, see /metrics
+        pass
+
+    def _send(self, status: int, body: dict) -> None:
+        data: bytes = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class KeywordExtractorClient:
+    """Python client of an `ExtractionServer`, standard library only."""
+
+    def __init__(self, url: str = "http://127.0.0.1:8000", timeout: float = 60.0) -> None:
+        self.url: str = url.rstrip("/")
+        self.timeout: float = timeout
+
+    def extract(self, text: str, **options: Any) -> dict:
+        """Result of `text`, `options` are method, detail, max_keywords and time_budget_ms."""
+        return self._request(path="/extract", body={"text": text, **options})
+
+    def extract_many(self, texts: list[str], **options: Any) -> list[dict]:
+        """Results of `texts` in order, extracted in one request."""
+        return self._request(path="/extract", body={"texts": texts, **options})["results"]
+
+    def health(self) -> dict:
+        return self._request(path="/health")
+
+    def metrics(self) -> dict:
+        return self._request(path="/metrics")
+
+    def _request(self, path: str, body: Optional[dict] = None) -> dict:
+        data: Optional[bytes] = json.dumps(body).encode("utf-8") if body is not None else None
+        request = urllib.request.Request(
+            self.url + path, data=data, headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as error:
+            message: str = json.loads(error.read() or b"{}").get("error", error.reason)
+            raise RuntimeError(f"Extraction server answered {error.code}: {message}") from error
+
+
+def serve(host: str = "127.0.0.1", port: int = 8000, **server_options: Any) -> None:
+    """Runs an `ExtractionServer` until it is interrupted."""
+    with ExtractionServer(address=(host, port), **server_options) as server:
+        print(f"Serving keyword extraction on {server.url}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def _warm_pipeline(method: str, extractor_options: dict) -> KeywordExtractor:
+    options: dict = dict(extractor_options)
+    result_cache: Optional[ResultCache] = options.pop("result_cache", None)
+    pipeline: KeywordExtractor = KeywordExtractor(txt=_WARM_UP_TEXT, method="full", **options)
+    pipeline.extract()
+    pipeline.reset()
+    pipeline.method = method
+    if result_cache is not None:
+        # Own connection per pipeline, like the directory workers
+        pipeline.result_cache = copy.copy(result_cache)
+    return pipeline
+
+
+def _request_texts(request: dict, max_batch_size: int) -> list[str]:
+    texts: Any = request["texts"] if "texts" in request else [request.get("text")]
+    if not isinstance(texts, list) or not all(isinstance(txt, str) for txt in texts):
+        raise ValueError("Expected 'text' to be a string or 'texts' to be a list of strings.")
+    if len(texts) > max_batch_size:
+        raise ValueError(f"Batches are limited to {max_batch_size} texts.")
+    return texts
+
+
+def _request_options(request: dict, default_method: str) -> dict[str, Any]:
+    options: dict[str, Any] = {}
+    method: Any = request.get("method", default_method)
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}', expected one of {', '.join(METHODS)}.")
+    options["method"] = method
+    if "detail" in request:
+        if request["detail"] not in OUTPUT_DETAILS:
+            raise ValueError(f"Unknown output detail '{request['detail']}'.")
+        options["detail"] = request["detail"]
+    if "max_keywords" in request:
+        if not isinstance(request["max_keywords"], int) or request["max_keywords"] < 1:
+            raise ValueError("Expected 'max_keywords' to be a positive integer.")
+        options["max_keywords"] = request["max_keywords"]
+    if "time_budget_ms" in request:
+        budget: Any = request["time_budget_ms"]
+        if isinstance(budget, bool) or not isinstance(budget, (int, float)) or budget <= 0:
+            raise ValueError("Expected 'time_budget_ms' to be a positive number.")
+        options["time_budget_ms"] = budget
+    return options
+
+
+def _extract_text(pipeline: KeywordExtractor, txt: str, options: dict[str, Any]) -> dict:
+    # Request options apply to this text only, the pipeline keeps its configured defaults
+    defaults: dict[str, Any] = {name: getattr(pipeline, name) for name in options}
+    try:
+        for name, value in options.items():
+            setattr(pipeline, name, value)
+        pipeline.update_txt(new_txt=txt)
+        return pipeline.extract()
+    finally:
+        for name, value in defaults.items():
+            setattr(pipeline, name, value)
+
+
+def _percentile(latencies: list[float], fraction: float) -> float:
+    if not latencies:
+        return 0.0
+    return latencies[min(int(fraction * len(latencies)), len(latencies) - 1)]
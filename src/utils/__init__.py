@@ -1,47 +1,211 @@
+import mmap
+import os
 import re
-import nltk
-from nltk.stem import WordNetLemmatizer
-from nltk.corpus import stopwords
-from typing import Union, Optional, Any
+import numpy as np
+from array import array
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Union, Optional, Any
+from utils.cache import LRUCache
+from utils.delta_counts import DeltaCounts
+from utils.minhash import MinHash, MinHashLSH
+from utils.profiler import StageProfiler
+from utils.page_rank import adjacency_from_edge_keys, cap_graph, cooccurrence_matrix, edge_keys, page_rank
+from utils.result_cache import ResultCache
+from utils.space_saving import SpaceSaving
+from utils.tf_idf import CorpusTfIdf, top_k
+from utils.time_budget import TimeBudget
+from utils.vocabulary import Vocabulary
+
+if TYPE_CHECKING:
+    # nltk takes longer to import than the rest of the package, it is imported on first use
+    from nltk.stem import PorterStemmer, WordNetLemmatizer
+    from nltk.tag.perceptron import PerceptronTagger
+
+__all__ = [
+    "CorpusTfIdf",
+    "DeltaCounts",
+    "File",
+    "LRUCache",
+    "Lemmatizer",
+    "MetricStage",
+    "MinHash",
+    "MinHashLSH",
+    "PENN_TO_WORDNET",
+    "POSTagger",
+    "ResultCache",
+    "SpaceSaving",
+    "StageProfiler",
+    "TEXT_ENCODING",
+    "TimeBudget",
+    "TokenizedText",
+    "Tokenizer",
+    "Vocabulary",
+    "adjacency_from_edge_keys",
+    "cap_graph",
+    "concatenate_offsets",
+    "cooccurrence_matrix",
+    "edge_keys",
+    "first_occurrences",
+    "flatten_nested_lists",
+    "get_lemmatizer",
+    "get_stemmer",
+    "get_stop_words",
+    "get_tagger",
+    "iter_text_chunks",
+    "page_rank",
+    "remove_duplicates",
+    "remove_stop_word_ids",
+    "remove_stop_words",
+    "sample_paragraphs",
+    "sample_sentences",
+    "split_by_offsets",
+    "top_k",
+]
 
 
 def flatten_nested_lists(collection: Union[list[str], list[list[str]]]) -> list[str]:
     flatted_list: list = []  # Set empty flatted list
-
-    for value in collection:
-        if isinstance(value, list) and not isinstance(value, str):  # `value` is a list and not a string
-            for x in flatten_nested_lists(value):
-                flatted_list.append(x)
-        else:  # Otherwise `value` must be a string
-            flatted_list.append(value)
+    stack: list[Iterator] = [iter(collection)]  # Iterators of the lists which are not finished yet
+
+    while stack:
+        for value in stack[-1]:
+            if isinstance(value, list):  # `value` is a list, continue with its items first
+                stack.append(iter(value))
+                break
+            flatted_list.append(value)  # Otherwise `value` must be a string
+        else:
+            stack.pop()
 
     # Return the flatted list
     return flatted_list
 
 
 def remove_duplicates(collection: list[str]) -> list[str]:
-    duplicate_free_result: list[str] = []
-
-    for word in collection:
-        if word not in duplicate_free_result:
-            duplicate_free_result.append(word)
+    # Dictionaries keep the insertion order, so the first occurrence of every word is kept
+    return list(dict.fromkeys(collection))
 
-    return duplicate_free_result
 
+@lru_cache(maxsize=None)
+def get_stop_words(lang: str = "english") -> frozenset[str]:
+    """Stop words of `lang`, loaded once per process."""
+    from nltk.corpus import stopwords
 
-def remove_stop_words(collection: list[list[str]], lang: str = "english") -> list[list[str]]:
-    stop_words: list = list(stopwords.words(lang))
-    filtered_words_per_sentence: list[list[str]] = []
-
-    for sentence in collection:
-        filtered_words: list[str] = []
+    return frozenset(stopwords.words(lang))
 
-        for word in sentence:
-            if word.lower() not in stop_words:  # and word.lower() not in self.signs_to_remove:
-                filtered_words.append(word)
-        filtered_words_per_sentence.append(filtered_words)
 
-    return filtered_words_per_sentence
+def remove_stop_words(collection: list[list[str]], lang: str = "english") -> list[list[str]]:
+    stop_words: frozenset[str] = get_stop_words(lang=lang)
+    return [[word for word in sentence if word.lower() not in stop_words] for sentence in collection]
+
+
+def remove_stop_word_ids(
+    ids: array, offsets: array, vocabulary: Vocabulary, lang: str = "english"
+) -> tuple[array, array]:
+    stop_words: frozenset[str] = get_stop_words(lang=lang)
+    # Every distinct word is looked up once, not every occurrence
+    stop_word_ids: set[int] = {
+        word_id for word_id in set(ids) if vocabulary.word(word_id).lower() in stop_words
+    }
+    filtered_ids: array = array("I")
+    filtered_offsets: array = array("I", [0])
+
+    for start, end in zip(offsets[:-1], offsets[1:]):
+        filtered_ids.extend(word_id for word_id in ids[start:end] if word_id not in stop_word_ids)
+        filtered_offsets.append(len(filtered_ids))
+
+    return filtered_ids, filtered_offsets
+
+
+# Encoding of every text file read, whole or in chunks
+TEXT_ENCODING: str = "utf-8"
+# Line breaks of universal newlines, `\r\n` is one break
+_LINE_BREAK: re.Pattern = re.compile(rb"\r\n|\r|\n")
+
+
+def iter_text_chunks(path: str, chunk_size: int, encoding: str = TEXT_ENCODING) -> Iterator[str]:
+    """Decoded chunks of a memory-mapped file, each about `chunk_size` bytes and ending after a line break.
+
+    Paragraphs are lines, so no paragraph or sentence is split between two chunks. Line breaks are
+    translated to `\n` like `open` does with universal newlines, so the chunks joined equal the text read
+    with `open(path, "r", encoding=encoding)`. Only one chunk is decoded at a time, the file itself is
+    paged in and out by the operating system.
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return  # Empty files can't be mapped
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start: int = 0
+            while start < len(data):
+                line_break: Optional[re.Match] = _LINE_BREAK.search(data, start + max(chunk_size, 1) - 1)
+                end: int = len(data) if line_break is None else line_break.end()
+                yield data[start:end].decode(encoding).replace("\r\n", "\n").replace("\r", "\n")
+                start = end
+
+
+def split_by_offsets(values: list, offsets: array) -> list[list]:
+    return [values[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def concatenate_offsets(offsets: Iterable[array]) -> array:
+    """Offsets of consecutive parts as offsets of the whole, each part is shifted by the parts before it."""
+    result: array = array("I", [0])
+    start: int = 0
+    for part_offsets in offsets:
+        result.extend(offset + start for offset in part_offsets[1:])
+        start += part_offsets[-1]
+    return result
+
+
+def sample_sentences(
+    token_ids: array, sentence_offsets: array, paragraph_offsets: array, count: int
+) -> tuple[array, array, array]:
+    """`count` evenly spaced sentences of tokenized text, in order. Paragraphs without one are dropped."""
+    sentence_count: int = len(sentence_offsets) - 1
+    kept: np.ndarray = np.unique(
+        np.linspace(0, sentence_count - 1, num=max(min(count, sentence_count), 1)).round().astype(np.int64)
+    )
+    offsets: np.ndarray = np.asarray(sentence_offsets, dtype=np.int64)
+    starts: np.ndarray = offsets[kept]
+    ends: np.ndarray = offsets[kept + 1]
+
+    ids: np.ndarray = np.frombuffer(token_ids, dtype=np.uint32)
+    sampled_ids: array = array("I")
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        sampled_ids.frombytes(ids[start:end].tobytes())
+    sampled_offsets: array = array("I", [0])
+    sampled_offsets.extend(np.cumsum(ends - starts).tolist())
+    # A paragraph starts at the first kept sentence at or after its first sentence
+    sampled_paragraph_offsets: array = array(
+        "I", np.unique(np.searchsorted(kept, np.asarray(paragraph_offsets, dtype=np.int64))).tolist()
+    )
+    return sampled_ids, sampled_offsets, sampled_paragraph_offsets
+
+
+def sample_paragraphs(txt: str, fraction: float) -> tuple[str, int, int]:
+    """Text of `fraction` of the paragraphs of `txt`, evenly spaced and in order, at least one.
+
+    Paragraphs are the non blank lines like in `Tokenizer.tokenize`, the text is not tokenized. Returns the
+    text with the number of paragraphs of `txt` and of kept paragraphs.
+    """
+    paragraphs: list[str] = [line for line in txt.split("\n") if line and not line.isspace()]
+    count: int = max(min(int(len(paragraphs) * fraction), len(paragraphs)), 1)
+    if count >= len(paragraphs):
+        return txt, len(paragraphs), len(paragraphs)
+    kept: list[int] = np.unique(
+        np.linspace(0, len(paragraphs) - 1, num=count).round().astype(np.int64)
+    ).tolist()
+    return "\n".join(paragraphs[index] for index in kept), len(paragraphs), len(kept)
+
+
+def first_occurrences(ids: array) -> np.ndarray:
+    """Distinct ids of `ids` in order of their first occurrence."""
+    unique_ids, first_indices = np.unique(np.frombuffer(ids, dtype=np.uint32), return_index=True)
+    return unique_ids[np.argsort(first_indices)]
+
+
+_WORD_PATTERN: re.Pattern = re.compile(
+    r"\w+"
+)  # Same words as `\b\w+\b`, a run of word characters is one word
 
 
 class Tokenizer:
@@ -96,33 +260,190 @@ class Tokenizer:
     def words_per_sentence_to_words(words_per_sentence: list[list[str]]) -> list[str]:
         return flatten_nested_lists(collection=words_per_sentence)
 
+    def text_to_ids(self, txt: Optional[str], vocabulary: Vocabulary) -> tuple[array, array, array]:
+        """Word ids of `txt` with the offsets of every sentence (in words) and paragraph (in sentences)."""
+        tokenized_text: TokenizedText = self.tokenize(txt=txt, vocabulary=vocabulary)
+        return tokenized_text.token_ids, tokenized_text.sentence_offsets, tokenized_text.paragraph_offsets
+
+    @staticmethod
+    def tokenize(txt: Optional[str], vocabulary: Optional[Vocabulary] = None) -> "TokenizedText":
+        """Paragraphs, sentences and words of `txt` in one pass, equal to the static methods above.
+
+        A paragraph is a non blank line. Sentences end at `.`, and inside of such a sentence at every `!`,
+        or at every `?` if it has no `!`. Words are interned into `vocabulary` while the text is scanned,
+        no list of all paragraphs, sentences or words is built.
+        """
+        if not txt:
+            raise ValueError("Please add a text.")
+
+        vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+        intern_many: Callable[[list[str]], array] = vocabulary.intern_many
+        find_words: Callable[[str], list[str]] = _WORD_PATTERN.findall
+        tokenized_text: TokenizedText = TokenizedText(text=txt, vocabulary=vocabulary)
+        token_ids: array = tokenized_text.token_ids
+        sentence_offsets: array = tokenized_text.sentence_offsets
+        sentence_spans: array = tokenized_text.sentence_spans
+
+        line_start: int = 0
+        for line in txt.split("\n"):
+            piece_start: int = line_start
+            line_start += len(line) + 1
+            if line.isspace() or not line:
+                continue
+
+            paragraph_start: int = piece_start + len(line) - len(line.lstrip())
+            tokenized_text.paragraph_spans.extend((paragraph_start, paragraph_start + len(line.strip())))
+            for piece in line.split("."):
+                part_start: int = piece_start + len(piece) - len(piece.lstrip())
+                piece_start += len(piece) + 1
+                sentence: str = piece.strip()
+                if not sentence:
+                    continue
+
+                separator: Optional[str] = "!" if "!" in sentence else "?" if "?" in sentence else None
+                for part in sentence.split(separator) if separator else (sentence,):
+                    start: int = part_start + len(part) - len(part.lstrip())
+                    part_start += len(part) + 1
+                    if part:
+                        token_ids.extend(intern_many(find_words(part)))
+                        sentence_offsets.append(len(token_ids))
+                        sentence_spans.extend((start, start + len(part.strip())))
+            tokenized_text.paragraph_offsets.append(len(sentence_offsets) - 1)
+
+        return tokenized_text
+
+
+class TokenizedText:
+    """Result of `Tokenizer.tokenize`, word ids with sentence and paragraph boundaries.
+
+    `sentence_offsets` are offsets into `token_ids`, `paragraph_offsets` offsets into the sentences. The
+    spans are start/end pairs of characters in `text`. The lists of the per level `Tokenizer` methods are
+    derived from them on request.
+    """
+
+    __slots__ = (
+        "text",
+        "vocabulary",
+        "token_ids",
+        "sentence_offsets",
+        "paragraph_offsets",
+        "sentence_spans",
+        "paragraph_spans",
+    )
+
+    def __init__(self, text: str, vocabulary: Vocabulary) -> None:
+        self.text: str = text
+        self.vocabulary: Vocabulary = vocabulary
+        self.token_ids: array = array("I")
+        self.sentence_offsets: array = array("I", [0])
+        self.paragraph_offsets: array = array("I", [0])
+        self.sentence_spans: array = array("I")
+        self.paragraph_spans: array = array("I")
+
+    def paragraphs(self) -> list[str]:
+        return self._slice_text(spans=self.paragraph_spans)
+
+    def sentences(self) -> list[str]:
+        return self._slice_text(spans=self.sentence_spans)
+
+    def sentences_per_paragraph(self) -> list[list[str]]:
+        return split_by_offsets(values=self.sentences(), offsets=self.paragraph_offsets)
+
+    def words(self) -> list[str]:
+        return self.vocabulary.words(self.token_ids)
+
+    def words_per_sentence(self) -> list[list[str]]:
+        return split_by_offsets(values=self.words(), offsets=self.sentence_offsets)
+
+    def _slice_text(self, spans: array) -> list[str]:
+        text: str = self.text
+        return [text[start:end] for start, end in zip(spans[::2], spans[1::2])]
+
+
+# Penn Treebank tags => WordNet POS, every other tag is kept as it is
+PENN_TO_WORDNET: dict[str, str] = {
+    # Nouns
+    "N": "n",
+    "NN": "n",
+    "NNS": "n",
+    "NNP": "n",
+    "NNPS": "n",
+    # Adjectives
+    "JJ": "a",
+    "JJR": "a",
+    "JJS": "a",
+    # Adverbs
+    "RB": "r",
+    "RBR": "r",
+    "RBS": "r",
+    # Verbs
+    "VB": "v",
+    "VBD": "v",
+    "VBG": "v",
+    "VBN": "v",
+    "VBP": "v",
+    "VBZ": "v",
+}
+
+
+@lru_cache(maxsize=None)
+def get_tagger() -> "PerceptronTagger":
+    """The English perceptron tagger, loaded once per process (`nltk.pos_tag` loads it on every call)."""
+    from nltk.tag.perceptron import PerceptronTagger
+
+    return PerceptronTagger()
+
+
+@lru_cache(maxsize=None)
+def get_lemmatizer() -> "WordNetLemmatizer":
+    """The WordNet lemmatizer, WordNet itself is loaded by the first lemmatized word."""
+    from nltk.stem import WordNetLemmatizer
+
+    return WordNetLemmatizer()
+
+
+@lru_cache(maxsize=None)
+def get_stemmer() -> "PorterStemmer":
+    from nltk.stem import PorterStemmer
+
+    return PorterStemmer()
+
 
 class POSTagger:
+    @staticmethod
+    def tag_sentences(sentences: list[list[str]]) -> list[list[tuple[str, str]]]:
+        # Same result as `nltk.pos_tag` per sentence, but with one loaded tagger for the whole batch
+        tagger: "PerceptronTagger" = get_tagger()
+        return [tagger.tag(sentence) for sentence in sentences]
+
     @staticmethod
     def generate_tags(collection: list[list[str]]) -> list[list[tuple[str, str]]]:
-        result = []
-        for value in collection:
-            pos_tokens_per_sentence = nltk.pos_tag(value)
-            sub_result = []
+        return [
+            [(word, PENN_TO_WORDNET.get(tag, tag)) for word, tag in sentence]
+            for sentence in POSTagger.tag_sentences(sentences=collection)
+        ]
 
-            for token in pos_tokens_per_sentence:
-                if token[1] in ["N", "NN", "NNS", "NNP", "NNPS"]:  # Nouns
-                    sub_result.append((token[0], "n"))
-                elif token[1] in ["JJ", "JJR", "JJS"]:  # Adjectives
-                    sub_result.append((token[0], "a"))
-                elif token[1] in ["RB", "RBR", "RBS"]:  # Adverbs
-                    sub_result.append((token[0], "r"))
-                elif token[1] in ["VB", "VBD", "VBG", "VBN", "VBP", "VBZ"]:  # Verbs
-                    sub_result.append((token[0], "v"))
-                else:
-                    sub_result.append((token[0], token[1]))
-            result.append(sub_result)
-        return result
+    @staticmethod
+    def generate_tag_ids(
+        token_ids: array, sentence_offsets: array, vocabulary: Vocabulary, pos_tags: Vocabulary
+    ) -> array:
+        sentences: list[list[str]] = split_by_offsets(
+            values=vocabulary.words(token_ids), offsets=sentence_offsets
+        )
+        tag_ids: array = array("H")
+        for sentence in POSTagger.tag_sentences(sentences=sentences):
+            tag_ids.extend(pos_tags.intern(PENN_TO_WORDNET.get(tag, tag)) for _, tag in sentence)
+        return tag_ids
 
 
 class Lemmatizer:
-    def __init__(self) -> None:
-        self._lemmatizer: WordNetLemmatizer = WordNetLemmatizer()
+    def __init__(self, cache_size: Optional[int] = 100_000) -> None:
+        # (word id, tag id) => lemma id, shared by all documents of the pipeline
+        self.cache: LRUCache = LRUCache(max_size=cache_size)
+
+    @property
+    def _lemmatizer(self) -> "WordNetLemmatizer":
+        return get_lemmatizer()
 
     def lemmatize(self, collection: list[list[str]]):
         result = []
@@ -138,18 +459,131 @@ class Lemmatizer:
             result.append(sub_result)
         return result
 
+    def lemmatize_ids(
+        self, token_ids: array, tag_ids: array, vocabulary: Vocabulary, pos_tags: Vocabulary
+    ) -> array:
+        lemma_ids: array = array("I")
+        lemmatizer: "WordNetLemmatizer" = self._lemmatizer
+        for token_id, tag_id in zip(token_ids, tag_ids):
+            lemma_id: Optional[int] = self.cache.get((token_id, tag_id))
+            if lemma_id is None:
+                word: str = vocabulary.word(token_id)
+                tag: str = pos_tags.word(tag_id)
+                if tag in ["n", "a", "r", "v"]:
+                    lemma_id = vocabulary.intern(lemmatizer.lemmatize(word, tag))
+                else:
+                    lemma_id = vocabulary.intern(lemmatizer.lemmatize(word))
+                self.cache.put((token_id, tag_id), lemma_id)
+            lemma_ids.append(lemma_id)
+        return lemma_ids
+
+
+class MetricStage:
+    """How a metric type of `File` is computed and which metric types it needs first."""
+
+    __slots__ = ("dependencies", "compute")
+
+    def __init__(self, dependencies: list[str], compute: Callable[["File"], None]) -> None:
+        self.dependencies: list[str] = dependencies
+        self.compute: Callable[["File"], None] = compute
+
 
 class File:
-    def __init__(self) -> None:
+    """One document of the pipeline.
+
+    Tokens, lemmas, stop word free words and stems are stored as ids of a `Vocabulary` shared by the
+    pipeline, POS tags as ids of a small tag table. Sentences are offsets into these arrays, paragraphs
+    offsets into the sentences. The string based views of `get_metric` and `as_dict` are decoded on request.
+
+    Metric types with a `MetricStage` are computed lazily: the first `get_metric`/`get_ids` of a metric type
+    computes it and its dependencies once, `computed_stages` lists the stages that ran in order.
+    """
+
+    __slots__ = (
+        "text",
+        "vocabulary",
+        "pos_tags",
+        "token_ids",
+        "sentence_offsets",
+        "paragraph_offsets",
+        "tokenized_text",
+        "pos_ids",
+        "lemma_ids",
+        "stop_word_free_ids",
+        "stop_word_free_offsets",
+        "stemmed_ids",
+        "metrics",
+        "stages",
+        "computed_stages",
+        "profiler",
+    )
+
+    # Word based metric types => (ids, sentence offsets)
+    WORD_METRICS: dict[str, tuple[str, str]] = {
+        "tokens": ("token_ids", "sentence_offsets"),
+        "pos": ("pos_ids", "sentence_offsets"),
+        "lemma": ("lemma_ids", "sentence_offsets"),
+        "stop_word_free": ("stop_word_free_ids", "stop_word_free_offsets"),
+        "stemmed": ("stemmed_ids", "stop_word_free_offsets"),
+    }
+    METRIC_TYPES: list[str] = [
+        "tokens",
+        "pos",
+        "lemma",
+        "stop_word_free",
+        "word_frequency",
+        "tf_idf",
+        "stemmed",
+        "page_rank",
+    ]
+
+    def __init__(
+        self,
+        vocabulary: Optional[Vocabulary] = None,
+        pos_tags: Optional[Vocabulary] = None,
+        stages: Optional[dict[str, MetricStage]] = None,
+        profiler: Optional[StageProfiler] = None,
+    ) -> None:
         self.text: Optional[str] = None
-        self.tokens: Optional[dict] = None
-        self.pos: Optional[dict] = None
-        self.lemma: Optional[dict] = None
-        self.stop_word_free: Optional[dict] = None
-        self.word_frequency: Optional[dict] = None
-        self.tf_idf: Optional[dict] = None
-        self.stemmed: Optional[dict] = None
-        self.page_rank: Optional[dict] = None
+        self.vocabulary: Vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+        self.pos_tags: Vocabulary = pos_tags if pos_tags is not None else Vocabulary()
+        self.token_ids: Optional[array] = None
+        self.sentence_offsets: Optional[array] = None
+        self.paragraph_offsets: Optional[array] = None
+        self.tokenized_text: Optional[TokenizedText] = None  # Character spans of the paragraphs and sentences
+        self.pos_ids: Optional[array] = None
+        self.lemma_ids: Optional[array] = None
+        self.stop_word_free_ids: Optional[array] = None
+        self.stop_word_free_offsets: Optional[array] = None
+        self.stemmed_ids: Optional[array] = None
+        self.metrics: dict[str, dict] = {}
+        self.stages: dict[str, MetricStage] = stages if stages is not None else {}
+        self.computed_stages: list[str] = []
+        self.profiler: Optional[StageProfiler] = profiler  # Measures every stage that runs
+
+    def compute(self, metric_type: str) -> None:
+        if metric_type in self.computed_stages or metric_type not in self.stages:
+            return
+
+        stage: MetricStage = self.stages[metric_type]
+        for dependency in stage.dependencies:
+            self.compute(metric_type=dependency)
+        if self.profiler is None:
+            stage.compute(self)
+        else:
+            with self.profiler.measure(
+                stage=metric_type, items=lambda: self.item_count(metric_type=metric_type)
+            ):
+                stage.compute(self)
+        self.computed_stages.append(metric_type)
+
+    def item_count(self, metric_type: str) -> int:
+        """Words of a word based metric type, scored words of the others."""
+        if metric_type in self.WORD_METRICS:
+            ids: Optional[array] = getattr(self, self.WORD_METRICS[metric_type][0])
+            return len(ids) if ids is not None else 0
+        metrics: dict = self.metrics.get(metric_type, {})
+        return max((len(value) for value in metrics.values() if isinstance(value, dict)), default=0)
 
     def add_text(self, txt: str) -> None:
         self.text = txt
@@ -157,16 +591,122 @@ class File:
     def get_text(self) -> Optional[str]:
         return self.text
 
+    def add_tokens(
+        self,
+        token_ids: array,
+        sentence_offsets: array,
+        paragraph_offsets: array,
+        tokenized_text: Optional[TokenizedText] = None,
+    ) -> None:
+        self.token_ids = token_ids
+        self.sentence_offsets = sentence_offsets
+        self.paragraph_offsets = paragraph_offsets
+        self.tokenized_text = tokenized_text
+
+    def add_pos(self, pos_ids: array) -> None:
+        self.pos_ids = pos_ids
+
+    def add_lemma(self, lemma_ids: array) -> None:
+        self.lemma_ids = lemma_ids
+
+    def add_stop_word_free(self, stop_word_free_ids: array, stop_word_free_offsets: array) -> None:
+        self.stop_word_free_ids = stop_word_free_ids
+        self.stop_word_free_offsets = stop_word_free_offsets
+
+    def add_stemmed(self, stemmed_ids: array) -> None:
+        self.stemmed_ids = stemmed_ids
+
+    def get_ids(self, metric_type: str) -> array:
+        self.compute(metric_type=metric_type)
+        ids: Optional[array] = getattr(self, self.WORD_METRICS[metric_type][0])
+        if ids is None:
+            raise ValueError(f"Metric '{metric_type}' is not computed.")
+        return ids
+
+    def get_offsets(self, metric_type: str) -> array:
+        self.compute(metric_type=metric_type)
+        offsets: Optional[array] = getattr(self, self.WORD_METRICS[metric_type][1])
+        if offsets is None:
+            raise ValueError(f"Metric '{metric_type}' is not computed.")
+        return offsets
+
     def add_metric(self, metric_type: str, key: str, value: Any) -> None:
-        if not isinstance(getattr(self, metric_type), dict):
-            setattr(self, metric_type, {})
+        """Add a metric, dictionaries may use word ids as keys."""
+        self.metrics.setdefault(metric_type, {})[key] = value
+
+    def get_metric(self, metric_type: str, key: Optional[str] = None, decode: bool = True) -> Any:
+        """Get a metric, word ids are decoded to words unless `decode` is disabled."""
+        self.compute(metric_type=metric_type)
+        return self._get_metric(metric_type=metric_type, key=key, decode=decode)
 
-        getattr(self, metric_type)[key] = value
+    def as_dict(self) -> dict:
+        # Only what has been computed so far, `as_dict` never runs a stage
+        result: dict = {"text": self.text}
+        for metric_type in self.METRIC_TYPES:
+            result[metric_type] = self._get_metric(metric_type=metric_type)
+        return result
 
-    def get_metric(self, metric_type: str, key: Optional[str] = None) -> Any:
+    def _get_metric(self, metric_type: str, key: Optional[str] = None, decode: bool = True) -> Any:
+        if metric_type in self.WORD_METRICS:
+            return self._get_word_metric(metric_type=metric_type, key=key)
+
+        metrics: Optional[dict] = self.metrics.get(metric_type)
+        if metrics is None:
+            return None
         if not key:
-            return getattr(self, metric_type, None)
-        return getattr(self, metric_type, {}).get(key, None)
+            return {name: self._decode(value) for name, value in metrics.items()} if decode else metrics
+        value: Any = metrics.get(key, None)
+        return self._decode(value) if decode else value
 
-    def as_dict(self) -> dict:
-        return self.__dict__
+    def _get_word_metric(self, metric_type: str, key: Optional[str] = None) -> Any:
+        ids_name, offsets_name = self.WORD_METRICS[metric_type]
+        if getattr(self, ids_name) is None:
+            return None
+        ids: array = self.get_ids(metric_type="tokens" if metric_type == "pos" else metric_type)
+
+        if not key:
+            keys: list[str] = ["words_per_sentence", "words", "duplicate_free_words"]
+            if metric_type == "tokens":
+                keys = ["paragraphs", "sentences_per_paragraph", "sentences"] + keys
+            return {name: self._get_word_metric(metric_type=metric_type, key=name) for name in keys}
+
+        if metric_type == "tokens" and key in ["paragraphs", "sentences_per_paragraph", "sentences"]:
+            return self._get_text_metric(key=key)
+
+        words: list = self.vocabulary.words(ids)
+        if metric_type == "pos":
+            words = list(zip(words, self.pos_tags.words(self.get_ids(metric_type="pos"))))
+
+        if key == "words_per_sentence":
+            return split_by_offsets(values=words, offsets=getattr(self, offsets_name))
+        elif key == "words":
+            return words
+        elif key == "duplicate_free_words":
+            if metric_type == "pos":
+                return list(dict.fromkeys(words))
+            return self.vocabulary.words(first_occurrences(ids=ids).tolist())
+        return None
+
+    def _get_text_metric(self, key: str) -> list:
+        # Text based views are sliced from the spans of the tokens stage, the text is tokenized again only
+        # if the tokens were added without them
+        if self.tokenized_text is None:
+            self.tokenized_text = (
+                Tokenizer.tokenize(txt=self.text)
+                if self.text
+                else TokenizedText(text="", vocabulary=Vocabulary())
+            )
+        tokenized_text: TokenizedText = self.tokenized_text
+        if key == "paragraphs":
+            return tokenized_text.paragraphs()
+        elif key == "sentences_per_paragraph":
+            return tokenized_text.sentences_per_paragraph()
+        return tokenized_text.sentences()
+
+    def _decode(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {
+                self.vocabulary.word(key) if isinstance(key, int) else key: item
+                for key, item in value.items()
+            }
+        return value
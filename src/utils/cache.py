@@ -0,0 +1,40 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """Mapping with a size bound that evicts the least recently used entry, counting hits and misses."""
+
+    __slots__ = ("max_size", "hits", "misses", "_items")
+
+    def __init__(self, max_size: Optional[int] = 100_000) -> None:
+        self.max_size: Optional[int] = max_size  # None => unbounded
+        self.hits: int = 0
+        self.misses: int = 0
+        self._items: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value: Optional[Any] = self._items.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if self.max_size is not None and len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        self._items.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> dict[str, Optional[int]]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._items), "max_size": self.max_size}
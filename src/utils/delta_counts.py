@@ -0,0 +1,61 @@
+from collections import Counter
+from typing import Any, Callable, Hashable, Iterable, Mapping, Optional, TypeVar
+
+_Key = TypeVar("_Key", bound=Hashable)
+
+
+class DeltaCounts:
+    """Summed counts of a multiset of parts, updated by the parts that were added or removed.
+
+    A part is a key with counts, e.g. a paragraph with the counts of its words. `update` takes the keys of
+    the parts that make up the whole now: counts of parts that are gone are subtracted, those of new parts
+    added, unchanged parts cost nothing. Counts dropping to zero are removed, so `counts` only holds the
+    items of the current parts.
+    """
+
+    __slots__ = ("counts", "_parts")
+
+    def __init__(self) -> None:
+        self.counts: dict[Any, int] = {}
+        self._parts: dict[Hashable, tuple[int, Mapping[Any, int]]] = {}  # key => (multiplicity, counts)
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def update(self, keys: Iterable[_Key], counts_of: Callable[[_Key], Mapping[Any, int]]) -> int:
+        """Makes the parts of `keys` the current parts, `counts_of` is only called for new keys.
+
+        Returns the number of parts whose multiplicity changed.
+        """
+        multiplicities: Counter = Counter(keys)
+        changed: int = 0
+
+        for key in [key for key in self._parts if key not in multiplicities]:
+            multiplicity, counts = self._parts.pop(key)
+            self._add(counts=counts, factor=-multiplicity)
+            changed += 1
+
+        for key, multiplicity in multiplicities.items():
+            part: Optional[tuple[int, Mapping[Any, int]]] = self._parts.get(key)
+            last_multiplicity: int = part[0] if part is not None else 0
+            if multiplicity == last_multiplicity:
+                continue
+            counts = part[1] if part is not None else counts_of(key)
+            self._add(counts=counts, factor=multiplicity - last_multiplicity)
+            self._parts[key] = (multiplicity, counts)
+            changed += 1
+
+        return changed
+
+    def clear(self) -> None:
+        self.counts.clear()
+        self._parts.clear()
+
+    def _add(self, counts: Mapping[Any, int], factor: int) -> None:
+        total: dict[Any, int] = self.counts
+        for item, count in counts.items():
+            new_count: int = total.get(item, 0) + factor * count
+            if new_count:
+                total[item] = new_count
+            else:
+                del total[item]
@@ -0,0 +1,112 @@
+import re
+import zlib
+from typing import Hashable, Iterable, Optional
+
+import numpy as np
+
+_WORDS: re.Pattern = re.compile(r"\w+")
+_PRIME: np.uint64 = np.uint64((1 << 61) - 1)  # Mersenne prime of the permutations
+_MAX_HASH: np.uint64 = np.uint64((1 << 32) - 1)
+_SHINGLE_BLOCK: int = 4096  # Shingles permuted at a time, bounds the memory of a signature
+
+
+class MinHash:
+    """MinHash signatures of the word shingles of texts, their agreement estimates the Jaccard similarity.
+
+    A shingle is a run of `shingle_size` words, texts with fewer words are one shingle. Words are hashed
+    with CRC32, so signatures are the same in every process. Signatures of the parts of a text (e.g. the
+    chunks of a large file) combine with `np.minimum`, shingles across the boundary of two parts are lost.
+    """
+
+    def __init__(self, permutations: int = 128, shingle_size: int = 5, seed: int = 1) -> None:
+        self.permutations: int = permutations
+        self.shingle_size: int = shingle_size
+        rng: np.random.Generator = np.random.default_rng(seed)
+        # Permutations `(a * x + b) % prime` of 32 bit shingle hashes. `a`, `x` and `b` are below 2 ** 32, so
+        # `a * x + b` is at most 2 ** 64 - 2 ** 32 and never wraps around in uint64
+        self._a: np.ndarray = rng.integers(1, 1 << 32, size=permutations, dtype=np.uint64)
+        self._b: np.ndarray = rng.integers(0, 1 << 32, size=permutations, dtype=np.uint64)
+
+    def empty(self) -> np.ndarray:
+        return np.full(self.permutations, _MAX_HASH, dtype=np.uint64)
+
+    def signature(self, txt: str) -> Optional[np.ndarray]:
+        """Signature of the lowercased words of `txt`, None if it has no words."""
+        words: list[str] = _WORDS.findall(txt.lower())
+        if not words:
+            return None
+
+        word_hashes: np.ndarray = np.fromiter(
+            (zlib.crc32(word.encode("utf-8")) for word in words), dtype=np.uint64, count=len(words)
+        )
+        # Polynomial hash of every window of `shingle_size` words, modulo 2 ** 32
+        size: int = min(self.shingle_size, len(words))
+        shingles: np.ndarray = np.zeros(len(words) - size + 1, dtype=np.uint64)
+        for offset, end in enumerate(range(len(shingles), len(words) + 1)):
+            shingles = (shingles * np.uint64(1_000_003) + word_hashes[offset:end]) & _MAX_HASH
+        shingles = np.unique(shingles)
+
+        signature: np.ndarray = self.empty()
+        for block in np.array_split(shingles, range(_SHINGLE_BLOCK, len(shingles), _SHINGLE_BLOCK)):
+            permuted: np.ndarray = (np.outer(self._a, block) + self._b[:, None]) % _PRIME & _MAX_HASH
+            np.minimum(signature, permuted.min(axis=1), out=signature)
+        return signature
+
+    @staticmethod
+    def similarity(signature: np.ndarray, other: np.ndarray) -> float:
+        """Estimated Jaccard similarity of the shingles of two texts."""
+        return float(np.count_nonzero(signature == other)) / len(signature)
+
+
+class MinHashLSH:
+    """Locality sensitive hashing index of MinHash signatures, finds the signatures similar to a signature.
+
+    Signatures are split into bands of rows, two signatures are candidates if all rows of one band agree.
+    Bands and rows are chosen so that pairs at `threshold` are found with high probability, candidates
+    are then checked against the threshold with their estimated similarity.
+    """
+
+    def __init__(self, threshold: float = 0.9, permutations: int = 128) -> None:
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError(f"Expected a similarity threshold in (0, 1], got {threshold}.")
+        self.threshold: float = threshold
+        self.bands, self.rows = self._bands_and_rows(threshold=threshold, permutations=permutations)
+        self._buckets: list[dict[bytes, list[Hashable]]] = [{} for _ in range(self.bands)]
+        self._signatures: dict[Hashable, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def insert(self, key: Hashable, signature: np.ndarray) -> None:
+        self._signatures[key] = signature
+        for bucket, band in zip(self._buckets, self._bands(signature=signature)):
+            bucket.setdefault(band, []).append(key)
+
+    def query(self, signature: np.ndarray) -> list[tuple[Hashable, float]]:
+        """Keys with an estimated similarity of at least `threshold`, most similar first."""
+        candidates: dict[Hashable, None] = {}
+        for bucket, band in zip(self._buckets, self._bands(signature=signature)):
+            candidates.update(dict.fromkeys(bucket.get(band, ())))
+
+        similar: list[tuple[Hashable, float]] = []
+        for key in candidates:
+            similarity: float = MinHash.similarity(signature, self._signatures[key])
+            if similarity >= self.threshold:
+                similar.append((key, similarity))
+        return sorted(similar, key=lambda item: -item[1])
+
+    def _bands(self, signature: np.ndarray) -> Iterable[bytes]:
+        for band in signature.reshape(self.bands, self.rows):
+            yield band.tobytes()
+
+    @staticmethod
+    def _bands_and_rows(threshold: float, permutations: int) -> tuple[int, int]:
+        # The similarity `(1 / bands) ** (1 / rows)` where the probability to become candidates rises
+        # steepest should be a bit below the threshold, fewer pairs at the threshold are missed
+        options: list[tuple[int, int]] = [
+            (permutations // rows, rows) for rows in range(1, permutations + 1) if permutations % rows == 0
+        ]
+        below: list[tuple[int, int]] = [
+            (bands, rows) for bands, rows in options if (1 / bands) ** (1 / rows) <= threshold * 0.9
+        ]
+        return max(below or options[:1], key=lambda option: option[1])
@@ -0,0 +1,145 @@
+from typing import TYPE_CHECKING, Callable, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    # Imported on first use, like nltk, so the command line starts without SciPy
+    from scipy.sparse import csr_matrix
+
+
+def cooccurrence_matrix(
+    ids: np.ndarray, offsets: np.ndarray, node_count: int, window_size: Optional[int] = None
+) -> "csr_matrix":
+    """Symmetric 0/1 adjacency of words that occur within `window_size` words of each other.
+
+    `ids` holds the word ids of all sentences back to back, `offsets` the start of every sentence plus the
+    end of the last one. Without a window size every pair of words of a sentence is connected, a window
+    has to span at least 2 words.
+    """
+    if window_size is not None and window_size < 2:
+        raise ValueError(f"Expected a window of at least 2 words, got window_size={window_size}.")
+    from scipy.sparse import coo_matrix, csr_matrix
+
+    lengths: np.ndarray = np.diff(offsets)
+    if len(ids) == 0:
+        return csr_matrix((node_count, node_count), dtype=float)
+
+    rows: list[np.ndarray] = []
+    columns: list[np.ndarray] = []
+    if window_size is None or window_size >= lengths.max():
+        # Every sentence is a clique, repeated words of a sentence add no further edges
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            words: np.ndarray = np.unique(ids[start:end])
+            left_index, right_index = np.triu_indices(len(words), 1)
+            rows.append(words[left_index])
+            columns.append(words[right_index])
+    else:
+        sentence_of_word: np.ndarray = np.repeat(np.arange(len(lengths)), lengths)
+        for distance in range(1, window_size):
+            # Pairs of words `distance` apart which belong to the same sentence
+            same_sentence: np.ndarray = sentence_of_word[:-distance] == sentence_of_word[distance:]
+            left: np.ndarray = ids[:-distance][same_sentence]
+            right: np.ndarray = ids[distance:][same_sentence]
+            different_words: np.ndarray = left != right
+            rows.append(left[different_words])
+            columns.append(right[different_words])
+
+    row: np.ndarray = np.concatenate(rows + columns) if rows else np.zeros(0, dtype=ids.dtype)
+    column: np.ndarray = np.concatenate(columns + rows) if rows else np.zeros(0, dtype=ids.dtype)
+    adjacency: "csr_matrix" = coo_matrix(
+        (np.ones(len(row)), (row, column)), shape=(node_count, node_count)
+    ).tocsr()
+    adjacency.data[:] = 1.0  # Repeated pairs are one unweighted edge
+
+    return adjacency
+
+
+def edge_keys(adjacency: "csr_matrix") -> np.ndarray:
+    """Sorted `row << 32 | column` keys of the edges of a symmetric adjacency, every edge once.
+
+    Keys of different adjacencies over the same ids merge with `np.union1d`, so co-occurrences can be
+    collected part by part.
+    """
+    upper = adjacency.tocoo()
+    in_upper_triangle: np.ndarray = upper.row < upper.col
+    rows: np.ndarray = upper.row[in_upper_triangle].astype(np.uint64)
+    columns: np.ndarray = upper.col[in_upper_triangle].astype(np.uint64)
+    return np.unique((rows << np.uint64(32)) | columns)
+
+
+def adjacency_from_edge_keys(keys: np.ndarray, node_of_id: np.ndarray, node_count: int) -> "csr_matrix":
+    """Symmetric 0/1 adjacency of `edge_keys`, ids are relabeled to the nodes of `node_of_id`."""
+    from scipy.sparse import coo_matrix
+
+    rows: np.ndarray = node_of_id[(keys >> np.uint64(32)).astype(np.int64)]
+    columns: np.ndarray = node_of_id[(keys & np.uint64(0xFFFFFFFF)).astype(np.int64)]
+    adjacency: "csr_matrix" = coo_matrix(
+        (np.ones(2 * len(keys)), (np.concatenate([rows, columns]), np.concatenate([columns, rows]))),
+        shape=(node_count, node_count),
+    ).tocsr()
+    return adjacency
+
+
+def page_rank(
+    adjacency: "csr_matrix",
+    alpha: float = 0.85,
+    tolerance: float = 1.0e-6,
+    max_iterations: int = 100,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> tuple[np.ndarray, float]:
+    """Power iteration PageRank, equal to `networkx.pagerank` on the same graph.
+
+    Returns the scores in node id order and the l1 residual of the last iteration. Stops after
+    `max_iterations` even if the residual is still above `node_count * tolerance`, or as soon as
+    `should_stop` returns True after an iteration (e.g. at a deadline). Every iteration gives valid scores,
+    the residual tells how far they are from convergence.
+    """
+    from scipy.sparse import csr_matrix, diags
+
+    node_count: int = adjacency.shape[0]
+    if node_count == 0:
+        return np.zeros(0), 0.0
+
+    out_degrees: np.ndarray = np.asarray(adjacency.sum(axis=1)).ravel()
+    inverse_out_degrees: np.ndarray = np.zeros(node_count)
+    np.divide(1.0, out_degrees, out=inverse_out_degrees, where=out_degrees != 0)
+    transition: "csr_matrix" = csr_matrix(diags(inverse_out_degrees) @ adjacency)
+
+    dangling: np.ndarray = np.where(out_degrees == 0)[0]
+    uniform: np.ndarray = np.repeat(1.0 / node_count, node_count)
+    scores: np.ndarray = uniform
+    residual: float = float("inf")
+
+    for _ in range(max_iterations):
+        last_scores: np.ndarray = scores
+        scores = alpha * (scores @ transition + scores[dangling].sum() * uniform) + (1 - alpha) * uniform
+        residual = float(np.absolute(scores - last_scores).sum())
+        if residual < node_count * tolerance or (should_stop is not None and should_stop()):
+            break
+
+    return scores, residual
+
+
+def cap_graph(
+    adjacency: "csr_matrix", priorities: np.ndarray, max_edges: int, min_nodes: int = 1
+) -> np.ndarray:
+    """Nodes of the largest subgraph of the highest priority nodes with at most `max_edges` edges.
+
+    Nodes are taken in order of decreasing `priority` (ties by node id) as long as the edges among them fit,
+    but at least `min_nodes` of them. Returns the kept node ids in ascending order, `adjacency[kept][:, kept]`
+    is the capped graph.
+    """
+    node_count: int = adjacency.shape[0]
+    order: np.ndarray = np.argsort(-priorities, kind="stable")
+    rank_of_node: np.ndarray = np.empty(node_count, dtype=np.int64)
+    rank_of_node[order] = np.arange(node_count)
+
+    # An edge is part of the subgraph of the first `k` nodes once both of its nodes are
+    upper = adjacency.tocoo()
+    in_upper_triangle: np.ndarray = upper.row < upper.col
+    last_rank: np.ndarray = np.maximum(
+        rank_of_node[upper.row[in_upper_triangle]], rank_of_node[upper.col[in_upper_triangle]]
+    )
+    edges_up_to_rank: np.ndarray = np.cumsum(np.bincount(last_rank, minlength=node_count))
+    kept_count: int = max(int(np.searchsorted(edges_up_to_rank, max_edges, side="right")), min_nodes)
+    return np.sort(order[:kept_count])
@@ -0,0 +1,91 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+
+class StageProfiler:
+    """Wall time, calls, items and memory peak of named pipeline stages.
+
+    Stages can nest, the seconds of a stage exclude the seconds of the stages measured inside it. With
+    `trace_memory` the peak of traced memory above the start of a stage (nested stages included) is kept as
+    `peak_bytes`, tracemalloc runs while the outermost stage runs unless it has been started before.
+    `stats` is a plain dict, so it is JSON serializable and stats of other processes can be `merge`d.
+    """
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory: bool = trace_memory
+        self._stats: dict[str, dict] = {}
+        # [start of the stage, seconds of nested stages, traced memory at start, peak of nested stages]
+        self._stack: list[list] = []
+        self._stops_tracing: bool = False
+
+    @contextmanager
+    def measure(self, stage: str, items: Optional[Callable[[], int]] = None) -> Iterator[None]:
+        """Measures the block as `stage`, `items` is called afterwards for the items it produced."""
+        self._enter()
+        try:
+            yield
+        finally:
+            seconds, peak_bytes = self._exit()
+            self.add(
+                stage=stage, seconds=seconds, items=items() if items is not None else 0, peak_bytes=peak_bytes
+            )
+
+    def add(self, stage: str, seconds: float, items: int = 0, peak_bytes: int = 0, calls: int = 1) -> None:
+        stats: dict = self._stats.setdefault(stage, {"calls": 0, "seconds": 0.0, "items": 0, "peak_bytes": 0})
+        stats["calls"] += calls
+        stats["seconds"] += seconds
+        stats["items"] += items
+        stats["peak_bytes"] = max(stats["peak_bytes"], peak_bytes)
+
+    def merge(self, stats: dict[str, dict]) -> None:
+        """Adds the `stats` of another profiler, e.g. of a worker process."""
+        for stage, stage_stats in stats.items():
+            self.add(stage=stage, **stage_stats)
+
+    def stats(self) -> dict[str, dict]:
+        """Stats per stage in order of the first measurement."""
+        return {stage: dict(stats) for stage, stats in self._stats.items()}
+
+    def report(self) -> str:
+        """The stages as a table, slowest first."""
+        total: float = sum(stats["seconds"] for stats in self._stats.values()) or 1.0
+        lines: list[str] = [
+            f"{'stage':<16}{'calls':>8}{'seconds':>11}{'share':>8}{'items':>12}{'peak MB':>10}"
+        ]
+        for stage, stats in sorted(self._stats.items(), key=lambda item: -item[1]["seconds"]):
+            lines.append(
+                f"{stage:<16}{stats['calls']:>8}{stats['seconds']:>11.4f}{stats['seconds'] / total:>8.1%}"
+                f"{stats['items']:>12}{stats['peak_bytes'] / 1024 / 1024:>10.1f}"
+            )
+        return "\n".join(lines)
+
+    def _enter(self) -> None:
+        traced: int = 0
+        if self.trace_memory:
+            if not self._stack and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._stops_tracing = True
+            traced, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # The peak is reset for this stage, the enclosing stage keeps the peak so far
+                self._stack[-1][3] = max(self._stack[-1][3], peak)
+            tracemalloc.reset_peak()
+        self._stack.append([time.perf_counter(), 0.0, traced, 0])
+
+    def _exit(self) -> tuple[float, int]:
+        start, nested_seconds, traced, nested_peak = self._stack.pop()
+        seconds: float = time.perf_counter() - start
+        peak_bytes: int = 0
+        if self.trace_memory:
+            peak: int = max(tracemalloc.get_traced_memory()[1], nested_peak)
+            peak_bytes = max(peak - traced, 0)
+            if self._stack:
+                self._stack[-1][3] = max(self._stack[-1][3], peak)
+            elif self._stops_tracing:
+                tracemalloc.stop()
+                self._stops_tracing = False
+        if self._stack:
+            self._stack[-1][1] += seconds
+        return seconds - nested_seconds, peak_bytes
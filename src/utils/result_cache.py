@@ -0,0 +1,154 @@
+import json
+import os
+import sqlite3
+import time
+import zlib
+from typing import Any, Optional
+
+
+class ResultCache:
+    """Extraction results on disk, in one SQLite file inside `directory`.
+
+    Values are stored as compressed JSON, tuples (e.g. the `(word, tag)` pairs of `pos`) are tagged and
+    restored, so a cached result equals the computed one. Nothing read from the cache is executed, a shared
+    cache directory can at worst return wrong results. When the stored size exceeds `max_bytes`, the least
+    recently used entries are evicted until `EVICT_TO` of `max_bytes` is left, so the following puts don't
+    evict again. Several processes can share one cache directory, SQLite serializes the writes.
+    """
+
+    # Caches of earlier versions held pickles, they are never opened
+    FILE_NAME: str = "keyword_extractor_cache_json.sqlite"
+    EVICT_TO: float = 0.8  # Share of `max_bytes` left after an eviction
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = 1 << 30) -> None:
+        self.directory: str = directory
+        self.max_bytes: Optional[int] = max_bytes  # None => unbounded
+        self._connection: Optional[sqlite3.Connection] = None
+        self._size: int = 0  # Stored bytes as seen by this process
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Connections can't be pickled, every process opens its own
+        state: dict[str, Any] = self.__dict__.copy()
+        state["_connection"] = None
+        return state
+
+    def get(self, key: str) -> Optional[Any]:
+        connection: sqlite3.Connection = self._connect()
+        row = connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        with connection:
+            connection.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        return json.loads(zlib.decompress(row[0]), object_hook=_decode_tuples)
+
+    def put(self, key: str, value: Any) -> None:
+        connection: sqlite3.Connection = self._connect()
+        data: bytes = zlib.compress(json.dumps(_encode_tuples(value)).encode("utf-8"))
+        with connection:
+            replaced = connection.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+            connection.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time()),
+            )
+        self._size += len(data) - (replaced[0] if replaced is not None else 0)
+
+        if self.max_bytes is not None and self._size > self.max_bytes:
+            self._evict()
+
+    def size(self) -> int:
+        return self._connect().execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM results")
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> dict[str, Optional[int]]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self),
+            "bytes": self.size(),
+            "max_bytes": self.max_bytes,
+        }
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened on first use, so an unused cache can be passed to worker processes
+        if self._connection is None:
+            os.makedirs(self.directory, exist_ok=True)
+            # A pipeline of the extraction server moves between request threads, but is used by one at a time
+            self._connection = sqlite3.connect(
+                os.path.join(self.directory, self.FILE_NAME), timeout=60, check_same_thread=False
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                    "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+                )
+                self._connection.execute(
+                    "CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)"
+                )
+            self._size = self.size()
+        return self._connection
+
+    def _evict(self) -> None:
+        connection: sqlite3.Connection = self._connect()
+        with connection:
+            # Other processes may have written or evicted in the meantime
+            count, self._size = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+            if self.max_bytes is None or self._size <= self.max_bytes:
+                return
+
+            target: int = int(self.max_bytes * self.EVICT_TO)
+            while self._size > target and count:
+                # Least recently used entries of about the excess size, by the mean size of an entry
+                limit: int = max(-(-(self._size - target) * count // self._size), 1)
+                evicted_size: int = connection.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM "
+                    "(SELECT size FROM results ORDER BY last_access ASC, rowid ASC LIMIT ?)",
+                    (limit,),
+                ).fetchone()[0]
+                connection.execute(
+                    "DELETE FROM results WHERE rowid IN "
+                    "(SELECT rowid FROM results ORDER BY last_access ASC, rowid ASC LIMIT ?)",
+                    (limit,),
+                )
+                self._size -= evicted_size
+                count -= min(limit, count)
+
+
+_TUPLE_KEY: str = "__tuple__"
+
+
+def _encode_tuples(value: Any) -> Any:
+    # JSON would turn tuples into lists, they are stored as tagged objects instead
+    if isinstance(value, tuple):
+        return {_TUPLE_KEY: [_encode_tuples(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode_tuples(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _encode_tuples(item) for key, item in value.items()}
+    return value
+
+
+def _decode_tuples(value: dict) -> Any:
+    return tuple(value[_TUPLE_KEY]) if len(value) == 1 and _TUPLE_KEY in value else value
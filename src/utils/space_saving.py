@@ -0,0 +1,65 @@
+import heapq
+from typing import Hashable
+
+
+class SpaceSaving:
+    """Approximate heavy hitters of an unbounded stream in bounded memory (Space-Saving algorithm).
+
+    At most `capacity` items are counted. An item that is not counted replaces the item with the smallest
+    count and inherits that count, so counts are over-estimated by at most their `error`. Every item which
+    occurs more than `total / capacity` times is guaranteed to be counted.
+    """
+
+    __slots__ = ("capacity", "total", "_counts", "_errors", "_heap", "_sequence")
+
+    def __init__(self, capacity: int = 10_000) -> None:
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1.")
+
+        self.capacity: int = capacity
+        self.total: int = 0
+        self._counts: dict[Hashable, int] = {}
+        self._errors: dict[Hashable, int] = {}
+        # (count, sequence, item) entries, outdated entries are skipped when the minimum is taken
+        self._heap: list[tuple[int, int, Hashable]] = []
+        self._sequence: int = 0
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def add(self, item: Hashable, count: int = 1) -> None:
+        self.total += count
+        counts: dict[Hashable, int] = self._counts
+
+        if item in counts:
+            counts[item] += count
+        elif len(counts) < self.capacity:
+            counts[item] = count
+            self._errors[item] = 0
+        else:
+            min_item, min_count = self._pop_min()
+            del counts[min_item]
+            del self._errors[min_item]
+            counts[item] = min_count + count
+            self._errors[item] = min_count
+
+        self._sequence += 1
+        heapq.heappush(self._heap, (counts[item], self._sequence, item))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def top(self, k: int) -> list[tuple[Hashable, int, int]]:
+        """The `k` items with the highest counts as `(item, count, error)`, ties in order of arrival."""
+        items = heapq.nlargest(k, self._counts.items(), key=lambda item_count: item_count[1])
+        return [(item, count, self._errors[item]) for item, count in items]
+
+    def _pop_min(self) -> tuple[Hashable, int]:
+        while True:
+            count, _, item = heapq.heappop(self._heap)
+            if self._counts.get(item) == count:
+                return item, count
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(count, index, item) for index, (item, count) in enumerate(self._counts.items())]
+        heapq.heapify(self._heap)
+        self._sequence = len(self._heap)
@@ -0,0 +1,182 @@
+from array import array
+from typing import TYPE_CHECKING, Any, Mapping, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from scipy.sparse import csr_matrix
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the `k` highest scores, highest first and equal scores in index order.
+
+    Only the scores not below the `k`-th highest one are sorted, found by `np.partition` in linear time.
+    Fewer than `k` scores give all indices.
+    """
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < len(scores):
+        threshold: float = np.partition(scores, len(scores) - k)[len(scores) - k]
+        candidates: np.ndarray = np.flatnonzero(scores >= threshold)
+    else:
+        candidates = np.arange(len(scores))
+    # Stable sort keeps the first occurrence first for equal scores
+    return candidates[np.argsort(-scores[candidates], kind="stable")[:k]]
+
+
+class CorpusTfIdf:
+    """TF-IDF over a whole corpus, backed by a sparse document-term matrix.
+
+    Documents are added with their term counts (first pass), which builds the vocabulary and the rows of
+    the CSR matrix. Terms can be words or word ids of a `Vocabulary`. Document frequencies are the stored
+    entries per column of the matrix, the scores of all documents one vectorized step over its entries and
+    the top keywords of a document `top_k` of the scores of its row. Entries keep the order of the term
+    counts inside their row, so equal scores keep the first occurrence first. SciPy is imported when the
+    matrix is first needed.
+    """
+
+    def __init__(self) -> None:
+        self.keys: list[str] = []
+        self.terms: list = []
+        self._vocabulary: dict[Any, int] = {}
+        self._indptr: array = array("q", [0])
+        self._indices: array = array("q")
+        self._counts: array = array("q")
+        self._lengths: array = array("q")
+        self._matrix: Optional["csr_matrix"] = None
+        self._document_frequencies: Optional[np.ndarray] = None
+        self._inverse_document_frequencies: Optional[np.ndarray] = None
+        self._scores: Optional[np.ndarray] = None
+
+    @property
+    def document_count(self) -> int:
+        return len(self.keys)
+
+    def add_document(self, key: str, word_counts: Mapping[Any, int], length: int) -> None:
+        # Terms keep the order of `word_counts` inside a row, which is used as tie-break for equal scores
+        for word, count in word_counts.items():
+            term_id: Optional[int] = self._vocabulary.get(word)
+            if term_id is None:
+                term_id = len(self.terms)
+                self._vocabulary[word] = term_id
+                self.terms.append(word)
+            self._indices.append(term_id)
+            self._counts.append(count)
+
+        self.keys.append(key)
+        self._indptr.append(len(self._indices))
+        self._lengths.append(length)
+        self._matrix = None
+        self._document_frequencies = None
+        self._inverse_document_frequencies = None
+        self._scores = None
+
+    def matrix(self) -> "csr_matrix":
+        """Term counts, one row per document and one column per term. Built once after the last add."""
+        if self._matrix is None:
+            from scipy.sparse import csr_matrix
+
+            self._matrix = csr_matrix(
+                (
+                    np.array(self._counts, dtype=np.int64),
+                    np.array(self._indices, dtype=np.int64),
+                    np.array(self._indptr, dtype=np.int64),
+                ),
+                shape=(self.document_count, len(self.terms)),
+            )
+        return self._matrix
+
+    def document_frequencies(self) -> np.ndarray:
+        if self._document_frequencies is None:
+            # Every term of a document is one entry of its row
+            self._document_frequencies = self.matrix().getnnz(axis=0)
+        return self._document_frequencies
+
+    def inverse_document_frequencies(self) -> np.ndarray:
+        if self._inverse_document_frequencies is None:
+            self._inverse_document_frequencies = 1 + np.log(self.document_count / self.document_frequencies())
+        return self._inverse_document_frequencies
+
+    def scores(self) -> np.ndarray:
+        """Scores of all stored entries, aligned with the data of `matrix()`."""
+        if self._scores is None:
+            matrix: "csr_matrix" = self.matrix()
+            lengths: np.ndarray = np.repeat(
+                np.frombuffer(self._lengths, dtype=np.int64), np.diff(matrix.indptr)
+            )
+            self._scores = matrix.data / lengths * self.inverse_document_frequencies()[matrix.indices]
+        return self._scores
+
+    def document_metrics(self, index: int) -> dict[str, dict]:
+        start, end = self._indptr[index], self._indptr[index + 1]
+        indices: np.ndarray = np.frombuffer(self._indices, dtype=np.int64)[start:end]
+        words: list = [self.terms[term_id] for term_id in indices]
+        document_frequencies: np.ndarray = self.document_frequencies()[indices]
+        inverse_document_frequencies: np.ndarray = self.inverse_document_frequencies()[indices]
+
+        return {
+            "document_frequencies": dict(zip(words, document_frequencies.tolist())),
+            "inverse_document_frequencies": dict(zip(words, inverse_document_frequencies.tolist())),
+            "term_frequency_inverse_document_frequencies": dict(
+                zip(words, self.scores()[start:end].tolist())
+            ),
+        }
+
+    def top_keywords(self, max_keywords: int = 10) -> list[list]:
+        """The `max_keywords` highest scoring terms of every document, selected per row by `top_k`."""
+        matrix: "csr_matrix" = self.matrix()
+        scores: np.ndarray = self.scores()
+        indptr: list[int] = matrix.indptr.tolist()
+        keywords: list[list] = []
+        for start, end in zip(indptr[:-1], indptr[1:]):
+            top: np.ndarray = top_k(scores=scores[start:end], k=max_keywords)
+            keywords.append([self.terms[term_id] for term_id in matrix.indices[start:end][top].tolist()])
+        return keywords
+
+    def word_counts(self, index: int) -> dict:
+        """Term counts of a document, in the order they were added."""
+        start, end = self._indptr[index], self._indptr[index + 1]
+        return {
+            self.terms[term_id]: count
+            for term_id, count in zip(self._indices[start:end], self._counts[start:end])
+        }
+
+    def length(self, index: int) -> int:
+        return self._lengths[index]
+
+    def to_dict(self) -> dict[str, list]:
+        """Keys, vocabulary, document frequencies and the term counts of every document as plain lists.
+
+        The statistics of a part of a corpus, e.g. of one shard, JSON serializable and restored by
+        `from_dict`. Document frequencies follow from the rows and are checked on restore.
+        """
+        return {
+            "keys": list(self.keys),
+            "terms": list(self.terms),
+            "document_frequencies": self.document_frequencies().tolist(),
+            "indptr": self._indptr.tolist(),
+            "indices": self._indices.tolist(),
+            "counts": self._counts.tolist(),
+            "lengths": self._lengths.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, list]) -> "CorpusTfIdf":
+        corpus: CorpusTfIdf = cls()
+        corpus.keys = list(data["keys"])
+        corpus.terms = list(data["terms"])
+        corpus._vocabulary = {term: term_id for term_id, term in enumerate(corpus.terms)}
+        corpus._indptr = array("q", data["indptr"])
+        corpus._indices = array("q", data["indices"])
+        corpus._counts = array("q", data["counts"])
+        corpus._lengths = array("q", data["lengths"])
+
+        if (
+            len(corpus._indptr) != corpus.document_count + 1
+            or len(corpus._lengths) != corpus.document_count
+            or corpus._indptr[-1] != len(corpus._indices)
+            or len(corpus._counts) != len(corpus._indices)
+            or not np.array_equal(corpus.document_frequencies(), data["document_frequencies"])
+        ):
+            raise ValueError("Corpus statistics are inconsistent.")
+        return corpus
@@ -0,0 +1,48 @@
+import time
+from typing import Any, Callable, Optional
+
+
+class TimeBudget:
+    """Deadline of one extraction and the degradations applied to meet it.
+
+    Stages ask for the `remaining` seconds before they start work whose size they can still choose, and
+    `degrade` records what they gave up. `report` is a plain dict, so it can go into a JSON result. The
+    clock is injectable, tests pass a fake one.
+    """
+
+    def __init__(self, milliseconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.milliseconds: float = milliseconds
+        self.clock: Callable[[], float] = clock
+        self.start: float = clock()
+        self.end: float = self.start + milliseconds / 1000
+        self.degradations: dict[str, dict[str, Any]] = {}  # Name => details, in the order they were applied
+        self.residual: Optional[float] = None  # l1 residual of the last page rank iteration
+        self._marks: dict[str, float] = {}
+
+    def remaining(self) -> float:
+        """Seconds until the deadline, negative once it has passed."""
+        return self.end - self.clock()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def degrade(self, name: str, **details: Any) -> None:
+        self.degradations[name] = details
+
+    def mark(self, name: str) -> None:
+        self._marks[name] = self.clock()
+
+    def since(self, name: str) -> Optional[float]:
+        """Seconds since `mark(name)`, None if it was not marked."""
+        mark: Optional[float] = self._marks.get(name)
+        return self.clock() - mark if mark is not None else None
+
+    def report(self) -> dict[str, Any]:
+        elapsed_ms: float = (self.clock() - self.start) * 1000
+        return {
+            "time_budget_ms": self.milliseconds,
+            "elapsed_ms": elapsed_ms,
+            "exceeded": elapsed_ms > self.milliseconds,
+            "degradations": {name: dict(details) for name, details in self.degradations.items()},
+            "residual": self.residual,
+        }
@@ -0,0 +1,48 @@
+from array import array
+from typing import Iterable, Optional
+
+
+class Vocabulary:
+    """Interns strings as consecutive integer ids.
+
+    One vocabulary is shared by all documents of a pipeline, so every word is stored once no matter how
+    often it occurs. Documents only hold `array("I")` id sequences.
+    """
+
+    __slots__ = ("_ids", "_words")
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._words: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __contains__(self, word: object) -> bool:
+        return word in self._ids
+
+    def get(self, word: str) -> Optional[int]:
+        return self._ids.get(word)
+
+    def intern(self, word: str) -> int:
+        word_id: Optional[int] = self._ids.get(word)
+        if word_id is None:
+            word_id = len(self._words)
+            self._ids[word] = word_id
+            self._words.append(word)
+        return word_id
+
+    def intern_many(self, words: Iterable[str]) -> array:
+        words = words if isinstance(words, list) else list(words)
+        try:
+            # Only known words, looked up without a Python level call per word
+            return array("I", map(self._ids.__getitem__, words))
+        except KeyError:
+            return array("I", [self.intern(word) for word in words])
+
+    def word(self, word_id: int) -> str:
+        return self._words[word_id]
+
+    def words(self, word_ids: Iterable[int]) -> list[str]:
+        words: list[str] = self._words
+        return [words[word_id] for word_id in word_ids]
@@ -0,0 +1,211 @@
+"""Throughput, latency percentiles and peak memory of `wf`, `tfidf` and `pr` on a seeded synthetic corpus.
+
+Every method runs in a fresh process, so peak memory and warm-up don't carry over from the method before.
+Per method:
+  - latency: one warm `KeywordExtractor` extracts every document on its own, percentiles in ms of the
+    fastest of `--repeat` extractions per document
+  - throughput: `KeywordExtractorDirectory` extracts the written corpus (`tfidf` against the whole corpus),
+    documents and MB per second, best of `--repeat` runs
+  - memory: peak RSS of the process, and its growth during the measured runs
+
+Results are JSON, so the results of two commits can be compared. With `--baseline` every metric that is
+worse than the baseline by more than `--threshold` is flagged and the exit code is 1.
+
+Run from the repository root:
+    PYTHONPATH=src python test/benchmarks/bench_extraction.py [-o results.json] [--baseline base.json]
+    PYTHONPATH=src python test/benchmarks/bench_extraction.py --results new.json --baseline base.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from corpus import corpus_hash, generate_corpus, write_corpus
+
+METHODS: list[str] = ["wf", "tfidf", "pr"]
+# Metrics compared against a baseline, True if higher is better
+METRICS: dict[str, bool] = {
+    "docs_per_second": True,
+    "mb_per_second": True,
+    "latency_p50_ms": False,
+    "latency_p90_ms": False,
+    "latency_p99_ms": False,
+    "peak_rss_mb": False,
+}
+
+
+def max_rss_mb() -> float:
+    # Kilobytes on Linux, bytes on macOS
+    max_rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def measure_method(method: str, paths: list[str], repeat: int) -> dict:
+    # Imported in the fresh process of the method, so the import is not part of another method's memory
+    from keyword_extractor import KeywordExtractor, KeywordExtractorDirectory
+
+    texts: list[str] = []
+    for path in paths:
+        with open(path, "r") as file:
+            texts.append(file.read())
+    corpus_bytes: int = sum(len(text.encode("utf-8")) for text in texts)
+
+    # Models, vocabulary and caches are loaded by a first extraction, like in a running directory extraction
+    keyword_extractor: KeywordExtractor = KeywordExtractor(txt=texts[0], method=method, detail="keywords")
+    keyword_extractor.extract()
+    rss_before: float = max_rss_mb()
+
+    # Fastest of `repeat` extractions per document, the percentiles are over documents
+    latencies: list[float] = [float("inf")] * len(texts)
+    for _ in range(repeat):
+        for index, text in enumerate(texts):
+            start: float = time.perf_counter()
+            keyword_extractor.update_txt(new_txt=text)
+            keyword_extractor.extract()
+            latencies[index] = min(latencies[index], (time.perf_counter() - start) * 1000)
+
+    seconds: float = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        KeywordExtractorDirectory(
+            directory=os.path.dirname(paths[0]), method=method, detail="keywords"
+        ).extract()
+        seconds = min(seconds, time.perf_counter() - start)
+
+    return {
+        "docs_per_second": len(texts) / seconds,
+        "mb_per_second": corpus_bytes / seconds / 1_000_000,
+        "latency_p50_ms": float(np.percentile(latencies, 50)),
+        "latency_p90_ms": float(np.percentile(latencies, 90)),
+        "latency_p99_ms": float(np.percentile(latencies, 99)),
+        "latency_mean_ms": float(np.mean(latencies)),
+        "peak_rss_mb": max_rss_mb(),
+        "rss_growth_mb": max_rss_mb() - rss_before,
+    }
+
+
+def run_benchmark(args: argparse.Namespace) -> dict:
+    corpus_options: dict = {
+        "documents": args.documents,
+        "words_per_document": args.words,
+        "words_per_sentence": args.sentence_words,
+        "vocabulary_size": args.vocabulary,
+        "zipf_skew": args.zipf,
+        "seed": args.seed,
+    }
+    texts: list[str] = generate_corpus(**corpus_options)
+    results: dict = {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "corpus": {
+            **corpus_options,
+            "hash": corpus_hash(texts=texts),
+            "mb": sum(len(text.encode("utf-8")) for text in texts) / 1_000_000,
+        },
+        "methods": {},
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths: list[str] = write_corpus(directory=directory, texts=texts)
+        for method in args.methods:
+            # A new process per method, `spawn` doesn't inherit the memory of this one
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                results["methods"][method] = pool.submit(measure_method, method, paths, args.repeat).result()
+            print(format_method(method=method, result=results["methods"][method]))
+
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        process = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True)
+    except OSError:
+        return None
+    return process.stdout.strip() or None
+
+
+def format_method(method: str, result: dict) -> str:
+    return (
+        f"{method:<6}{result['docs_per_second']:9.1f} docs/s{result['mb_per_second']:8.2f} MB/s   latency "
+        f"p50 {result['latency_p50_ms']:7.2f} p90 {result['latency_p90_ms']:7.2f} "
+        f"p99 {result['latency_p99_ms']:7.2f} ms   peak RSS {result['peak_rss_mb']:7.1f} MB"
+    )
+
+
+def compare(baseline: dict, results: dict, threshold: float) -> list[str]:
+    """Metrics of `results` worse than those of `baseline` by more than the relative `threshold`."""
+    if baseline["corpus"]["hash"] != results["corpus"]["hash"]:
+        print("Warning: the corpora differ, the results are not comparable", file=sys.stderr)
+
+    regressions: list[str] = []
+    for method, result in results["methods"].items():
+        for metric, higher_is_better in METRICS.items():
+            before: Optional[float] = baseline["methods"].get(method, {}).get(metric)
+            if not before:
+                continue
+            change: float = result[metric] / before - 1
+            worse: bool = change < -threshold if higher_is_better else change > threshold
+            line: str = f"{method:<6}{metric:<18}{before:11.2f} -> {result[metric]:11.2f} {change:+8.1%}"
+            print(line + ("  REGRESSION" if worse else ""))
+            if worse:
+                regressions.append(f"{method} {metric} {change:+.1%}")
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Extraction benchmark on a seeded synthetic corpus.")
+    parser.add_argument("-m", "--methods", nargs="+", default=METHODS, choices=METHODS, help="Methods to run")
+    parser.add_argument("-n", "--documents", type=int, default=200, help="Documents of the corpus")
+    parser.add_argument("--words", type=int, default=400, help="Words per document")
+    parser.add_argument("--sentence-words", type=int, default=15, help="Mean words per sentence")
+    parser.add_argument("--vocabulary", type=int, default=5000, help="Distinct words of the corpus")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf skew of the word frequencies")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the corpus")
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=3, help="Runs per method and document, best is kept"
+    )
+    parser.add_argument(
+        "-o", "--output", type=str, default=None, help="Write the results as JSON to this file"
+    )
+    parser.add_argument(
+        "--results", type=str, default=None, help="Compare these stored results instead of running"
+    )
+    parser.add_argument("--baseline", type=str, default=None, help="Results to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Relative change flagged as regression (default: 10%%)"
+    )
+    args = parser.parse_args(argv)
+
+    if args.results:
+        with open(args.results, "r") as file:
+            results: dict = json.load(file)
+    else:
+        results = run_benchmark(args=args)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            baseline: dict = json.load(file)
+        regressions: list[str] = compare(baseline=baseline, results=results, threshold=args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Sentences per second of POS tagging, `nltk.pos_tag` per sentence against the batched `POSTagger`.
+
+Run from the repository root:
+    PYTHONPATH=src python test/benchmarks/bench_pos_tagging.py
+"""
+
+import argparse
+import glob
+import os
+import time
+from typing import Callable
+
+import nltk
+from utils import POSTagger, Tokenizer
+
+
+def load_sentences(directory: str) -> list[list[str]]:
+    tokenizer: Tokenizer = Tokenizer()
+    sentences: list[list[str]] = []
+    for path in sorted(glob.glob(os.path.join(directory, "**", "*.txt"), recursive=True)):
+        with open(path, "r") as file:
+            paragraphs = tokenizer.text_to_paragraphs(txt=file.read().lower())
+        sentences += tokenizer.sentences_to_words_per_sentence(
+            sentences=tokenizer.sentences_per_paragraph_to_sentences(
+                sentences_per_paragraph=tokenizer.paragraphs_to_sentences_per_paragraph(paragraphs=paragraphs)
+            )
+        )
+    return sentences
+
+
+def legacy_generate_tags(collection: list[list[str]]) -> list[list[tuple[str, str]]]:
+    # Previous implementation: one `nltk.pos_tag` call per sentence and list based tag mapping
+    result = []
+    for value in collection:
+        sub_result = []
+        for token in nltk.pos_tag(value):
+            if token[1] in ["N", "NN", "NNS", "NNP", "NNPS"]:
+                sub_result.append((token[0], "n"))
+            elif token[1] in ["JJ", "JJR", "JJS"]:
+                sub_result.append((token[0], "a"))
+            elif token[1] in ["RB", "RBR", "RBS"]:
+                sub_result.append((token[0], "r"))
+            elif token[1] in ["VB", "VBD", "VBG", "VBN", "VBP", "VBZ"]:
+                sub_result.append((token[0], "v"))
+            else:
+                sub_result.append((token[0], token[1]))
+        result.append(sub_result)
+    return result
+
+
+def measure(function: Callable, sentences: list[list[str]], repeat: int) -> float:
+    best: float = float("inf")
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        function(sentences)
+        best = min(best, time.perf_counter() - start)
+    return len(sentences) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="POS tagging throughput before and after batching.")
+    parser.add_argument("-d", "--dir-path", type=str, default="./assets", help="Directory with texts")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Runs per implementation, best is kept")
+    args = parser.parse_args()
+
+    sentences: list[list[str]] = load_sentences(directory=args.dir_path)
+    if legacy_generate_tags(sentences) != POSTagger.generate_tags(collection=sentences):
+        raise AssertionError("Batched tagging differs from nltk.pos_tag")
+
+    before: float = measure(function=legacy_generate_tags, sentences=sentences, repeat=args.repeat)
+    after: float = measure(function=POSTagger.generate_tags, sentences=sentences, repeat=args.repeat)
+    print(f"{len(sentences)} sentences from '{args.dir_path}'")
+    print(f"before (nltk.pos_tag per sentence): {before:10.1f} sentences/sec")
+    print(f"after  (batched POSTagger):        {after:10.1f} sentences/sec ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
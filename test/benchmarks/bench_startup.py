@@ -0,0 +1,92 @@
+"""Cold start of the command line per mode, wall time of a fresh process and import time from `-X importtime`.
+
+Run from the repository root:
+    PYTHONPATH=src python test/benchmarks/bench_startup.py [--output startup.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Optional
+
+# Command line arguments of every mode, `import` only imports the package
+MODES: dict[str, list[str]] = {
+    "import": [],
+    "help": ["--help"],
+    "wf": ["-m", "wf"],
+    "tfidf": ["-m", "tfidf"],
+    "pr": ["-m", "pr"],
+    "full": ["-m", "full"],
+}
+TEXT: str = "Servers answer requests. A cold start loads every module the requested method needs."
+
+
+def import_times(stderr: str) -> dict[str, int]:
+    """Cumulative microseconds of every module of an `-X importtime` report."""
+    times: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, module = line.split("|")
+            if cumulative.strip().isdigit():
+                times[module.strip()] = int(cumulative)
+    return times
+
+
+def measure(mode: str, arguments: list[str]) -> dict:
+    code: str = "import keyword_extractor"
+    if mode != "import":
+        argv: list[str] = ["keyword_extractor", *arguments]
+        if mode != "help":
+            argv += ["-t", TEXT, "--detail", "keywords"]
+        code += f"; import sys; sys.argv = {argv!r}; keyword_extractor.run()"
+
+    environment: dict[str, str] = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(path for path in sys.path if path),
+    }
+    start: float = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=environment
+    )
+    wall: float = time.perf_counter() - start
+    if process.returncode != 0:
+        raise RuntimeError(f"Mode '{mode}' failed:\n{process.stderr[-2000:]}")
+
+    times: dict[str, int] = import_times(stderr=process.stderr)
+    return {
+        "wall_ms": wall * 1000,
+        "import_ms": times.get("keyword_extractor", 0) / 1000,
+        "modules": {name: name in times for name in ["nltk", "scipy", "networkx", "asyncio"]},
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Cold start time of the command line per mode.")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Runs per mode, the fastest is kept")
+    parser.add_argument(
+        "-o", "--output", type=str, default=None, help="Write the results as JSON to this file"
+    )
+    args = parser.parse_args(argv)
+
+    results: dict[str, dict] = {}
+    for mode, arguments in MODES.items():
+        runs: list[dict] = [measure(mode=mode, arguments=arguments) for _ in range(args.repeat)]
+        results[mode] = min(runs, key=lambda run: run["wall_ms"])
+        loaded: str = ", ".join(name for name, imported in results[mode]["modules"].items() if imported)
+        print(
+            f"{mode:<7} wall {results[mode]['wall_ms']:8.1f} ms, import of keyword_extractor "
+            f"{results[mode]['import_ms']:7.1f} ms, loaded: {loaded or '-'}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(
+                {"python": sys.version.split()[0], "repeat": args.repeat, "modes": results}, file, indent=2
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""MB/s of tokenizing, the five per level `Tokenizer` passes against the fused `Tokenizer.tokenize`.
+
+Run from the repository root:
+    PYTHONPATH=src python test/benchmarks/bench_tokenizer.py
+"""
+
+import argparse
+import glob
+import os
+import time
+from typing import Callable
+
+from utils import Tokenizer
+
+
+def load_text(directory: str, copies: int) -> str:
+    texts: list[str] = []
+    for path in sorted(glob.glob(os.path.join(directory, "**", "*.txt"), recursive=True)):
+        with open(path, "r") as file:
+            texts.append(file.read().lower())
+    return "\n".join(texts * copies)
+
+
+def legacy_tokenize(txt: str) -> list[list[str]]:
+    # Previous implementation: one materializing pass per level
+    paragraphs = Tokenizer.text_to_paragraphs(txt=txt)
+    sentences_per_paragraph = Tokenizer.paragraphs_to_sentences_per_paragraph(paragraphs=paragraphs)
+    sentences = Tokenizer.sentences_per_paragraph_to_sentences(
+        sentences_per_paragraph=sentences_per_paragraph
+    )
+    words_per_sentence = Tokenizer.sentences_to_words_per_sentence(sentences=sentences)
+    Tokenizer.words_per_sentence_to_words(words_per_sentence=words_per_sentence)
+    return words_per_sentence
+
+
+def fused_tokenize(txt: str) -> list[list[str]]:
+    return Tokenizer.tokenize(txt=txt).words_per_sentence()
+
+
+def measure(function: Callable, txt: str, repeat: int) -> float:
+    best: float = float("inf")
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        function(txt)
+        best = min(best, time.perf_counter() - start)
+    return len(txt.encode("utf-8")) / best / 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tokenizer throughput before and after fusing the passes.")
+    parser.add_argument("-d", "--dir-path", type=str, default="./assets", help="Directory with texts")
+    parser.add_argument("-c", "--copies", type=int, default=100, help="Copies of the texts to tokenize")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Runs per implementation, best is kept")
+    args = parser.parse_args()
+
+    txt: str = load_text(directory=args.dir_path, copies=args.copies)
+    if legacy_tokenize(txt) != fused_tokenize(txt):
+        raise AssertionError("Fused tokenizer differs from the per level passes")
+
+    before: float = measure(function=legacy_tokenize, txt=txt, repeat=args.repeat)
+    after: float = measure(function=fused_tokenize, txt=txt, repeat=args.repeat)
+    tokenize_only: float = measure(function=Tokenizer.tokenize, txt=txt, repeat=args.repeat)
+    print(f"{len(txt.encode('utf-8')) / 1_000_000:.1f} MB from '{args.dir_path}'")
+    print(f"before (five passes):          {before:8.1f} MB/s")
+    print(f"after  (fused, decoded words): {after:8.1f} MB/s ({after / before:.1f}x)")
+    print(f"after  (fused, word ids only): {tokenize_only:8.1f} MB/s ({tokenize_only / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Seeded synthetic corpus for the benchmarks, the same arguments give the same texts on every machine.
+
+Word frequencies follow a Zipf distribution over a vocabulary of made up words, like those of natural
+language where a few words are very frequent and most are rare. Sentence lengths vary around their mean,
+paragraphs hold a few sentences each.
+"""
+
+import hashlib
+import os
+from typing import Iterable
+
+import numpy as np
+
+SYLLABLES: list[str] = [consonant + vowel for consonant in "bcdfghklmnprstvz" for vowel in "aeiou"]
+
+
+def make_vocabulary(size: int, rng: np.random.Generator) -> list[str]:
+    words: dict[str, None] = {}  # Insertion ordered set, the rank of a word is its position
+    while len(words) < size:
+        syllable_count: int = int(rng.integers(2, 5))
+        words["".join(SYLLABLES[index] for index in rng.integers(0, len(SYLLABLES), syllable_count))] = None
+    return list(words)
+
+
+def generate_corpus(
+    documents: int = 200,
+    words_per_document: int = 400,
+    words_per_sentence: int = 15,
+    sentences_per_paragraph: int = 5,
+    vocabulary_size: int = 5000,
+    zipf_skew: float = 1.1,
+    seed: int = 0,
+) -> list[str]:
+    """Texts of about `words_per_document` words, words drawn with probability `1 / rank ** zipf_skew`."""
+    rng: np.random.Generator = np.random.default_rng(seed)
+    vocabulary: list[str] = make_vocabulary(size=vocabulary_size, rng=rng)
+    weights: np.ndarray = 1.0 / np.arange(1, vocabulary_size + 1) ** zipf_skew
+    probabilities: np.ndarray = weights / weights.sum()
+
+    texts: list[str] = []
+    for _ in range(documents):
+        paragraphs: list[str] = []
+        sentences: list[str] = []
+        word_count: int = 0
+        while word_count < words_per_document:
+            length: int = max(3, int(rng.poisson(words_per_sentence)))
+            words: list[str] = [
+                vocabulary[index] for index in rng.choice(vocabulary_size, length, p=probabilities)
+            ]
+            sentences.append(" ".join(words).capitalize() + ".")
+            word_count += length
+            if len(sentences) == sentences_per_paragraph:
+                paragraphs.append(" ".join(sentences))
+                sentences = []
+        if sentences:
+            paragraphs.append(" ".join(sentences))
+        texts.append("\n\n".join(paragraphs) + "\n")
+    return texts
+
+
+def write_corpus(directory: str, texts: Iterable[str]) -> list[str]:
+    paths: list[str] = []
+    for index, text in enumerate(texts):
+        path: str = os.path.join(directory, f"document-{index:05d}.txt")
+        with open(path, "w") as file:
+            file.write(text)
+        paths.append(path)
+    return paths
+
+
+def corpus_hash(texts: Iterable[str]) -> str:
+    """Identifies the corpus in stored results, results of different corpora are not comparable."""
+    content_hash = hashlib.sha256()
+    for text in texts:
+        content_hash.update(hashlib.sha256(text.encode("utf-8")).digest())
+    return content_hash.hexdigest()[:16]
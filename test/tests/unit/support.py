@@ -0,0 +1,32 @@
+from unittest import skipUnless
+
+import nltk
+
+
+def nltk_data_available() -> bool:
+    for resource in (
+        "corpora/stopwords",
+        "corpora/wordnet",
+        "taggers/averaged_perceptron_tagger",
+    ):
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            return False
+    return True
+
+
+# Tests running the whole pipeline need the NLTK corpora and models on disk
+requires_nltk_data = skipUnless(nltk_data_available(), "NLTK data is not installed")
+
+
+class FakeClock:
+    """Clock for injectable `clock` parameters, every reading advances it by `step` seconds."""
+
+    def __init__(self, step: float) -> None:
+        self.time: float = 0.0
+        self.step: float = step
+
+    def __call__(self) -> float:
+        self.time += self.step
+        return self.time
@@ -0,0 +1,72 @@
+from unittest import TestCase
+
+# Test class
+from keyword_extractor import KeywordExtractor
+from utils import LRUCache
+from support import requires_nltk_data
+
+with open("./assets/dummy-text.txt", "r") as file:
+    TEST_TEXT: str = file.read()
+
+
+class TestLRUCache(TestCase):
+    def test_get_counts_hits_and_misses(self):
+        # Setup
+        cache: LRUCache = LRUCache(max_size=2)
+        cache.put("web", 0)
+
+        # Asserts
+        self.assertEqual(0, cache.get("web"))
+        self.assertIsNone(cache.get("server"))
+        self.assertEqual({"hits": 1, "misses": 1, "size": 1, "max_size": 2}, cache.info())
+
+    def test_least_recently_used_entry_is_evicted(self):
+        # Setup
+        cache: LRUCache = LRUCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        # Asserts
+        self.assertEqual(2, len(cache))
+        self.assertEqual(1, cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(3, cache.get("c"))
+
+    def test_unbounded_cache_keeps_everything(self):
+        # Setup
+        cache: LRUCache = LRUCache(max_size=None)
+        for index in range(1000):
+            cache.put(index, index)
+
+        # Asserts
+        self.assertEqual(1000, len(cache))
+
+
+class TestPipelineCaches(TestCase):
+    @requires_nltk_data
+    def test_caches_are_reused_across_texts(self):
+        # Setup
+        keyword_extractor: KeywordExtractor = KeywordExtractor(txt=TEST_TEXT, method="pr")
+        first = keyword_extractor.extract()
+        misses: int = keyword_extractor.cache_info()["lemma"]["misses"]
+        second = keyword_extractor.extract()
+        cache_info = keyword_extractor.cache_info()
+
+        # Asserts
+        self.assertEqual(first["keywords"], second["keywords"])
+        self.assertEqual(misses, cache_info["lemma"]["misses"])
+        self.assertGreater(cache_info["lemma"]["hits"], 0)
+        self.assertGreater(cache_info["stem"]["hits"], 0)
+
+    @requires_nltk_data
+    def test_small_caches_give_the_same_keywords(self):
+        # Setup
+        unbounded = KeywordExtractor(txt=TEST_TEXT, method="pr", cache_size=None).extract()
+        bounded_extractor: KeywordExtractor = KeywordExtractor(txt=TEST_TEXT, method="pr", cache_size=8)
+        bounded = bounded_extractor.extract()
+
+        # Asserts
+        self.assertEqual(unbounded["keywords"], bounded["keywords"])
+        self.assertEqual(8, bounded_extractor.cache_info()["lemma"]["size"])
@@ -0,0 +1,41 @@
+from collections import Counter
+from unittest import TestCase
+
+# Test class
+from utils import DeltaCounts
+
+PARTS: dict[str, dict[str, int]] = {
+    "a": {"web": 2, "server": 1},
+    "b": {"server": 3, "client": 1},
+    "c": {"client": 2},
+}
+
+
+class TestDeltaCounts(TestCase):
+    def test_counts_are_the_sum_of_the_current_parts(self):
+        # Setup
+        delta_counts: DeltaCounts = DeltaCounts()
+        for keys in [["a", "b"], ["a", "c", "c"], ["b"], ["c", "a", "b", "a"], []]:
+            delta_counts.update(keys=keys, counts_of=PARTS.__getitem__)
+            expected: Counter = Counter()
+            for key in keys:
+                expected.update(PARTS[key])
+
+            # Asserts
+            self.assertEqual(dict(expected), delta_counts.counts)
+
+    def test_counts_of_unchanged_parts_are_not_requested_again(self):
+        # Setup
+        requested: list[str] = []
+
+        def counts_of(key: str) -> dict[str, int]:
+            requested.append(key)
+            return PARTS[key]
+
+        delta_counts: DeltaCounts = DeltaCounts()
+        delta_counts.update(keys=["a", "b"], counts_of=counts_of)
+        changed: int = delta_counts.update(keys=["b", "a", "c"], counts_of=counts_of)
+
+        # Asserts
+        self.assertEqual(["a", "b", "c"], requested)
+        self.assertEqual(1, changed)
@@ -0,0 +1,284 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+
+# Test class
+from keyword_extractor import KeywordExtractorDirectory, _read_shard, _write_json_lines, merge_shards
+from support import requires_nltk_data
+
+TEST_DIRECTORY: str = "./assets/test"
+
+
+class TestKeywordExtractorDirectory(TestCase):
+    def test_scan_directory_finds_nested_files(self):
+        # Setup
+        directory = KeywordExtractorDirectory(directory=TEST_DIRECTORY, method="wf")
+
+        # Asserts
+        self.assertEqual(3, len(directory._scan_directory()))
+        self.assertIn("./assets/test/foo/dummy-text.txt", directory._scan_directory())
+        self.assertEqual(sorted(directory._scan_directory()), directory._scan_directory())
+
+    @requires_nltk_data
+    def test_parallel_extraction_matches_sequential(self):
+        for method in ["wf", "tfidf", "pr"]:
+            # Setup
+            sequential = KeywordExtractorDirectory(directory=TEST_DIRECTORY, method=method).extract()
+            parallel = KeywordExtractorDirectory(directory=TEST_DIRECTORY, method=method, workers=2).extract()
+
+            # Asserts
+            self.assertEqual(list(sequential.keys()), list(parallel.keys()))
+            self.assertEqual(sequential, parallel)
+
+    @requires_nltk_data
+    def test_unordered_parallel_extraction_returns_every_file(self):
+        # Setup
+        sequential = KeywordExtractorDirectory(directory=TEST_DIRECTORY, method="wf").extract()
+        unordered = KeywordExtractorDirectory(
+            directory=TEST_DIRECTORY, method="wf", workers=2, ordered=False
+        ).extract()
+
+        # Asserts
+        self.assertEqual(sorted(sequential.keys()), sorted(unordered.keys()))
+        for path, result in sequential.items():
+            self.assertEqual(result, unordered[path])
+
+    @requires_nltk_data
+    def test_empty_files_give_empty_results(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for name, content in [("a.txt", "web servers serve the web"), ("b.txt", ""), ("c.txt", " \n")]:
+                with open(os.path.join(directory, name), "w") as file:
+                    file.write(content)
+            for method, options in [
+                ("wf", {}),
+                ("tfidf", {"detail": "scores"}),
+                ("pr", {"deduplicate": 0.8}),
+                ("wf", {"chunk_size": 100}),
+            ]:
+                # Setup
+                results = KeywordExtractorDirectory(directory=directory, method=method, **options).extract()
+
+                # Asserts
+                self.assertEqual(3, len(results))
+                self.assertEqual([], results[os.path.join(directory, "b.txt")]["keywords"])
+                self.assertEqual([], results[os.path.join(directory, "c.txt")]["keywords"])
+                self.assertNotEqual([], results[os.path.join(directory, "a.txt")]["keywords"])
+
+    @requires_nltk_data
+    def test_tf_idf_is_computed_against_the_whole_directory(self):
+        # Setup
+        result = KeywordExtractorDirectory(directory=TEST_DIRECTORY, method="tfidf").extract()
+
+        # Asserts
+        for file_result in result.values():
+            self.assertEqual("tfidf", file_result["extraction_method"])
+            self.assertEqual(10, len(file_result["keywords"]))
+            document_frequencies = file_result["file"]["tf_idf"]["document_frequencies"]
+            self.assertEqual({3}, set(document_frequencies.values()))
+
+    @requires_nltk_data
+    def test_iter_extract_yields_the_extract_results(self):
+        for workers in [1, 2]:
+            # Setup
+            directory = KeywordExtractorDirectory(directory=TEST_DIRECTORY, method="pr", workers=workers)
+
+            # Asserts
+            self.assertEqual(list(directory.extract().items()), list(directory.iter_extract()))
+
+
+class TestJsonLines(TestCase):
+    def test_every_result_is_one_line(self):
+        # Setup
+        results = [("a.txt", {"keywords": ["web"]}), ("b.txt", {"keywords": ["server", "client"]})]
+        with tempfile.TemporaryDirectory() as output:
+            _write_json_lines(results=iter(results), output=output, print_keywords=False)
+            with open(os.path.join(output, "keywords.jsonl"), "r") as file:
+                lines = [json.loads(line) for line in file]
+
+        # Asserts
+        self.assertEqual(
+            [{"path": "a.txt", "keywords": ["web"]}, {"path": "b.txt", "keywords": ["server", "client"]}],
+            lines,
+        )
+
+
+class TestShardedExtraction(TestCase):
+    def setUp(self):
+        # Files with different paragraphs of the dummy text, so document frequencies differ between words
+        with open("./assets/dummy-text.txt", "r") as file:
+            sentences = [sentence for sentence in file.read().split(". ") if sentence.strip()]
+        self.directory = tempfile.TemporaryDirectory()
+        for index in range(8):
+            path = os.path.join(self.directory.name, *(["nested"] if index % 3 == 0 else []), f"{index}.txt")
+            end = index + 4 + index % 3
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as file:
+                file.write(". ".join(sentences[index:end]) + ".")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    @requires_nltk_data
+    def test_merged_shards_of_separate_processes_equal_a_single_run(self):
+        for method in ["full", "tfidf"]:
+            # Setup
+            single = KeywordExtractorDirectory(directory=self.directory.name, method=method).extract()
+            with tempfile.TemporaryDirectory() as output:
+                processes = [
+                    subprocess.Popen(
+                        [sys.executable, "-c", "import keyword_extractor; keyword_extractor.run()"]
+                        + ["-d", self.directory.name, "-m", method, "-o", output, "--shard", f"{index}/3"],
+                        env={**os.environ, "PYTHONPATH": os.pathsep.join(path for path in sys.path if path)},
+                    )
+                    for index in range(3)
+                ]
+                return_codes = [process.wait() for process in processes]
+                merged = merge_shards(
+                    shards=[
+                        _read_shard(path=os.path.join(output, f"shard-{index}-of-3.json.gz"))
+                        for index in range(3)
+                    ]
+                )
+
+            # Asserts
+            self.assertEqual([0, 0, 0], return_codes)
+            self.assertEqual(json.dumps(single), json.dumps(merged))
+
+    @requires_nltk_data
+    def test_every_file_belongs_to_exactly_one_shard(self):
+        # Setup
+        directory = KeywordExtractorDirectory(directory=self.directory.name, method="wf", detail="keywords")
+        shards = [directory.extract_shard(index=index, count=3) for index in range(3)]
+        paths = [document["path"] for shard in shards for document in shard["documents"]]
+
+        # Asserts
+        self.assertEqual(sorted(directory._scan_directory()), sorted(paths))
+        self.assertEqual(directory.extract(), merge_shards(shards=reversed(shards)))
+
+    @requires_nltk_data
+    def test_incomplete_or_mismatching_shards_are_rejected(self):
+        # Setup
+        directory = KeywordExtractorDirectory(
+            directory=self.directory.name, method="tfidf", detail="keywords"
+        )
+        shards = [directory.extract_shard(index=index, count=2) for index in range(2)]
+        other = KeywordExtractorDirectory(
+            directory=self.directory.name, method="tfidf", detail="keywords", max_keywords=5
+        ).extract_shard(index=1, count=2)
+        deduplicated = KeywordExtractorDirectory(
+            directory=self.directory.name, method="tfidf", detail="keywords", deduplicate=0.9
+        ).extract_shard(index=1, count=2)
+
+        # Asserts
+        with self.assertRaises(ValueError):
+            merge_shards(shards=shards[:1])
+        with self.assertRaises(ValueError):
+            merge_shards(shards=[shards[0], shards[0]])
+        with self.assertRaises(ValueError):
+            merge_shards(shards=[shards[0], other])
+        with self.assertRaises(ValueError):
+            merge_shards(shards=[shards[0], deduplicated])
+        with self.assertRaises(ValueError):
+            directory.extract_shard(index=2, count=2)
+
+
+class TestDeduplication(TestCase):
+    def setUp(self):
+        with open("./assets/dummy-text.txt", "r") as file:
+            text = file.read()
+        paragraphs = [paragraph for paragraph in text.split("\n") if paragraph]
+        self.directory = tempfile.TemporaryDirectory()
+        files = {
+            "a.txt": text,
+            "b.txt": "\n".join(paragraphs[:3]),
+            "c.txt": text,  # Exact copy
+            "d.txt": text.replace("dynamic", "interactive", 1) + "\nShare this page.\n",  # Near duplicate
+            "e.txt": "\n".join(paragraphs[3:]),
+        }
+        for name, content in files.items():
+            with open(os.path.join(self.directory.name, name), "w") as file:
+                file.write(content)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    @requires_nltk_data
+    def test_duplicates_get_the_result_of_the_extracted_file(self):
+        for workers, ordered in [(1, True), (2, False)]:
+            # Setup
+            directory = KeywordExtractorDirectory(
+                directory=self.directory.name, method="pr", workers=workers, ordered=ordered, deduplicate=0.8
+            )
+            results = directory.extract()
+            scan_order = list(directory._iter_paths())
+
+            # Asserts
+            self.assertEqual(sorted(scan_order), sorted(results))
+            if ordered:
+                self.assertEqual(scan_order, list(results))
+            self.assertNotIn("duplicate_of", results[self.path("a.txt")])
+            for path in [self.path("c.txt"), self.path("d.txt")]:
+                self.assertEqual(self.path("a.txt"), results[path]["duplicate_of"])
+                self.assertGreaterEqual(results[path]["similarity"], 0.8)
+                self.assertEqual(results[self.path("a.txt")]["keywords"], results[path]["keywords"])
+            self.assertNotIn("duplicate_of", results[self.path("b.txt")])
+            self.assertNotIn("duplicate_of", results[self.path("e.txt")])
+            self.assertEqual(
+                {"documents": 5, "extracted": 3, "duplicates": 2, "exact_duplicates": 1, "groups": 1},
+                {
+                    key: directory.deduplication[key]
+                    for key in ["documents", "extracted", "duplicates", "exact_duplicates", "groups"]
+                },
+            )
+
+    @requires_nltk_data
+    def test_exact_duplicates_keep_the_results_of_a_full_extraction(self):
+        # Setup
+        os.remove(self.path("d.txt"))
+        expected = KeywordExtractorDirectory(directory=self.directory.name, method="tfidf").extract()
+        results = KeywordExtractorDirectory(
+            directory=self.directory.name, method="tfidf", deduplicate=0.9
+        ).extract()
+
+        # Asserts
+        self.assertEqual(1.0, results[self.path("c.txt")].pop("similarity"))
+        self.assertEqual(self.path("a.txt"), results[self.path("c.txt")].pop("duplicate_of"))
+        self.assertEqual(json.dumps(expected), json.dumps(results))
+
+    @requires_nltk_data
+    def test_near_duplicates_keep_their_own_text(self):
+        # Setup
+        with open(self.path("a.txt"), "r") as file:
+            near_duplicate = file.read() + "\nShare this page.\n"
+        for name in ["d.txt", "f.txt"]:  # A near duplicate and its copy
+            with open(self.path(name), "w") as file:
+                file.write(near_duplicate)
+        results = KeywordExtractorDirectory(
+            directory=self.directory.name, method="wf", deduplicate=0.8
+        ).extract()
+
+        # Asserts
+        for name in ["d.txt", "f.txt"]:
+            with open(self.path(name)) as file:
+                text = file.read()
+            self.assertEqual(self.path("a.txt"), results[self.path(name)]["duplicate_of"])
+            self.assertEqual(results[self.path("a.txt")]["keywords"], results[self.path(name)]["keywords"])
+            self.assertEqual(text, results[self.path(name)]["text"])
+            self.assertEqual(text.lower(), results[self.path(name)]["file"]["text"])
+            self.assertIsNone(results[self.path(name)]["file"]["tokens"])
+            self.assertEqual(self.path("a.txt"), results[self.path(name)]["file"]["inherited_from"])
+        self.assertNotIn("inherited_from", results[self.path("a.txt")]["file"])
+        self.assertEqual(
+            results[self.path("a.txt")],
+            {
+                key: value
+                for key, value in results[self.path("c.txt")].items()
+                if key not in ["duplicate_of", "similarity"]
+            },
+        )
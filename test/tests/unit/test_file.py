@@ -0,0 +1,205 @@
+from array import array
+from unittest import TestCase
+from unittest.mock import patch
+
+# Test class
+from keyword_extractor import KeywordExtractor
+from utils import File, MetricStage, Tokenizer, Vocabulary
+from support import requires_nltk_data
+
+TEST_TEXT: str = "the web is big. servers serve the web!\nusers browse"
+
+with open("./assets/dummy-text.txt", "r") as file:
+    DUMMY_TEXT: str = file.read()
+
+
+class TestVocabulary(TestCase):
+    def test_intern_returns_stable_consecutive_ids(self):
+        # Setup
+        vocabulary: Vocabulary = Vocabulary()
+        ids = vocabulary.intern_many(["web", "server", "web"])
+
+        # Asserts
+        self.assertEqual(array("I", [0, 1, 0]), ids)
+        self.assertEqual(2, len(vocabulary))
+        self.assertEqual(1, vocabulary.intern("server"))
+        self.assertEqual(["web", "server"], vocabulary.words([0, 1]))
+        self.assertIsNone(vocabulary.get("user"))
+
+
+class TestFile(TestCase):
+    def set_up_file(self) -> None:
+        self.vocabulary: Vocabulary = Vocabulary()
+        self.file: File = File(vocabulary=self.vocabulary)
+        self.file.add_text(txt=TEST_TEXT)
+        self.file.add_tokens(*Tokenizer().text_to_ids(txt=TEST_TEXT, vocabulary=self.vocabulary))
+
+    def test_file_uses_slots(self):
+        # Setup
+        self.set_up_file()
+
+        # Asserts
+        self.assertFalse(hasattr(self.file, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.file.tokens = {}  # type: ignore[attr-defined]
+
+    def test_tokens_are_stored_as_ids_with_offsets(self):
+        # Setup
+        self.set_up_file()
+
+        # Asserts
+        self.assertEqual("I", self.file.get_ids(metric_type="tokens").typecode)
+        self.assertEqual(array("I", [0, 4, 8, 10]), self.file.get_offsets(metric_type="tokens"))
+        self.assertEqual(array("I", [0, 2, 3]), self.file.paragraph_offsets)
+
+    def test_token_views_are_decoded_like_the_tokenizer_output(self):
+        # Setup
+        self.set_up_file()
+        tokenizer: Tokenizer = Tokenizer()
+        paragraphs = tokenizer.text_to_paragraphs(txt=TEST_TEXT)
+        sentences = tokenizer.sentences_per_paragraph_to_sentences(
+            sentences_per_paragraph=tokenizer.paragraphs_to_sentences_per_paragraph(paragraphs=paragraphs)
+        )
+        words_per_sentence = tokenizer.sentences_to_words_per_sentence(sentences=sentences)
+
+        # Asserts
+        self.assertEqual(paragraphs, self.file.get_metric(metric_type="tokens", key="paragraphs"))
+        self.assertEqual(sentences, self.file.get_metric(metric_type="tokens", key="sentences"))
+        self.assertEqual(
+            words_per_sentence, self.file.get_metric(metric_type="tokens", key="words_per_sentence")
+        )
+        self.assertEqual(
+            ["the", "web", "is", "big", "servers", "serve", "users", "browse"],
+            self.file.get_metric(metric_type="tokens", key="duplicate_free_words"),
+        )
+
+    def test_text_views_tokenize_the_text_at_most_once(self):
+        # Setup
+        self.set_up_file()
+        with patch.object(Tokenizer, "tokenize", wraps=Tokenizer.tokenize) as tokenize:
+            self.file.as_dict()
+            self.file.as_dict()
+        spans_file: File = File(vocabulary=self.vocabulary)
+        spans_file.add_text(txt=TEST_TEXT)
+        spans_file.add_tokens(
+            *Tokenizer().text_to_ids(txt=TEST_TEXT, vocabulary=self.vocabulary),
+            tokenized_text=Tokenizer.tokenize(txt=TEST_TEXT),
+        )
+        with patch.object(Tokenizer, "tokenize", wraps=Tokenizer.tokenize) as spans_tokenize:
+            tokens = spans_file.as_dict()["tokens"]
+
+        # Asserts
+        self.assertEqual(1, tokenize.call_count)
+        self.assertEqual(0, spans_tokenize.call_count)
+        self.assertEqual(["the web is big. servers serve the web!", "users browse"], tokens["paragraphs"])
+        self.assertEqual(
+            [["the web is big", "servers serve the web"], ["users browse"]], tokens["sentences_per_paragraph"]
+        )
+
+    def test_pos_views_pair_words_with_tags(self):
+        # Setup
+        self.set_up_file()
+        tags = self.file.pos_tags.intern_many(["DT", "n", "v", "a", "n", "v", "DT", "n", "n", "v"])
+        self.file.add_pos(pos_ids=tags)
+
+        # Asserts
+        self.assertEqual(
+            [("users", "n"), ("browse", "v")],
+            self.file.get_metric(metric_type="pos", key="words_per_sentence")[2],
+        )
+
+    def test_metrics_are_decoded_unless_disabled(self):
+        # Setup
+        self.set_up_file()
+        self.file.add_metric(metric_type="word_frequency", key="word_counts", value={1: 2, 4: 1})
+        self.file.add_metric(metric_type="word_frequency", key="raw_file_length", value=9)
+
+        # Asserts
+        self.assertEqual(
+            {"web": 2, "servers": 1}, self.file.get_metric(metric_type="word_frequency", key="word_counts")
+        )
+        self.assertEqual(
+            {1: 2, 4: 1}, self.file.get_metric(metric_type="word_frequency", key="word_counts", decode=False)
+        )
+        self.assertEqual(9, self.file.get_metric(metric_type="word_frequency", key="raw_file_length"))
+
+    def test_as_dict_keeps_missing_metrics_empty(self):
+        # Setup
+        self.set_up_file()
+        result = self.file.as_dict()
+
+        # Asserts
+        self.assertEqual(TEST_TEXT, result["text"])
+        self.assertEqual(["the", "web", "is", "big"], result["tokens"]["words_per_sentence"][0])
+        self.assertIsNone(result["lemma"])
+        self.assertIsNone(result["page_rank"])
+
+
+class TestLazyFile(TestCase):
+    def set_up_lazy_file(self) -> None:
+        self.calls: list[str] = []
+
+        def compute_tokens(file: File) -> None:
+            self.calls.append("tokens")
+            file.add_tokens(*Tokenizer().text_to_ids(txt=file.get_text(), vocabulary=file.vocabulary))
+
+        def compute_word_frequency(file: File) -> None:
+            self.calls.append("word_frequency")
+            file.add_metric(
+                metric_type="word_frequency",
+                key="raw_file_length",
+                value=len(file.get_ids(metric_type="tokens")),
+            )
+
+        self.file: File = File(
+            stages={
+                "tokens": MetricStage(dependencies=[], compute=compute_tokens),
+                "word_frequency": MetricStage(dependencies=["tokens"], compute=compute_word_frequency),
+            }
+        )
+        self.file.add_text(txt=TEST_TEXT)
+
+    def test_stages_run_on_first_access_with_their_dependencies(self):
+        # Setup
+        self.set_up_lazy_file()
+
+        # Asserts
+        self.assertEqual([], self.file.computed_stages)
+        self.assertEqual(10, self.file.get_metric(metric_type="word_frequency", key="raw_file_length"))
+        self.assertEqual(["tokens", "word_frequency"], self.file.computed_stages)
+
+    def test_stages_are_memoized(self):
+        # Setup
+        self.set_up_lazy_file()
+        self.file.get_metric(metric_type="word_frequency", key="raw_file_length")
+        self.file.get_metric(metric_type="tokens", key="words")
+        self.file.get_ids(metric_type="tokens")
+
+        # Asserts
+        self.assertEqual(["tokens", "word_frequency"], self.calls)
+
+    def test_as_dict_does_not_run_stages(self):
+        # Setup
+        self.set_up_lazy_file()
+        result = self.file.as_dict()
+
+        # Asserts
+        self.assertIsNone(result["tokens"])
+        self.assertEqual([], self.file.computed_stages)
+
+    @requires_nltk_data
+    def test_methods_only_run_the_stages_they_consume(self):
+        # Setup
+        keyword_extractor: KeywordExtractor = KeywordExtractor(txt=DUMMY_TEXT)
+        word_frequency_file: File = keyword_extractor._extract_with_word_frequency()[1]
+        page_rank_file: File = keyword_extractor._extract_with_page_rank()[1]
+
+        # Asserts
+        self.assertEqual(
+            ["tokens", "pos", "lemma", "stop_word_free", "word_frequency"],
+            word_frequency_file.computed_stages,
+        )
+        self.assertEqual(
+            ["tokens", "pos", "lemma", "stop_word_free", "stemmed", "page_rank"],
+            page_rank_file.computed_stages,
+        )
@@ -0,0 +1,434 @@
+import asyncio
+import tempfile
+from unittest import TestCase
+
+# Test class
+from keyword_extractor import KeywordExtractor, KeywordExtractorDirectory
+from utils import Tokenizer, iter_text_chunks
+from support import FakeClock, requires_nltk_data
+
+with open("./assets/dummy-text.txt", "r") as file:
+    TEST_TEXT: str = file.read()
+
+
+class TestOutputDetail(TestCase):
+    def test_unknown_detail_raises(self):
+        # Asserts
+        with self.assertRaises(ValueError):
+            KeywordExtractor(txt=TEST_TEXT, detail="everything")
+
+    def test_unknown_method_raises(self):
+        # Asserts
+        with self.assertRaises(ValueError):
+            KeywordExtractor(txt=TEST_TEXT, method="lda")
+        with self.assertRaises(ValueError):
+            KeywordExtractorDirectory(directory="./assets/test", method="lda")
+        with self.assertRaises(ValueError):
+            KeywordExtractor(txt="", method="wf").extract_many(texts=[TEST_TEXT], method="lda")
+
+    @requires_nltk_data
+    def test_keywords_detail_only_contains_keywords(self):
+        for method in ["wf", "tfidf", "pr"]:
+            # Setup
+            full = KeywordExtractor(txt=TEST_TEXT, method=method).extract()
+            slim = KeywordExtractor(txt=TEST_TEXT, method=method, detail="keywords").extract()
+
+            # Asserts
+            self.assertEqual({"extraction_method": method, "keywords": full["keywords"]}, slim)
+
+    @requires_nltk_data
+    def test_scores_detail_contains_the_score_of_every_keyword(self):
+        # Setup
+        full = KeywordExtractor(txt=TEST_TEXT, method="wf").extract()
+        result = KeywordExtractor(txt=TEST_TEXT, method="wf", detail="scores").extract()
+        term_frequencies: dict = full["file"]["word_frequency"]["term_frequencies"]
+
+        # Asserts
+        self.assertEqual(full["keywords"], list(result["scores"].keys()))
+        for keyword, score in result["scores"].items():
+            self.assertEqual(term_frequencies[keyword], score)
+
+    @requires_nltk_data
+    def test_directory_tf_idf_scores_are_corpus_scores(self):
+        # Setup
+        full = KeywordExtractorDirectory(directory="./assets/test", method="tfidf").extract()
+        slim = KeywordExtractorDirectory(directory="./assets/test", method="tfidf", detail="scores").extract()
+
+        # Asserts
+        for path, result in slim.items():
+            tf_idf: dict = full[path]["file"]["tf_idf"]["term_frequency_inverse_document_frequencies"]
+            self.assertEqual(["extraction_method", "keywords", "scores"], sorted(result.keys()))
+            self.assertEqual(full[path]["keywords"], result["keywords"])
+            self.assertEqual({keyword: tf_idf[keyword] for keyword in result["keywords"]}, result["scores"])
+
+
+class TestFullExtraction(TestCase):
+    @requires_nltk_data
+    def test_full_contains_the_keywords_of_every_method(self):
+        # Setup
+        keyword_extractor: KeywordExtractor = KeywordExtractor(txt=TEST_TEXT, method="full")
+        result = keyword_extractor.extract()
+        page_rank_extractor: KeywordExtractor = KeywordExtractor(txt=TEST_TEXT, method="pr")
+        page_rank_extractor.extract()
+
+        # Asserts
+        self.assertEqual("full", result["extraction_method"])
+        for method in ["wf", "tfidf", "pr"]:
+            expected = KeywordExtractor(txt=TEST_TEXT, method=method).extract()
+            self.assertEqual(expected["keywords"], result["keywords"][method])
+        # The text went through the base pipeline once, as in a single `pr` extraction
+        self.assertEqual(page_rank_extractor.cache_info(), keyword_extractor.cache_info())
+
+    @requires_nltk_data
+    def test_full_directory_extraction_scores_tf_idf_against_the_directory(self):
+        # Setup
+        tf_idf = KeywordExtractorDirectory(
+            directory="./assets/test", method="tfidf", detail="scores"
+        ).extract()
+        full = KeywordExtractorDirectory(directory="./assets/test", method="full", detail="scores").extract()
+
+        # Asserts
+        for path, result in full.items():
+            self.assertEqual(tf_idf[path]["keywords"], result["keywords"]["tfidf"])
+            self.assertEqual(tf_idf[path]["scores"], result["scores"]["tfidf"])
+            self.assertEqual(["pr", "tfidf", "wf"], sorted(result["scores"].keys()))
+
+
+class TestLargeFile(TestCase):
+    def test_chunks_end_after_a_line_break(self):
+        # Setup
+        chunks: list[str] = list(iter_text_chunks(path="./assets/dummy-text.txt", chunk_size=100))
+
+        # Asserts
+        self.assertEqual(TEST_TEXT, "".join(chunks))
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks[:-1]:
+            self.assertGreaterEqual(len(chunk.encode("utf-8")), 100)
+            self.assertTrue(chunk.endswith("\n"))
+
+    def test_line_breaks_are_translated_like_universal_newlines(self):
+        for line_break in ["\r", "\r\n"]:
+            # Setup
+            with tempfile.NamedTemporaryFile(mode="wb") as file:
+                file.write(TEST_TEXT.replace("\n", line_break).encode("utf-8"))
+                file.flush()
+                chunks: list[str] = list(iter_text_chunks(path=file.name, chunk_size=100))
+                with open(file.name, "r", encoding="utf-8") as text_file:
+                    text: str = text_file.read()
+
+            # Asserts
+            self.assertEqual(TEST_TEXT, text)
+            self.assertEqual(text, "".join(chunks))
+            self.assertGreater(len(chunks), 1)
+            for chunk in chunks[:-1]:
+                self.assertTrue(chunk.endswith("\n"))
+
+    @requires_nltk_data
+    def test_chunked_extraction_of_carriage_returns_matches_whole_file_extraction(self):
+        # Setup
+        with tempfile.NamedTemporaryFile(mode="wb") as file:
+            file.write(TEST_TEXT.replace("\n", "\r").encode("utf-8"))
+            file.flush()
+            result = KeywordExtractor(txt="", method="pr", detail="scores").extract_file(
+                path=file.name, chunk_size=500
+            )
+
+        # Asserts
+        self.assertEqual(KeywordExtractor(txt=TEST_TEXT, method="pr", detail="scores").extract(), result)
+
+    def test_empty_file_has_no_chunks(self):
+        # Setup
+        with tempfile.NamedTemporaryFile() as file:
+            chunks: list[str] = list(iter_text_chunks(path=file.name, chunk_size=100))
+
+        # Asserts
+        self.assertEqual([], chunks)
+
+    @requires_nltk_data
+    def test_chunked_extraction_matches_whole_text_extraction(self):
+        for method in ["wf", "tfidf", "pr", "full"]:
+            for chunk_size in [1, 500, 1_000_000]:
+                # Setup
+                expected = KeywordExtractor(txt=TEST_TEXT, method=method, detail="scores").extract()
+                result = KeywordExtractor(txt="", method=method, detail="scores").extract_file(
+                    path="./assets/dummy-text.txt", chunk_size=chunk_size
+                )
+
+                # Asserts
+                self.assertEqual(expected, result)
+
+    @requires_nltk_data
+    def test_directory_files_are_chunked_when_a_chunk_size_is_set(self):
+        # Setup
+        expected = KeywordExtractorDirectory(
+            directory="./assets/test", method="tfidf", detail="scores"
+        ).extract()
+        result = KeywordExtractorDirectory(
+            directory="./assets/test", method="tfidf", detail="scores", chunk_size=500
+        ).extract()
+
+        # Asserts
+        self.assertEqual(expected, result)
+
+
+class TestMaxKeywords(TestCase):
+    def test_max_keywords_must_be_positive(self):
+        # Asserts
+        with self.assertRaises(ValueError):
+            KeywordExtractor(txt=TEST_TEXT, max_keywords=0)
+
+    def test_equal_scores_keep_the_first_occurrence_first(self):
+        # Setup
+        keywords: list = KeywordExtractor._get_keywords(data={"b": 1, "a": 2, "c": 1, "d": 1}, max_length=3)
+
+        # Asserts
+        self.assertEqual(["a", "b", "c"], keywords)
+
+    @requires_nltk_data
+    def test_short_text_gives_fewer_keywords(self):
+        for method in ["wf", "tfidf", "pr"]:
+            # Setup
+            result = KeywordExtractor(
+                txt="Servers serve web pages.", method=method, detail="scores"
+            ).extract()
+
+            # Asserts
+            self.assertLess(len(result["keywords"]), 10)
+            self.assertEqual(set(result["keywords"]), set(result["scores"].keys()))
+
+    @requires_nltk_data
+    def test_max_keywords_limits_every_method(self):
+        for method in ["wf", "tfidf", "pr"]:
+            # Setup
+            expected = KeywordExtractor(txt=TEST_TEXT, method=method).extract()
+            result = KeywordExtractor(txt=TEST_TEXT, method=method, max_keywords=3).extract()
+
+            # Asserts
+            self.assertEqual(expected["keywords"][:3], result["keywords"])
+        full = KeywordExtractorDirectory(directory="./assets/test", method="full", max_keywords=3).extract()
+        for result in full.values():
+            self.assertEqual([3, 3, 3], [len(keywords) for keywords in result["keywords"].values()])
+
+
+class TestBatchExtraction(TestCase):
+    def test_unknown_executor_kind_raises(self):
+        # Asserts
+        with self.assertRaises(ValueError):
+            KeywordExtractor(txt=TEST_TEXT).executor(kind="gpu")
+
+    @requires_nltk_data
+    def test_extract_many_matches_single_extractions(self):
+        # Setup
+        texts: list[str] = [TEST_TEXT, "Servers serve web pages.", TEST_TEXT[:500]]
+        keyword_extractor: KeywordExtractor = KeywordExtractor(txt="", method="wf", detail="scores")
+        results: list[dict] = keyword_extractor.extract_many(texts=texts, method="pr")
+
+        # Asserts
+        self.assertEqual("wf", keyword_extractor.method)
+        for txt, result in zip(texts, results):
+            self.assertEqual(KeywordExtractor(txt=txt, method="pr", detail="scores").extract(), result)
+
+    @requires_nltk_data
+    def test_async_results_match_batch_results(self):
+        # Setup
+        texts: list[str] = [TEST_TEXT, "Servers serve web pages.", TEST_TEXT[:500]] * 3
+        keyword_extractor: KeywordExtractor = KeywordExtractor(txt=TEST_TEXT, method="pr", detail="scores")
+        expected: list[dict] = KeywordExtractor(txt="", method="pr", detail="scores").extract_many(
+            texts=texts
+        )
+
+        async def async_texts():
+            for txt in texts:
+                yield txt
+
+        async def extract_all() -> list:
+            results: list = [
+                await keyword_extractor.aextract(),
+                await keyword_extractor.aextract_many(texts=texts, max_pending=2),
+                await keyword_extractor.aextract_many(texts=async_texts()),
+            ]
+            for kind in ["thread", "process"]:
+                with keyword_extractor.executor(workers=2, kind=kind) as executor:
+                    results.append(await keyword_extractor.aextract_many(texts=texts, executor=executor))
+            return results
+
+        single, *batches = asyncio.run(extract_all())
+
+        # Asserts
+        self.assertEqual(expected[0], single)
+        for results in batches:
+            self.assertEqual(expected, results)
+
+    @requires_nltk_data
+    def test_async_errors_are_raised(self):
+        # Setup
+        keyword_extractor: KeywordExtractor = KeywordExtractor(txt="", method="wf")
+
+        # Asserts
+        with self.assertRaises(ValueError):
+            asyncio.run(keyword_extractor.aextract_many(texts=[TEST_TEXT, TEST_TEXT], method="lda"))
+
+
+class TestIncrementalExtraction(TestCase):
+    @requires_nltk_data
+    def test_updated_texts_give_the_results_of_a_new_extraction(self):
+        paragraphs: list[str] = [paragraph for paragraph in TEST_TEXT.split("\n") if paragraph]
+        edits: list[list[str]] = [
+            paragraphs,
+            [paragraphs[0], "Servers render pages for the client.", *paragraphs[2:]],  # Changed
+            [*paragraphs[:3], "Websites use JavaScript on the server.", *paragraphs[3:]],  # Inserted
+            paragraphs[:2] + paragraphs[4:],  # Removed
+            paragraphs + paragraphs[1:3],  # Repeated
+            list(reversed(paragraphs)),  # Moved
+        ]
+        for method in ["wf", "tfidf", "pr", "full"]:
+            # Setup
+            keyword_extractor: KeywordExtractor = KeywordExtractor(txt="", method=method, incremental=True)
+            for edit in edits:
+                txt: str = "\n".join(edit)
+                keyword_extractor.update_txt(new_txt=txt)
+
+                # Asserts
+                self.assertEqual(
+                    KeywordExtractor(txt=txt, method=method).extract(), keyword_extractor.extract()
+                )
+
+    @requires_nltk_data
+    def test_only_changed_paragraphs_are_extracted_again(self):
+        # Setup
+        paragraphs: list[str] = [paragraph for paragraph in TEST_TEXT.split("\n") if paragraph]
+        keyword_extractor: KeywordExtractor = KeywordExtractor(
+            txt=TEST_TEXT, method="pr", detail="keywords", incremental=True, profile=True
+        )
+        first: dict = keyword_extractor.extract()
+        keyword_extractor.update_txt(new_txt="\n".join([*paragraphs[:-1], "Servers render pages."]))
+        second: dict = keyword_extractor.extract()
+        keyword_extractor.reset()
+        third: dict = keyword_extractor.extract()
+
+        # Asserts
+        self.assertEqual(len(paragraphs), first["profile"]["pos"]["calls"])
+        self.assertEqual(1, second["profile"]["pos"]["calls"])
+        self.assertEqual(1, second["profile"]["stemmed"]["calls"])
+        self.assertEqual(len(paragraphs), third["profile"]["pos"]["calls"])
+
+
+class TestTimeBudget(TestCase):
+    def test_time_budget_must_be_positive(self):
+        # Asserts
+        with self.assertRaises(ValueError):
+            KeywordExtractor(txt=TEST_TEXT, time_budget_ms=0)
+
+    @requires_nltk_data
+    def test_ample_budget_gives_the_unbudgeted_result(self):
+        # Setup
+        expected: dict = KeywordExtractor(txt=TEST_TEXT, method="full", detail="scores").extract()
+        result: dict = KeywordExtractor(
+            txt=TEST_TEXT, method="full", detail="scores", time_budget_ms=1000, clock=FakeClock(step=1.0e-6)
+        ).extract()
+        budget: dict = result.pop("budget")
+
+        # Asserts
+        self.assertEqual(expected, result)
+        self.assertEqual({}, budget["degradations"])
+        self.assertLess(budget["residual"], 1.0e-3)
+        self.assertLess(budget["elapsed_ms"], 1000)
+        self.assertFalse(budget["exceeded"])
+
+    @requires_nltk_data
+    def test_page_rank_stops_at_the_deadline(self):
+        # Setup
+        # Every clock reading takes 1 ms, page rank reads it once per iteration and never converges
+        result: dict = KeywordExtractor(
+            txt=TEST_TEXT,
+            method="pr",
+            tolerance=0.0,
+            max_iterations=10_000,
+            time_budget_ms=100,
+            clock=FakeClock(step=0.001),
+        ).extract()
+        budget: dict = result["budget"]
+
+        # Asserts
+        # The full detail doesn't fit in after page rank used up the budget
+        self.assertEqual(["stopped_early", "scores_detail"], list(budget["degradations"].keys()))
+        self.assertLess(budget["degradations"]["stopped_early"]["iterations"], 100)
+        self.assertGreater(budget["residual"], 0.0)
+        self.assertGreaterEqual(budget["elapsed_ms"], 100)
+        self.assertTrue(budget["exceeded"])
+        self.assertEqual(10, len(result["keywords"]))
+
+    @requires_nltk_data
+    def test_expired_budget_samples_paragraphs_and_ranks_by_word_frequency(self):
+        # Setup
+        # The first clock reading after the start is already past the deadline
+        result: dict = KeywordExtractor(
+            txt=TEST_TEXT, method="pr", time_budget_ms=100, clock=FakeClock(step=1.0)
+        ).extract()
+        budget: dict = result["budget"]
+        paragraphs: list[str] = Tokenizer.text_to_paragraphs(txt=TEST_TEXT)
+
+        # Asserts
+        self.assertEqual(
+            ["sampled_paragraphs", "word_frequency", "scores_detail"], list(budget["degradations"].keys())
+        )
+        self.assertEqual(
+            {"paragraphs": len(paragraphs), "kept": 1}, budget["degradations"]["sampled_paragraphs"]
+        )
+        self.assertNotIn("file", result)
+        self.assertEqual(set(result["keywords"]), set(result["scores"]))
+        self.assertIsNone(budget["residual"])
+        self.assertTrue(budget["exceeded"])
+        self.assertEqual(
+            KeywordExtractor(txt=paragraphs[0], method="wf").extract()["keywords"], result["keywords"]
+        )
+
+    @requires_nltk_data
+    def test_expired_budget_samples_the_sentences_of_one_paragraph(self):
+        # Setup
+        txt: str = " ".join(Tokenizer.text_to_paragraphs(txt=TEST_TEXT))
+        result: dict = KeywordExtractor(
+            txt=txt, method="wf", detail="scores", time_budget_ms=100, clock=FakeClock(step=1.0)
+        ).extract()
+        sentences: list[str] = Tokenizer.tokenize(txt=txt).sentences()
+
+        # Asserts
+        self.assertEqual(["sampled_sentences"], list(result["budget"]["degradations"].keys()))
+        self.assertEqual(
+            {"sentences": len(sentences), "kept": 1}, result["budget"]["degradations"]["sampled_sentences"]
+        )
+        self.assertEqual(
+            KeywordExtractor(txt=sentences[0], method="wf").extract()["keywords"], result["keywords"]
+        )
+
+    @requires_nltk_data
+    def test_full_detail_falls_back_to_scores_if_it_does_not_fit(self):
+        # Setup
+        expected: dict = KeywordExtractor(txt=TEST_TEXT, method="wf", detail="scores").extract()
+        keyword_extractor: KeywordExtractor = KeywordExtractor(
+            txt=TEST_TEXT, method="wf", time_budget_ms=1000, clock=FakeClock(step=1.0e-6)
+        )
+        keyword_extractor._costs["result"] = 1.0  # A second per token
+        result: dict = keyword_extractor.extract()
+        budget: dict = result.pop("budget")
+
+        # Asserts
+        self.assertEqual(["scores_detail"], list(budget["degradations"].keys()))
+        self.assertEqual(expected, result)
+        self.assertFalse(budget["exceeded"])
+
+    @requires_nltk_data
+    def test_graph_is_capped_to_the_edges_that_fit_the_budget(self):
+        # Setup
+        keyword_extractor: KeywordExtractor = KeywordExtractor(
+            txt=TEST_TEXT, method="pr", detail="scores", time_budget_ms=100, clock=FakeClock(step=1.0e-6)
+        )
+        keyword_extractor._costs["edge"] = 1.0e-5  # 100 ms fit 1000 edges in 10 iterations
+        result: dict = keyword_extractor.extract()
+        capped_graph: dict = result["budget"]["degradations"]["capped_graph"]
+
+        # Asserts
+        self.assertEqual(["capped_graph"], list(result["budget"]["degradations"].keys()))
+        self.assertGreater(capped_graph["edges"], 1000)
+        self.assertLess(capped_graph["kept"], capped_graph["nodes"])
+        self.assertEqual(10, len(result["keywords"]))
@@ -0,0 +1,80 @@
+import re
+import zlib
+from unittest import TestCase
+
+import numpy as np
+
+# Test class
+from utils import MinHash, MinHashLSH
+
+with open("./assets/dummy-text.txt", "r") as file:
+    TEST_TEXT: str = file.read()
+
+
+def shingles(txt: str, size: int = 5) -> set[tuple[str, ...]]:
+    words: list[str] = re.findall(r"\w+", txt.lower())
+    return {tuple(words[start:end]) for start, end in enumerate(range(size, len(words) + 1))}
+
+
+class TestMinHash(TestCase):
+    def test_similarity_estimates_the_jaccard_similarity_of_the_shingles(self):
+        # Setup
+        minhash: MinHash = MinHash(permutations=256)
+        edited: str = TEST_TEXT.replace("JavaScript", "TypeScript", 2).replace("web", "internet", 3)
+        expected: float = len(shingles(TEST_TEXT) & shingles(edited)) / len(
+            shingles(TEST_TEXT) | shingles(edited)
+        )
+        similarity: float = MinHash.similarity(
+            minhash.signature(txt=TEST_TEXT), minhash.signature(txt=edited)
+        )
+
+        # Asserts
+        self.assertAlmostEqual(expected, similarity, delta=0.1)
+
+    def test_signatures_only_depend_on_the_words(self):
+        # Setup
+        signature = MinHash().signature(txt=TEST_TEXT)
+
+        # Asserts
+        self.assertEqual(signature.tolist(), MinHash().signature(txt=TEST_TEXT.upper() + "\n\n").tolist())
+        self.assertIsNone(MinHash().signature(txt=" ... "))
+
+    def test_permutations_do_not_wrap_around_for_the_largest_coefficients(self):
+        # Setup
+        minhash: MinHash = MinHash(permutations=2)
+        minhash._a = np.array([(1 << 32) - 1, 3], dtype=np.uint64)
+        minhash._b = np.array([(1 << 32) - 1, 0], dtype=np.uint64)
+        words: list[str] = re.findall(r"\w+", TEST_TEXT.lower())
+        word_hashes: list[int] = [zlib.crc32(word.encode("utf-8")) for word in words]
+        shingle_hashes: set[int] = set()
+        for start, end in enumerate(range(5, len(words) + 1)):
+            shingle_hash: int = 0
+            for word_hash in word_hashes[start:end]:
+                shingle_hash = (shingle_hash * 1_000_003 + word_hash) % (1 << 32)
+            shingle_hashes.add(shingle_hash)
+        # Exact integers, without any limit of their size
+        expected: list[int] = [
+            min(((a * x + b) % ((1 << 61) - 1)) % (1 << 32) for x in shingle_hashes)
+            for a, b in zip(minhash._a.tolist(), minhash._b.tolist())
+        ]
+
+        # Asserts
+        self.assertEqual(expected, minhash.signature(txt=TEST_TEXT).tolist())
+
+
+class TestMinHashLSH(TestCase):
+    def test_query_finds_near_duplicates_only(self):
+        # Setup
+        minhash: MinHash = MinHash()
+        paragraphs: list[str] = [paragraph for paragraph in TEST_TEXT.split("\n") if paragraph]
+        index: MinHashLSH = MinHashLSH(threshold=0.8)
+        index.insert(key="text", signature=minhash.signature(txt=TEST_TEXT))
+        index.insert(key="paragraph", signature=minhash.signature(txt=paragraphs[1]))
+
+        # Asserts
+        self.assertEqual(
+            ["text"], [key for key, _ in index.query(signature=minhash.signature(txt=TEST_TEXT + " Thanks."))]
+        )
+        self.assertEqual([], index.query(signature=minhash.signature(txt=paragraphs[2])))
+        with self.assertRaises(ValueError):
+            MinHashLSH(threshold=0.0)
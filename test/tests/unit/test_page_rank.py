@@ -0,0 +1,183 @@
+import argparse
+import importlib.util
+from typing import Iterator
+from unittest import TestCase, skipUnless
+
+import numpy as np
+
+# Test class
+from keyword_extractor import KeywordExtractor, _window_size_argument
+from utils import adjacency_from_edge_keys, cap_graph, cooccurrence_matrix, edge_keys, page_rank
+from support import requires_nltk_data
+
+NETWORKX_AVAILABLE: bool = importlib.util.find_spec("networkx") is not None
+
+with open("./assets/dummy-text.txt", "r") as file:
+    TEST_TEXT: str = file.read()
+
+
+def build_sentences(sentences: list[list[int]]) -> tuple[np.ndarray, np.ndarray]:
+    ids: list[int] = [word for sentence in sentences for word in sentence]
+    offsets: list[int] = [0]
+    for sentence in sentences:
+        offsets.append(offsets[-1] + len(sentence))
+    return np.array(ids, dtype=np.int64), np.array(offsets, dtype=np.int64)
+
+
+class TestCooccurrenceMatrix(TestCase):
+    def test_sentences_are_cliques_without_window(self):
+        # Setup
+        ids, offsets = build_sentences([[0, 1, 2, 1], [3]])
+        adjacency = cooccurrence_matrix(ids=ids, offsets=offsets, node_count=4)
+
+        # Asserts
+        self.assertEqual(
+            [[0, 1, 1, 0], [1, 0, 1, 0], [1, 1, 0, 0], [0, 0, 0, 0]], adjacency.toarray().tolist()
+        )
+
+    def test_window_connects_only_close_words(self):
+        # Setup
+        ids, offsets = build_sentences([[0, 1, 2, 3], [3, 0]])
+        adjacency = cooccurrence_matrix(ids=ids, offsets=offsets, node_count=4, window_size=2)
+
+        # Asserts
+        self.assertEqual(
+            [[0, 1, 0, 1], [1, 0, 1, 0], [0, 1, 0, 1], [1, 0, 1, 0]], adjacency.toarray().tolist()
+        )
+
+    def test_windows_below_two_words_are_rejected(self):
+        # Setup
+        ids, offsets = build_sentences([[0, 1, 2, 3]])
+
+        # Asserts
+        for window_size in [-1, 0, 1]:
+            with self.assertRaises(ValueError):
+                cooccurrence_matrix(ids=ids, offsets=offsets, node_count=4, window_size=window_size)
+            with self.assertRaises(ValueError):
+                KeywordExtractor(txt=TEST_TEXT, method="pr", window_size=window_size)
+            with self.assertRaises(argparse.ArgumentTypeError):
+                _window_size_argument(str(window_size))
+        self.assertEqual(2, _window_size_argument("2"))
+
+    def test_empty_document_has_empty_graph(self):
+        # Setup
+        ids, offsets = build_sentences([])
+        adjacency = cooccurrence_matrix(ids=ids, offsets=offsets, node_count=0)
+        scores, residual = page_rank(adjacency=adjacency)
+
+        # Asserts
+        self.assertEqual((0, 0), adjacency.shape)
+        self.assertEqual(0, len(scores))
+
+    def test_edges_of_parts_merge_into_the_whole_graph(self):
+        # Setup
+        whole_ids, whole_offsets = build_sentences([[0, 1, 2, 1], [3, 0], [2, 3]])
+        first_ids, first_offsets = build_sentences([[0, 1, 2, 1], [3, 0]])
+        second_ids, second_offsets = build_sentences([[2, 3]])
+        whole = cooccurrence_matrix(ids=whole_ids, offsets=whole_offsets, node_count=4)
+        edges = np.union1d(
+            edge_keys(adjacency=cooccurrence_matrix(ids=first_ids, offsets=first_offsets, node_count=4)),
+            edge_keys(adjacency=cooccurrence_matrix(ids=second_ids, offsets=second_offsets, node_count=4)),
+        )
+        merged = adjacency_from_edge_keys(keys=edges, node_of_id=np.arange(4), node_count=4)
+
+        # Asserts
+        self.assertEqual(whole.toarray().tolist(), merged.toarray().tolist())
+
+
+class TestPageRank(TestCase):
+    def test_scores_sum_to_one_and_converge(self):
+        # Setup
+        ids, offsets = build_sentences([[0, 1, 2], [2, 3], [4]])
+        adjacency = cooccurrence_matrix(ids=ids, offsets=offsets, node_count=5)
+        scores, residual = page_rank(adjacency=adjacency, tolerance=1.0e-8, max_iterations=1000)
+
+        # Asserts
+        self.assertAlmostEqual(1.0, scores.sum())
+        self.assertLess(residual, 5 * 1.0e-8)
+        self.assertEqual(2, int(np.argmax(scores)))
+
+    def test_iteration_cap_stops_early(self):
+        # Setup
+        ids, offsets = build_sentences([[0, 1, 2], [2, 3]])
+        adjacency = cooccurrence_matrix(ids=ids, offsets=offsets, node_count=4)
+        _, residual = page_rank(adjacency=adjacency, tolerance=0.0, max_iterations=1)
+
+        # Asserts
+        self.assertGreater(residual, 0.0)
+
+    def test_iteration_stops_when_asked(self):
+        # Setup
+        ids, offsets = build_sentences([[0, 1, 2], [2, 3]])
+        adjacency = cooccurrence_matrix(ids=ids, offsets=offsets, node_count=4)
+        stops: Iterator[bool] = iter([False, False, False, True])
+        scores, residual = page_rank(
+            adjacency=adjacency, tolerance=0.0, max_iterations=1000, should_stop=lambda: next(stops)
+        )
+        _, residual_after_four = page_rank(adjacency=adjacency, tolerance=0.0, max_iterations=4)
+
+        # Asserts
+        self.assertEqual(residual_after_four, residual)
+        self.assertAlmostEqual(1.0, scores.sum())
+
+    @skipUnless(NETWORKX_AVAILABLE, "networkx is not installed")
+    def test_scores_match_networkx(self):
+        import networkx
+
+        # Setup
+        rng = np.random.default_rng(seed=7)
+        sentences = [rng.integers(0, 40, size=rng.integers(1, 12)).tolist() for _ in range(60)]
+        ids, offsets = build_sentences(sentences)
+        adjacency = cooccurrence_matrix(ids=ids, offsets=offsets, node_count=40, window_size=3)
+        scores, _ = page_rank(adjacency=adjacency)
+
+        graph = networkx.Graph()
+        graph.add_nodes_from(range(40))
+        rows, columns = adjacency.nonzero()
+        graph.add_edges_from(zip(rows.tolist(), columns.tolist()))
+        expected = networkx.pagerank(graph)
+
+        # Asserts
+        for node, value in expected.items():
+            self.assertAlmostEqual(value, scores[node], places=12)
+
+
+class TestCapGraph(TestCase):
+    def test_highest_priority_nodes_are_kept_while_their_edges_fit(self):
+        # Setup
+        ids, offsets = build_sentences([[0, 1, 2], [2, 3], [3, 4]])
+        adjacency = cooccurrence_matrix(ids=ids, offsets=offsets, node_count=5)
+        priorities: np.ndarray = np.diff(adjacency.indptr)  # Degrees 2, 2, 3, 2, 1
+
+        # Asserts
+        self.assertEqual([2], cap_graph(adjacency=adjacency, priorities=priorities, max_edges=0).tolist())
+        self.assertEqual(
+            [0, 1, 2], cap_graph(adjacency=adjacency, priorities=priorities, max_edges=3).tolist()
+        )
+        self.assertEqual(
+            [0, 1, 2, 3], cap_graph(adjacency=adjacency, priorities=priorities, max_edges=4).tolist()
+        )
+        self.assertEqual(
+            list(range(5)), cap_graph(adjacency=adjacency, priorities=priorities, max_edges=5).tolist()
+        )
+        self.assertEqual(
+            [0, 1, 2, 3],
+            cap_graph(adjacency=adjacency, priorities=priorities, max_edges=0, min_nodes=4).tolist(),
+        )
+
+
+class TestPageRankExtraction(TestCase):
+    @requires_nltk_data
+    @skipUnless(NETWORKX_AVAILABLE, "networkx is not installed")
+    def test_sparse_backend_matches_networkx_backend(self):
+        for window_size in [None, 2, 4]:
+            # Setup
+            sparse = KeywordExtractor(txt=TEST_TEXT, method="pr", window_size=window_size).extract()
+            reference = KeywordExtractor(
+                txt=TEST_TEXT, method="pr", window_size=window_size, page_rank_backend="networkx"
+            ).extract()
+
+            # Asserts
+            self.assertEqual(reference["keywords"], sparse["keywords"])
+            for word, value in reference["file"]["page_rank"]["scores"].items():
+                self.assertAlmostEqual(value, sparse["file"]["page_rank"]["scores"][word], places=12)
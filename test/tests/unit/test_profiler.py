@@ -0,0 +1,114 @@
+import json
+import tracemalloc
+from unittest import TestCase
+
+# Test class
+from keyword_extractor import KeywordExtractor, KeywordExtractorDirectory
+from utils import StageProfiler
+from support import requires_nltk_data
+
+with open("./assets/dummy-text.txt", "r") as file:
+    TEST_TEXT: str = file.read()
+
+# Stages of a `pr` extraction, the metric stages of `File` and the ranking and result around them
+PAGE_RANK_STAGES: list[str] = [
+    "tokens",
+    "pos",
+    "lemma",
+    "stop_word_free",
+    "stemmed",
+    "page_rank",
+    "rank_pr",
+    "result",
+]
+
+
+class TestStageProfiler(TestCase):
+    def test_nested_stages_are_excluded_from_the_enclosing_stage(self):
+        # Setup
+        profiler: StageProfiler = StageProfiler()
+        with profiler.measure(stage="outer", items=lambda: 2):
+            with profiler.measure(stage="inner", items=lambda: 5):
+                sum(range(200_000))
+        stats: dict = profiler.stats()
+
+        # Asserts
+        self.assertEqual(["inner", "outer"], list(stats.keys()))
+        self.assertEqual((1, 5), (stats["inner"]["calls"], stats["inner"]["items"]))
+        self.assertEqual((1, 2), (stats["outer"]["calls"], stats["outer"]["items"]))
+        self.assertLess(stats["outer"]["seconds"], stats["inner"]["seconds"])
+
+    def test_memory_peak_is_traced_per_stage(self):
+        # Setup
+        profiler: StageProfiler = StageProfiler(trace_memory=True)
+        with profiler.measure(stage="outer"):
+            with profiler.measure(stage="allocate"):
+                data: bytes = bytes(4_000_000)
+            del data
+            with profiler.measure(stage="small"):
+                pass
+        stats: dict = profiler.stats()
+
+        # Asserts
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertGreaterEqual(stats["allocate"]["peak_bytes"], 4_000_000)
+        self.assertGreaterEqual(stats["outer"]["peak_bytes"], 4_000_000)
+        self.assertLess(stats["small"]["peak_bytes"], 4_000_000)
+
+    def test_stats_of_other_profilers_are_merged(self):
+        # Setup
+        profiler: StageProfiler = StageProfiler()
+        profiler.add(stage="pos", seconds=1.0, items=10, peak_bytes=100)
+        other: StageProfiler = StageProfiler()
+        other.add(stage="pos", seconds=2.0, items=5, peak_bytes=50)
+        other.add(stage="lemma", seconds=0.5)
+        profiler.merge(stats=json.loads(json.dumps(other.stats())))
+
+        # Asserts
+        self.assertEqual(
+            {
+                "pos": {"calls": 2, "seconds": 3.0, "items": 15, "peak_bytes": 100},
+                "lemma": {"calls": 1, "seconds": 0.5, "items": 0, "peak_bytes": 0},
+            },
+            profiler.stats(),
+        )
+        self.assertTrue(profiler.report().splitlines()[1].startswith("pos"))
+
+
+class TestProfiledExtraction(TestCase):
+    @requires_nltk_data
+    def test_results_hold_the_stages_of_their_extraction(self):
+        # Setup
+        unprofiled = KeywordExtractor(txt=TEST_TEXT, method="pr", detail="scores").extract()
+        keyword_extractor: KeywordExtractor = KeywordExtractor(
+            txt=TEST_TEXT, method="pr", detail="scores", profile=True
+        )
+        first = keyword_extractor.extract()
+        second = keyword_extractor.extract()
+
+        # Asserts
+        self.assertNotIn("profile", unprofiled)
+        self.assertEqual(unprofiled, {key: value for key, value in first.items() if key != "profile"})
+        self.assertEqual(PAGE_RANK_STAGES, list(first["profile"].keys()))
+        self.assertEqual(len(first["keywords"]), first["profile"]["rank_pr"]["items"])
+        self.assertEqual(
+            first["profile"]["tokens"]["items"] + second["profile"]["tokens"]["items"],
+            keyword_extractor.profiler.stats()["tokens"]["items"],
+        )
+        self.assertEqual(2, keyword_extractor.profiler.stats()["pos"]["calls"])
+
+    @requires_nltk_data
+    def test_directory_stages_are_aggregated_across_workers(self):
+        # Setup
+        directory: KeywordExtractorDirectory = KeywordExtractorDirectory(
+            directory="./assets/test", method="tfidf", detail="keywords", workers=2, profile=True
+        )
+        results: dict = directory.extract()
+        stats: dict = directory.profiler.stats()
+
+        # Asserts
+        self.assertEqual(len(results), stats["tokens"]["calls"])
+        self.assertEqual(
+            sum(result["profile"]["pos"]["items"] for result in results.values()), stats["pos"]["items"]
+        )
+        self.assertEqual(len(results), stats["corpus_tf_idf"]["items"])
@@ -0,0 +1,168 @@
+import pickle
+import random
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+# Test class
+from keyword_extractor import KeywordExtractor, KeywordExtractorDirectory
+from utils import ResultCache
+from support import requires_nltk_data
+
+with open("./assets/dummy-text.txt", "r") as file:
+    TEST_TEXT: str = file.read()
+
+
+class TestResultCache(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_results_persist_across_instances(self):
+        # Setup
+        cache: ResultCache = ResultCache(directory=self.directory.name)
+        cache.put("key", {"keywords": ["web", "server"], "pos": [("web", "NN")]})
+        cache.close()
+        reopened: ResultCache = ResultCache(directory=self.directory.name)
+        value = reopened.get("key")
+
+        # Asserts
+        self.assertEqual({"keywords": ["web", "server"], "pos": [("web", "NN")]}, value)
+        self.assertIsInstance(value["pos"][0], tuple)
+        self.assertIsNone(reopened.get("missing"))
+        self.assertEqual(1, reopened.info()["hits"])
+        self.assertEqual(1, reopened.info()["misses"])
+        self.assertEqual(1, len(reopened))
+
+    def test_least_recently_used_results_are_evicted(self):
+        # Setup
+        value: str = random.Random(0).randbytes(800).hex()  # Hex digits compress to about 0.9 KB per entry
+        cache: ResultCache = ResultCache(directory=self.directory.name, max_bytes=2500)
+        cache.put("a", value)
+        cache.put("b", value)
+        cache.get("a")
+        cache.put("c", value)
+
+        # Asserts
+        self.assertEqual(2, len(cache))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertLessEqual(cache.size(), 2500)
+
+    def test_eviction_leaves_room_for_the_following_puts(self):
+        # Setup
+        generator: random.Random = random.Random(0)
+        cache: ResultCache = ResultCache(directory=self.directory.name, max_bytes=10_000)
+        with patch.object(cache, "_evict", wraps=cache._evict) as evict:
+            for index in range(12):
+                cache.put(str(index), generator.randbytes(800).hex())
+            size: int = cache.size()
+            cache.put("12", generator.randbytes(800).hex())
+
+        # Asserts
+        self.assertEqual(1, evict.call_count)  # Only the 12th put exceeds the limit
+        self.assertLessEqual(size, 10_000 * ResultCache.EVICT_TO)
+        self.assertIsNone(cache.get("0"))
+        self.assertIsNotNone(cache.get("11"))
+        self.assertEqual(cache.size(), cache._size)
+
+    def test_replaced_results_are_not_counted_twice(self):
+        # Setup
+        cache: ResultCache = ResultCache(directory=self.directory.name, max_bytes=2500)
+        value: str = random.Random(0).randbytes(800).hex()
+        for _ in range(5):
+            cache.put("a", value)
+        cache.put("b", value)
+
+        # Asserts
+        self.assertEqual(cache.size(), cache._size)
+        self.assertEqual(2, len(cache))
+
+    def test_open_cache_can_be_pickled(self):
+        # Setup
+        cache: ResultCache = ResultCache(directory=self.directory.name)
+        cache.put("key", 1)
+        copy: ResultCache = pickle.loads(pickle.dumps(cache))
+
+        # Asserts
+        self.assertEqual(1, copy.get("key"))
+
+
+class TestCachedExtraction(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache: ResultCache = ResultCache(directory=self.directory.name)
+
+    def tearDown(self):
+        self.cache.close()
+        self.directory.cleanup()
+
+    def test_cached_result_is_returned_without_extraction(self):
+        # Setup
+        keyword_extractor: KeywordExtractor = KeywordExtractor(
+            txt=TEST_TEXT, method="wf", result_cache=self.cache
+        )
+        self.cache.put(keyword_extractor._result_cache_key(), {"keywords": ["cached"]})
+
+        # Asserts
+        self.assertEqual({"keywords": ["cached"]}, keyword_extractor.extract())
+
+    def test_key_depends_on_text_method_and_options(self):
+        # Setup
+        key: str = KeywordExtractor(txt=TEST_TEXT, method="pr")._result_cache_key()
+
+        # Asserts
+        self.assertEqual(key, KeywordExtractor(txt=TEST_TEXT, method="pr")._result_cache_key())
+        self.assertNotEqual(key, KeywordExtractor(txt=TEST_TEXT + " ", method="pr")._result_cache_key())
+        self.assertNotEqual(key, KeywordExtractor(txt=TEST_TEXT, method="wf")._result_cache_key())
+        self.assertNotEqual(
+            key, KeywordExtractor(txt=TEST_TEXT, method="pr", window_size=2)._result_cache_key()
+        )
+
+    def test_budgeted_keys_ignore_the_page_rank_backend(self):
+        # Setup
+        key: str = KeywordExtractor(txt=TEST_TEXT, method="pr", time_budget_ms=100)._result_cache_key()
+
+        # Asserts
+        self.assertEqual(
+            key,
+            KeywordExtractor(
+                txt=TEST_TEXT, method="pr", page_rank_backend="networkx", time_budget_ms=100
+            )._result_cache_key(),
+        )
+        self.assertEqual(key, KeywordExtractor(txt=TEST_TEXT, method="pr")._result_cache_key())
+        self.assertNotEqual(
+            key,
+            KeywordExtractor(txt=TEST_TEXT, method="pr", page_rank_backend="networkx")._result_cache_key(),
+        )
+
+    @requires_nltk_data
+    def test_cached_results_equal_computed_results(self):
+        for method in ["wf", "tfidf", "pr"]:
+            # Setup
+            computed = KeywordExtractor(txt=TEST_TEXT, method=method).extract()
+            first = KeywordExtractor(txt=TEST_TEXT, method=method, result_cache=self.cache).extract()
+            second = KeywordExtractor(txt=TEST_TEXT, method=method, result_cache=self.cache).extract()
+
+            # Asserts
+            self.assertEqual(computed, first)
+            self.assertEqual(computed, second)
+        self.assertEqual(3, self.cache.info()["hits"])
+
+    @requires_nltk_data
+    def test_parallel_directory_extraction_uses_the_cache(self):
+        # Setup
+        uncached = KeywordExtractorDirectory(directory="./assets/test", method="tfidf").extract()
+        KeywordExtractorDirectory(
+            directory="./assets/test", method="tfidf", workers=2, result_cache=self.cache
+        ).extract()
+        cached = KeywordExtractorDirectory(
+            directory="./assets/test", method="tfidf", workers=2, result_cache=self.cache
+        ).extract()
+
+        # Asserts
+        self.assertEqual(uncached, cached)
+        self.assertEqual(1, len(self.cache))  # The test files share their content and so one cache entry
@@ -0,0 +1,118 @@
+import threading
+from unittest import TestCase
+
+# Test class
+from keyword_extractor import KeywordExtractor
+from keyword_extractor.server import (
+    ExtractionServer,
+    KeywordExtractorClient,
+    _request_options,
+    _request_texts,
+)
+from support import requires_nltk_data
+
+with open("./assets/dummy-text.txt", "r") as file:
+    TEST_TEXT: str = file.read()
+
+
+class TestRequestValidation(TestCase):
+    def test_texts_must_be_strings_within_the_batch_size(self):
+        # Asserts
+        self.assertEqual(["a"], _request_texts(request={"text": "a"}, max_batch_size=2))
+        self.assertEqual(["a", "b"], _request_texts(request={"texts": ["a", "b"]}, max_batch_size=2))
+        with self.assertRaises(ValueError):
+            _request_texts(request={}, max_batch_size=2)
+        with self.assertRaises(ValueError):
+            _request_texts(request={"texts": ["a", 1]}, max_batch_size=2)
+        with self.assertRaises(ValueError):
+            _request_texts(request={"texts": ["a", "b", "c"]}, max_batch_size=2)
+
+    def test_options_are_validated(self):
+        # Asserts
+        self.assertEqual(
+            {"method": "pr", "detail": "scores", "max_keywords": 3},
+            _request_options(
+                request={"method": "pr", "detail": "scores", "max_keywords": 3}, default_method="wf"
+            ),
+        )
+        self.assertEqual({"method": "wf"}, _request_options(request={}, default_method="wf"))
+        self.assertEqual(
+            {"method": "wf", "time_budget_ms": 50},
+            _request_options(request={"time_budget_ms": 50}, default_method="wf"),
+        )
+        for request in [
+            {"method": "lda"},
+            {"detail": "everything"},
+            {"max_keywords": 0},
+            {"time_budget_ms": 0},
+            {"time_budget_ms": "50"},
+        ]:
+            with self.assertRaises(ValueError):
+                _request_options(request=request, default_method="wf")
+
+
+class TestExtractionServer(TestCase):
+    def setUp(self):
+        self.server: ExtractionServer = ExtractionServer(address=("127.0.0.1", 0), queue_timeout=0.1)
+        self.thread: threading.Thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.client: KeywordExtractorClient = KeywordExtractorClient(url=self.server.url)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    @requires_nltk_data
+    def test_results_equal_local_extraction(self):
+        for method in ["wf", "tfidf", "pr", "full"]:
+            # Setup
+            expected = KeywordExtractor(txt=TEST_TEXT, method=method, detail="scores").extract()
+
+            # Asserts
+            self.assertEqual(expected, self.client.extract(text=TEST_TEXT, method=method, detail="scores"))
+
+    @requires_nltk_data
+    def test_batches_are_answered_in_order(self):
+        # Setup
+        texts: list[str] = [TEST_TEXT, "Servers serve web pages.", TEST_TEXT]
+        results: list[dict] = self.client.extract_many(texts=texts, detail="keywords", max_keywords=3)
+        pipeline: KeywordExtractor = self.server._pipelines.get()
+        self.server._pipelines.put(pipeline)
+
+        # Asserts
+        self.assertEqual(3, len(results))
+        self.assertEqual(results[0], results[2])
+        self.assertEqual(
+            KeywordExtractor(txt=texts[1], max_keywords=3).extract()["keywords"], results[1]["keywords"]
+        )
+        # Request options apply to their request only
+        self.assertEqual((10, "full"), (pipeline.max_keywords, pipeline.detail))
+
+    @requires_nltk_data
+    def test_health_and_metrics(self):
+        # Setup
+        self.client.extract(text=TEST_TEXT, detail="keywords")
+        with self.assertRaises(RuntimeError):
+            self.client.extract(text=TEST_TEXT, method="lda")
+        metrics: dict = self.client.metrics()
+
+        # Asserts
+        self.assertEqual({"status": "ok"}, self.client.health())
+        self.assertEqual(2, metrics["requests"])
+        self.assertEqual(1, metrics["texts"])
+        self.assertEqual(1, metrics["errors"])
+        self.assertEqual(0, metrics["in_flight"])
+        self.assertGreater(metrics["latency_ms"]["p50"], 0)
+
+    @requires_nltk_data
+    def test_requests_are_rejected_when_every_pipeline_is_busy(self):
+        # Setup
+        pipeline: KeywordExtractor = self.server._pipelines.get()  # Concurrency 1, the only pipeline
+        with self.assertRaisesRegex(RuntimeError, "503"):
+            self.client.extract(text=TEST_TEXT)
+        self.server._pipelines.put(pipeline)
+
+        # Asserts
+        self.assertEqual(1, self.client.metrics()["rejected"])
+        self.assertIn("keywords", self.client.extract(text=TEST_TEXT))
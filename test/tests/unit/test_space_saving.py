@@ -0,0 +1,156 @@
+import random
+import threading
+from collections import Counter
+from unittest import TestCase
+
+# Test class
+from keyword_extractor import KeywordExtractor, KeywordExtractorStream
+from utils import SpaceSaving
+from support import FakeClock, requires_nltk_data
+
+with open("./assets/dummy-text.txt", "r") as file:
+    TEST_LINES: list[str] = file.read().split("\n")
+
+
+class TestSpaceSaving(TestCase):
+    def test_counts_are_exact_below_capacity(self):
+        # Setup
+        sketch: SpaceSaving = SpaceSaving(capacity=10)
+        for word in ["web", "server", "web", "client", "web", "server"]:
+            sketch.add(word)
+
+        # Asserts
+        self.assertEqual([("web", 3, 0), ("server", 2, 0), ("client", 1, 0)], sketch.top(k=5))
+        self.assertEqual(6, sketch.total)
+
+    def test_heavy_hitters_are_kept_in_bounded_memory(self):
+        # Setup
+        generator: random.Random = random.Random(15)
+        stream: list[int] = [int(generator.paretovariate(1.0)) for _ in range(50_000)]
+        sketch: SpaceSaving = SpaceSaving(capacity=50)
+        for item in stream:
+            sketch.add(item)
+        counts: Counter = Counter(stream)
+
+        # Asserts
+        self.assertEqual(50, len(sketch))
+        self.assertLessEqual(len(sketch._heap), 4 * 50)
+        estimates: dict = {item: (count, error) for item, count, error in sketch.top(k=50)}
+        for item, count in counts.items():
+            if count > len(stream) / 50:
+                self.assertIn(item, estimates)
+                estimate, error = estimates[item]
+                self.assertLessEqual(count, estimate)
+                self.assertLessEqual(estimate - error, count)
+        self.assertEqual(
+            [item for item, _ in counts.most_common(3)], [item for item, _, _ in sketch.top(k=3)]
+        )
+
+    def test_capacity_must_be_positive(self):
+        # Asserts
+        with self.assertRaises(ValueError):
+            SpaceSaving(capacity=0)
+
+
+class TestKeywordExtractorStream(TestCase):
+    @requires_nltk_data
+    def test_results_are_yielded_per_interval_and_at_the_end(self):
+        # Setup
+        stream: KeywordExtractorStream = KeywordExtractorStream(
+            lines=iter(TEST_LINES), interval=2.5, batch_size=2, clock=FakeClock(step=1.0)
+        )
+        results: list[dict] = list(stream.iter_extract())
+
+        # Asserts
+        self.assertGreater(len(results), 1)
+        self.assertEqual(len(TEST_LINES), results[-1]["lines"])
+        self.assertEqual(
+            sorted(result["lines"] for result in results), [result["lines"] for result in results]
+        )
+
+    @requires_nltk_data
+    def test_results_are_yielded_while_no_line_arrives(self):
+        # Setup
+        release: threading.Event = threading.Event()
+
+        def lines():
+            yield from TEST_LINES[:3]
+            release.wait(timeout=10)
+            yield from TEST_LINES[3:]
+
+        stream: KeywordExtractorStream = KeywordExtractorStream(lines=lines(), interval=0.2, batch_size=1000)
+        results = stream.iter_extract()
+        first: dict = next(results)
+        release.set()
+        rest: list[dict] = list(results)
+
+        # Asserts
+        self.assertEqual(3, first["lines"])
+        self.assertEqual(len(TEST_LINES), rest[-1]["lines"])
+
+    @requires_nltk_data
+    def test_unchanged_results_are_not_repeated(self):
+        # Setup
+        stream: KeywordExtractorStream = KeywordExtractorStream(
+            lines=iter(TEST_LINES[:4]), interval=0.5, batch_size=1, clock=FakeClock(step=1.0)
+        )
+        results: list[dict] = list(stream.iter_extract())
+        empty: list[dict] = list(KeywordExtractorStream(lines=iter([])).iter_extract())
+
+        # Asserts
+        lines: list[int] = [result["lines"] for result in results]
+        self.assertEqual(sorted(set(lines)), lines)
+        self.assertEqual(4, lines[-1])
+        self.assertEqual([0], [result["lines"] for result in empty])
+
+    def test_errors_of_the_stream_are_raised(self):
+        # Setup
+        def lines():
+            yield "web server"
+            raise OSError("Stream closed")
+
+        stream: KeywordExtractorStream = KeywordExtractorStream(lines=lines())
+
+        # Asserts
+        with self.assertRaisesRegex(OSError, "Stream closed"):
+            list(stream.iter_extract())
+
+    @requires_nltk_data
+    def test_large_sketch_matches_word_frequency_keywords(self):
+        # Setup
+        expected = KeywordExtractor(txt="\n".join(TEST_LINES), method="wf", detail="scores").extract()
+        stream: KeywordExtractorStream = KeywordExtractorStream(lines=iter(TEST_LINES), batch_size=3)
+        result: dict = list(stream.iter_extract())[-1]
+
+        # Asserts
+        self.assertEqual(expected["keywords"], result["keywords"])
+        self.assertEqual({keyword: 0.0 for keyword in result["keywords"]}, result["errors"])
+
+    @requires_nltk_data
+    def test_vocabulary_is_bounded(self):
+        # Setup
+        keyword_extractor: KeywordExtractor = KeywordExtractor(txt="\n".join(TEST_LINES), method="wf")
+        keyword_extractor.extract()
+        stream: KeywordExtractorStream = KeywordExtractorStream(
+            lines=iter(TEST_LINES * 3), batch_size=1, max_vocabulary_size=20, sketch_size=30
+        )
+        list(stream.iter_extract())
+
+        # Asserts
+        self.assertLess(len(stream._keyword_extractor._vocabulary), len(keyword_extractor._vocabulary))
+        self.assertLessEqual(len(stream.sketch), 30)
+
+    @requires_nltk_data
+    def test_stages_of_every_batch_are_profiled(self):
+        # Setup
+        stream: KeywordExtractorStream = KeywordExtractorStream(
+            lines=iter(TEST_LINES), batch_size=len(TEST_LINES) // 2 + 1, profile=True
+        )
+        list(stream.iter_extract())
+
+        # Asserts
+        self.assertIsNone(KeywordExtractorStream(lines=iter([])).profiler)
+        assert stream.profiler is not None
+        stats: dict = stream.profiler.stats()
+        self.assertEqual(2, stats["tokens"]["calls"])
+        self.assertEqual(2, stats["word_frequency"]["calls"])
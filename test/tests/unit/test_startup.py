@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+# Test class
+from keyword_extractor import METHODS
+from support import requires_nltk_data
+
+# Modules only a method needs, importing them on start slows down every run. How long the import takes is
+# measured by test/benchmarks/bench_startup.py.
+DEFERRED_MODULES: list[str] = ["nltk", "networkx", "scipy", "asyncio"]
+# Modules the first extraction of every method still doesn't need with the default options
+UNUSED_MODULES: list[str] = ["networkx", "asyncio"]
+
+# Modules loaded by `import keyword_extractor` and by a first extraction with the method of argv[1]
+IMPORT_SCRIPT: str = """
+import json, sys
+loaded = set(sys.modules)
+import keyword_extractor
+imported = set(sys.modules)
+if len(sys.argv) > 1:
+    txt = "Web servers serve pages. Browsers render pages."
+    keyword_extractor.KeywordExtractor(txt=txt, method=sys.argv[1]).extract()
+print(json.dumps({"import": sorted(imported - loaded), "extraction": sorted(set(sys.modules) - imported)}))
+"""
+
+
+def import_in_fresh_interpreter(method: str = "") -> dict:
+    environment: dict[str, str] = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(path for path in sys.path if path),
+    }
+    process = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT] + ([method] if method else []),
+        capture_output=True,
+        text=True,
+        env=environment,
+        check=True,
+    )
+    return json.loads(process.stdout)
+
+
+class TestStartup(TestCase):
+    def test_import_defers_method_dependencies(self):
+        # Setup
+        modules: list[str] = import_in_fresh_interpreter()["import"]
+
+        # Asserts
+        for name in DEFERRED_MODULES:
+            self.assertNotIn(name, modules)
+
+    @requires_nltk_data
+    def test_first_extraction_only_imports_what_its_method_needs(self):
+        for method in METHODS:
+            # Setup
+            modules: dict = import_in_fresh_interpreter(method=method)
+
+            # Asserts
+            for name in DEFERRED_MODULES:
+                self.assertNotIn(name, modules["import"])
+            for name in UNUSED_MODULES:
+                self.assertNotIn(name, modules["extraction"])
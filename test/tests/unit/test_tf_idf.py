@@ -0,0 +1,104 @@
+import math
+from unittest import TestCase
+
+import numpy as np
+
+# Test class
+from utils import CorpusTfIdf, top_k
+
+
+class TestCorpusTfIdf(TestCase):
+    def set_up_corpus(self) -> None:
+        self.corpus: CorpusTfIdf = CorpusTfIdf()
+        self.corpus.add_document(key="a", word_counts={"web": 3, "server": 1, "user": 1}, length=10)
+        self.corpus.add_document(key="b", word_counts={"web": 1, "browser": 2}, length=5)
+        self.corpus.add_document(key="c", word_counts={"server": 2, "python": 2}, length=8)
+
+    def test_matrix_holds_term_counts_per_document(self):
+        # Setup
+        self.set_up_corpus()
+        matrix = self.corpus.matrix()
+
+        # Asserts
+        self.assertEqual((3, 5), matrix.shape)
+        self.assertEqual(["web", "server", "user", "browser", "python"], self.corpus.terms)
+        self.assertEqual([[3, 1, 1, 0, 0], [1, 0, 0, 2, 0], [0, 2, 0, 0, 2]], matrix.toarray().tolist())
+
+    def test_document_frequencies_count_documents_per_term(self):
+        # Setup
+        self.set_up_corpus()
+
+        # Asserts
+        self.assertEqual([2, 2, 1, 1, 1], self.corpus.document_frequencies().tolist())
+        self.assertAlmostEqual(1 + math.log(3 / 2), self.corpus.inverse_document_frequencies()[0])
+
+    def test_document_metrics_score_against_the_whole_corpus(self):
+        # Setup
+        self.set_up_corpus()
+        metrics = self.corpus.document_metrics(index=1)
+
+        # Asserts
+        self.assertEqual({"web": 2, "browser": 1}, metrics["document_frequencies"])
+        self.assertAlmostEqual(
+            1 / 5 * (1 + math.log(3 / 2)), metrics["term_frequency_inverse_document_frequencies"]["web"]
+        )
+        self.assertAlmostEqual(
+            2 / 5 * (1 + math.log(3)), metrics["term_frequency_inverse_document_frequencies"]["browser"]
+        )
+
+    def test_top_keywords_rank_every_document(self):
+        # Setup
+        self.set_up_corpus()
+
+        # Asserts
+        self.assertEqual(
+            [["web", "user"], ["browser", "web"], ["python", "server"]], self.corpus.top_keywords(2)
+        )
+
+    def test_top_keywords_keep_first_occurrence_for_equal_scores(self):
+        # Setup
+        corpus: CorpusTfIdf = CorpusTfIdf()
+        corpus.add_document(key="a", word_counts={"b": 1, "a": 1, "c": 1}, length=3)
+
+        # Asserts
+        self.assertEqual([["b", "a", "c"]], corpus.top_keywords())
+
+    def test_top_keywords_match_top_k_of_every_row(self):
+        # Setup
+        generator: np.random.Generator = np.random.default_rng(2)
+        corpus: CorpusTfIdf = CorpusTfIdf()
+        for index in range(50):
+            words = generator.choice(40, size=int(generator.integers(0, 15)), replace=False)
+            counts = generator.integers(1, 4, size=len(words))
+            corpus.add_document(
+                key=str(index), word_counts=dict(zip(words.tolist(), counts.tolist())), length=20
+            )
+
+        # Asserts
+        for k in [0, 1, 3, 20]:
+            expected: list[list] = []
+            for index in range(corpus.document_count):
+                start, end = corpus.matrix().indptr[index], corpus.matrix().indptr[index + 1]
+                order: np.ndarray = top_k(scores=corpus.scores()[start:end], k=k)
+                expected.append(
+                    [corpus.terms[term_id] for term_id in corpus.matrix().indices[start:end][order]]
+                )
+            self.assertEqual(expected, corpus.top_keywords(max_keywords=k))
+
+
+class TestTopK(TestCase):
+    def test_matches_a_stable_full_sort(self):
+        # Setup
+        generator: np.random.Generator = np.random.default_rng(16)
+        scores: np.ndarray = generator.integers(0, 5, size=200).astype(float)
+
+        # Asserts
+        for k in [1, 3, 10, 199, 200, 500]:
+            self.assertEqual(
+                np.argsort(-scores, kind="stable")[:k].tolist(), top_k(scores=scores, k=k).tolist()
+            )
+
+    def test_fewer_scores_than_k_give_all_indices(self):
+        # Asserts
+        self.assertEqual([1, 0], top_k(scores=np.array([0.5, 1.0]), k=10).tolist())
+        self.assertEqual([], top_k(scores=np.array([]), k=10).tolist())
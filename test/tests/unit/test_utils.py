@@ -0,0 +1,224 @@
+import random
+from array import array
+from unittest import TestCase
+
+import nltk
+from nltk.corpus import stopwords
+
+# Test class
+from utils import (
+    PENN_TO_WORDNET,
+    POSTagger,
+    Tokenizer,
+    Vocabulary,
+    flatten_nested_lists,
+    get_stop_words,
+    get_tagger,
+    remove_duplicates,
+    remove_stop_words,
+    sample_paragraphs,
+    sample_sentences,
+)
+from support import requires_nltk_data
+
+with open("./assets/dummy-text.txt", "r") as file:
+    WORDS: list[str] = file.read().split()
+
+
+# Previous implementations, the helpers have to return exactly the same
+def reference_flatten_nested_lists(collection: list) -> list:
+    flatted_list: list = []
+    for value in collection:
+        if isinstance(value, list) and not isinstance(value, str):
+            for x in reference_flatten_nested_lists(value):
+                flatted_list.append(x)
+        else:
+            flatted_list.append(value)
+    return flatted_list
+
+
+def reference_remove_duplicates(collection: list) -> list:
+    duplicate_free_result: list = []
+    for word in collection:
+        if word not in duplicate_free_result:
+            duplicate_free_result.append(word)
+    return duplicate_free_result
+
+
+def reference_remove_stop_words(collection: list[list[str]], lang: str = "english") -> list[list[str]]:
+    stop_words: list = list(stopwords.words(lang))
+    filtered_words_per_sentence: list[list[str]] = []
+    for sentence in collection:
+        filtered_words: list[str] = []
+        for word in sentence:
+            if word.lower() not in stop_words:
+                filtered_words.append(word)
+        filtered_words_per_sentence.append(filtered_words)
+    return filtered_words_per_sentence
+
+
+def random_nested_list(rng: random.Random, depth: int) -> list:
+    result: list = []
+    for _ in range(rng.randint(0, 6)):
+        if depth and rng.random() < 0.4:
+            result.append(random_nested_list(rng=rng, depth=depth - 1))
+        elif rng.random() < 0.2:
+            result.append((rng.choice(WORDS), "n"))
+        else:
+            result.append(rng.choice(WORDS))
+    return result
+
+
+class TestUtils(TestCase):
+    def test_flatten_nested_lists_matches_previous_implementation(self):
+        # Setup
+        rng: random.Random = random.Random(1)
+
+        # Asserts
+        for _ in range(500):
+            collection = random_nested_list(rng=rng, depth=4)
+            self.assertEqual(reference_flatten_nested_lists(collection), flatten_nested_lists(collection))
+
+    def test_flatten_nested_lists_handles_deep_nesting(self):
+        # Setup
+        collection: list = ["a"]
+        for _ in range(5000):
+            collection = [collection, "b"]
+
+        # Asserts
+        self.assertEqual(["a"] + ["b"] * 5000, flatten_nested_lists(collection))
+
+    def test_remove_duplicates_matches_previous_implementation(self):
+        # Setup
+        rng: random.Random = random.Random(2)
+
+        # Asserts
+        for _ in range(200):
+            collection = [rng.choice(WORDS) for _ in range(rng.randint(0, 200))]
+            self.assertEqual(reference_remove_duplicates(collection), remove_duplicates(collection))
+
+    @requires_nltk_data
+    def test_remove_stop_words_matches_previous_implementation(self):
+        # Setup
+        rng: random.Random = random.Random(3)
+        words: list[str] = WORDS + [word.upper() for word in WORDS] + ["The", "AND", "is"]
+
+        # Asserts
+        for _ in range(200):
+            collection = [[rng.choice(words) for _ in range(rng.randint(0, 20))] for _ in range(5)]
+            self.assertEqual(reference_remove_stop_words(collection), remove_stop_words(collection))
+
+    @requires_nltk_data
+    def test_stop_words_are_loaded_once_per_language(self):
+        # Asserts
+        self.assertIs(get_stop_words(lang="english"), get_stop_words(lang="english"))
+        self.assertIsInstance(get_stop_words(lang="english"), frozenset)
+
+    def test_sampled_sentences_are_evenly_spaced_and_keep_their_paragraphs(self):
+        # Setup
+        # Sentences [1, 2] [3] | [4, 5] | [6] [7, 8, 9] [10]
+        token_ids, sentence_offsets, paragraph_offsets = sample_sentences(
+            token_ids=array("I", range(1, 11)),
+            sentence_offsets=array("I", [0, 2, 3, 5, 6, 9, 10]),
+            paragraph_offsets=array("I", [0, 2, 3, 6]),
+            count=3,
+        )
+
+        # Asserts
+        self.assertEqual([1, 2, 4, 5, 10], token_ids.tolist())
+        self.assertEqual([0, 2, 4, 5], sentence_offsets.tolist())
+        self.assertEqual([0, 1, 2, 3], paragraph_offsets.tolist())
+
+    def test_sampled_paragraphs_are_evenly_spaced_without_tokenizing(self):
+        # Setup
+        txt: str = "one.\n\n two\nthree. 3\n \nfour\nfive"
+        sampled_txt, paragraph_count, kept = sample_paragraphs(txt=txt, fraction=0.6)
+
+        # Asserts
+        self.assertEqual("one.\nthree. 3\nfive", sampled_txt)
+        self.assertEqual((5, 3), (paragraph_count, kept))
+        self.assertEqual((txt, 5, 5), sample_paragraphs(txt=txt, fraction=1.5))
+        self.assertEqual(("one.", 5, 1), sample_paragraphs(txt=txt, fraction=0.0))
+
+
+class TestTokenizer(TestCase):
+    @staticmethod
+    def per_level_passes(txt: str) -> tuple[list, list, list, list]:
+        paragraphs = Tokenizer.text_to_paragraphs(txt=txt)
+        sentences_per_paragraph = Tokenizer.paragraphs_to_sentences_per_paragraph(paragraphs=paragraphs)
+        sentences = Tokenizer.sentences_per_paragraph_to_sentences(
+            sentences_per_paragraph=sentences_per_paragraph
+        )
+        return (
+            paragraphs,
+            sentences_per_paragraph,
+            sentences,
+            Tokenizer.sentences_to_words_per_sentence(sentences=sentences),
+        )
+
+    def test_tokenize_matches_the_per_level_passes(self):
+        # Setup
+        alphabet: list[str] = ["web", "Déf", "x1", " ", "\t", "\xa0", ".", "?", "!", "\n", ",", "_"]
+        generator: random.Random = random.Random(13)
+        texts: list[str] = [" ".join(WORDS)] + [
+            "".join(generator.choice(alphabet) for _ in range(generator.randint(1, 40))) for _ in range(2000)
+        ]
+
+        # Asserts
+        for txt in texts:
+            tokenized_text = Tokenizer.tokenize(txt=txt)
+            self.assertEqual(
+                self.per_level_passes(txt=txt),
+                (
+                    tokenized_text.paragraphs(),
+                    tokenized_text.sentences_per_paragraph(),
+                    tokenized_text.sentences(),
+                    tokenized_text.words_per_sentence(),
+                ),
+                repr(txt),
+            )
+
+    def test_exclamation_mark_wins_over_question_mark(self):
+        # Setup
+        tokenized_text = Tokenizer.tokenize(txt="Really? Yes! Sure. Why? Because")
+
+        # Asserts
+        self.assertEqual(["Really? Yes", "Sure", "Why", "Because"], tokenized_text.sentences())
+
+    def test_words_are_interned_into_the_vocabulary(self):
+        # Setup
+        vocabulary: Vocabulary = Vocabulary()
+        tokenized_text = Tokenizer.tokenize(txt="web server. web client", vocabulary=vocabulary)
+
+        # Asserts
+        self.assertEqual([0, 1, 0, 2], tokenized_text.token_ids.tolist())
+        self.assertEqual([0, 2, 4], tokenized_text.sentence_offsets.tolist())
+        self.assertEqual(["web", "server", "client"], vocabulary.words(range(3)))
+
+    def test_empty_text_raises(self):
+        # Asserts
+        with self.assertRaises(ValueError):
+            Tokenizer.tokenize(txt="")
+
+
+class TestPOSTagger(TestCase):
+    def test_penn_tags_map_to_wordnet_pos(self):
+        # Asserts
+        self.assertEqual("n", PENN_TO_WORDNET["NNPS"])
+        self.assertEqual("a", PENN_TO_WORDNET["JJR"])
+        self.assertEqual("r", PENN_TO_WORDNET["RBS"])
+        self.assertEqual("v", PENN_TO_WORDNET["VBZ"])
+        self.assertNotIn("DT", PENN_TO_WORDNET)
+
+    @requires_nltk_data
+    def test_batched_tagging_matches_nltk_pos_tag(self):
+        # Setup
+        sentences: list[list[str]] = [[]]
+        for start in range(0, len(WORDS), 12):
+            sentences.append(WORDS[start:][:12])
+
+        # Asserts
+        self.assertEqual(
+            [nltk.pos_tag(sentence) for sentence in sentences], POSTagger.tag_sentences(sentences)
+        )
+        self.assertIs(get_tagger(), get_tagger())